@@ -0,0 +1 @@
+"""Headless benchmarks for the forecasting pipeline (``python -m benchmarks.run``)."""
@@ -0,0 +1,209 @@
+"""Time each stage of the forecast pipeline on synthetic keyword sets.
+
+Usage::
+
+    python -m benchmarks.run                           # 1k, 100k and 1M keywords
+    python -m benchmarks.run --sizes 1000 10000 --repeat 5 --output bench.json
+    python -m benchmarks.run --compare previous.json   # flag stages that got slower
+
+Results are written as JSON (one record per stage and size) so runs can be diffed between commits.
+No Streamlit server is involved. Cold import times (the engine, and the Home page's module-level imports) are
+measured in fresh interpreters and reported as stages with ``rows`` 0.
+"""
+import argparse
+import ast
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ecomseo import (ForecastSettings, SeasonalVolumes, adjusted_target_position, lookup_ctr, prioritize, scenario_matrix, simulate,
+                     total_traffic_gain, what_if)
+from ecomseo.engine import KeywordTotals, compute_keyword_metrics, summarize
+from ecomseo.export import write_csv
+from ecomseo.ingest import detect_columns, read_keywords
+from ecomseo.schedule import monthly_schedule
+
+from .synthetic import export_frame, search_console_frame, synthetic_keywords, synthetic_monthly_volumes
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_OUTPUT = "benchmark_results.json"
+DEFAULT_SCENARIOS = 1_000  # Monte Carlo scenarios per simulation run; cost grows with keywords x scenarios
+REGRESSION_THRESHOLD = 1.25  # flag stages more than 25% slower than the comparison run
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HOME_PAGE = REPO_ROOT / "pages" / "Home.py"
+
+
+def _time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _stages(keywords, csv_path, search_console_path, settings, n_scenarios=DEFAULT_SCENARIOS):
+    """(name, callable) pairs, in pipeline order. Inputs for later stages are prepared up front."""
+    metrics = compute_keyword_metrics(keywords, settings)
+    totals = KeywordTotals.from_metrics(metrics)
+    table = settings.ctr_lookup
+    position = keywords["position"].to_numpy()
+    target = keywords["targetPosition"].to_numpy()
+    difficulty = keywords["keywordDifficulty"].to_numpy()
+    adjusted = adjusted_target_position(position, target, difficulty)
+    header = pd.read_csv(csv_path, nrows=0).columns
+    monthly_volumes = synthetic_monthly_volumes(keywords)
+
+    def ingest():
+        with open(csv_path, "rb") as f:
+            read_keywords(f, csv_path)
+
+    def ingest_search_console():
+        with open(search_console_path, "rb") as f:
+            read_keywords(f, search_console_path)
+
+    def export_csv():
+        write_csv(metrics, io.BytesIO())
+
+    return [
+        ("column_detection", lambda: detect_columns(header)),
+        ("ingest_csv", ingest),
+        ("ingest_search_console", ingest_search_console),
+        ("ctr_assignment", lambda: (lookup_ctr(position, table), lookup_ctr(adjusted, table))),
+        ("adjusted_target", lambda: adjusted_target_position(position, target, difficulty)),
+        ("preview_total", lambda: total_traffic_gain(keywords, settings, with_std=True)),
+        ("keyword_metrics", lambda: compute_keyword_metrics(keywords, settings)),
+        ("ci_aggregation", lambda: summarize(metrics, KeywordTotals.from_metrics(metrics), settings)),
+        ("monthly_schedule", lambda: monthly_schedule(totals.traffic_gain, totals.keyword_difficulty / totals.count, settings)),
+        ("seasonal_profile", lambda: SeasonalVolumes.from_keywords(keywords, monthly_volumes).season(settings)),
+        ("what_if", lambda: what_if(keywords, settings, np.linspace(1, 5, 200), np.linspace(50, 500, 50))),
+        ("scenario_matrix", lambda: scenario_matrix(keywords, settings)),
+        ("simulation", lambda: simulate(keywords, settings, n_scenarios=n_scenarios, seed=0)),
+        ("prioritization", lambda: prioritize(metrics, settings.implementation_cost)),
+        ("export_csv", export_csv),
+    ]
+
+
+def run(sizes, repeat, settings, stages=None, n_scenarios=DEFAULT_SCENARIOS):
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            keywords = synthetic_keywords(size)
+            csv_path = os.path.join(tmp, f"keywords_{size}.csv")
+            export_frame(keywords).to_csv(csv_path, index=False)
+            search_console_path = os.path.join(tmp, f"search_console_{size}.csv")
+            search_console_frame(size).to_csv(search_console_path, index=False)
+            for name, fn in _stages(keywords, csv_path, search_console_path, settings, n_scenarios):
+                if stages and name not in stages:
+                    continue
+                timings = _time(fn, repeat)
+                records.append({
+                    "stage": name,
+                    "rows": size,
+                    "best_s": min(timings),
+                    "median_s": statistics.median(timings),
+                    "repeat": repeat,
+                })
+                print(f"{name:>21} {size:>10,} rows  best {min(timings) * 1000:10.2f} ms", file=sys.stderr)
+    return records
+
+
+def top_level_imports(path):
+    """The module-level import statements of a script, i.e. what it pays for before its first line of output."""
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def import_targets():
+    return {
+        "import_python": "pass",  # interpreter startup, for reference
+        "import_ecomseo": "import ecomseo",
+        "import_home_page": top_level_imports(HOME_PAGE),
+    }
+
+
+def time_imports(repeat):
+    """Cold import time of the engine and of the Home page's top-level imports, each in a fresh interpreter."""
+    records = []
+    for name, statement in import_targets().items():
+        timings = _time(lambda: subprocess.run([sys.executable, "-c", statement], cwd=REPO_ROOT, check=True), repeat)
+        records.append({"stage": name, "rows": 0, "best_s": min(timings), "median_s": statistics.median(timings), "repeat": repeat})
+        print(f"{name:>21} {'':>10}       best {min(timings) * 1000:10.2f} ms", file=sys.stderr)
+    return records
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(records, baseline_records, threshold=REGRESSION_THRESHOLD):
+    """Records from ``records`` whose best time exceeds the matching baseline by more than ``threshold``x."""
+    baseline = {(r["stage"], r["rows"]): r["best_s"] for r in baseline_records}
+    regressions = []
+    for record in records:
+        previous = baseline.get((record["stage"], record["rows"]))
+        if previous and record["best_s"] > previous * threshold:
+            regressions.append(dict(record, baseline_best_s=previous, ratio=record["best_s"] / previous))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="keyword counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (best and median are reported)")
+    parser.add_argument("--stages", nargs="+", help="only run these stages")
+    parser.add_argument("--projection-months", type=int, default=12)
+    parser.add_argument("--scenarios", type=int, default=DEFAULT_SCENARIOS, help="Monte Carlo scenarios for the simulation stage")
+    parser.add_argument("--skip-imports", action="store_true", help="do not measure cold import times")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON file to write results to")
+    parser.add_argument("--compare", help="earlier results file; exit non-zero if any stage regressed")
+    args = parser.parse_args(argv)
+
+    settings = ForecastSettings(projection_months=args.projection_months, start_month=0)
+    records = [] if args.skip_imports else time_imports(args.repeat)
+    records += run(args.sizes, args.repeat, settings, stages=args.stages, n_scenarios=args.scenarios)
+    report = {"environment": environment(), "results": records}
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(records, json.load(f)["results"])
+        report["regressions"] = regressions
+        for r in regressions:
+            print(f"REGRESSION {r['stage']} @ {r['rows']:,} rows: {r['ratio']:.2f}x slower", file=sys.stderr)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(records)} results to {args.output}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Synthetic keyword sets with SEO-export-like distributions."""
+import numpy as np
+import pandas as pd
+
+from ecomseo.schema import enforce_schema
+
+
+def synthetic_keywords(n, seed=0):
+    """``n`` keywords in the normalized schema.
+
+    Volumes are heavy-tailed (log-normal, median ~300 searches), most positions sit on pages 2-5 with a tail
+    on page 1, targets improve on the current position, and difficulty is centred around 5.
+    """
+    rng = np.random.default_rng(seed)
+    volume = np.minimum(rng.lognormal(mean=5.7, sigma=1.6, size=n), 5_000_000)
+    position = np.where(rng.random(n) < 0.2, rng.integers(1, 11, n), np.clip(rng.gamma(2.0, 15.0, n) + 10, 11, 100))
+    target = np.maximum(1, position - rng.uniform(0.3, 0.95, n) * position)
+    difficulty = np.clip(np.round(rng.normal(5, 2, n)), 1, 10)
+    return enforce_schema(pd.DataFrame({
+        "keyword": pd.Series(np.char.add("keyword ", np.arange(n).astype(str))),
+        "searchVolume": volume,
+        "position": position,
+        "targetPosition": target,
+        "keywordDifficulty": difficulty,
+    }))
+
+
+def synthetic_monthly_volumes(keywords, seed=0):
+    """A 12-month volume history per keyword: its volume times a random seasonal shape; 10% have none."""
+    from ecomseo.profiles import MonthlyVolumes
+
+    rng = np.random.default_rng(seed)
+    n = len(keywords)
+    peak = rng.integers(0, 12, n)
+    shape = 1 + rng.uniform(0, 1.5, (n, 1)) * np.cos((np.arange(12) - peak[:, None]) * np.pi / 6)
+    volumes = (keywords["searchVolume"].to_numpy()[:, None] * shape).astype(np.float32)
+    volumes[rng.random(n) < 0.1] = np.nan
+    return MonthlyVolumes.from_arrays(keywords["keyword"].array, volumes)
+
+
+def export_frame(keywords):
+    """Raw export-style frame (Ahrefs/SEMrush-like headers plus columns the importer ignores)."""
+    n = len(keywords)
+    return pd.DataFrame({
+        "Keyword": keywords["keyword"],
+        "Country": "us",
+        "Search Volume": keywords["searchVolume"],
+        "Keyword Difficulty": keywords["keywordDifficulty"],
+        "CPC": np.round(np.random.default_rng(1).uniform(0.1, 5.0, n), 2),
+        "Current Position": keywords["position"],
+        "URL": "https://example.com/p/" + pd.Series(np.arange(n)).astype(str),
+    })
+
+
+def search_console_frame(n, days=28, seed=0):
+    """``n`` rows of a Search Console performance export: query x page x day, about ten rows per query."""
+    rng = np.random.default_rng(seed)
+    query = rng.integers(0, max(n // 10, 1), n)
+    impressions = np.maximum(1, np.round(rng.lognormal(mean=2.0, sigma=1.5, size=n))).astype(np.int64)
+    return pd.DataFrame({
+        "Date": (pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, days, n), unit="D")).strftime("%Y-%m-%d"),
+        "Query": np.char.add("keyword ", query.astype(str)),
+        "Page": "https://example.com/p/" + pd.Series(query % 1000).astype(str),
+        "Clicks": rng.binomial(impressions, 0.05),
+        "Impressions": impressions,
+        "CTR": 0.05,
+        "Position": np.round(np.clip(rng.gamma(2.0, 10.0, n), 1, 100), 1),
+    })
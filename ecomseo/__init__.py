@@ -0,0 +1,38 @@
+"""EcomSEO Predictor forecasting engine (no Streamlit dependency)."""
+from .cache import ForecastCache, LRUCache, UploadCache
+from .ctr import ctr_lookup_table, get_ctr, lookup_ctr
+from .engine import (ForecastResult, ForecastSettings, PositionVolumes, SeasonalVolumes, adjusted_target_position, forecast,
+                     keyword_traffic_gain, total_traffic_gain)
+from .incremental import IncrementalForecast
+from .optimize import Prioritization, prioritize
+from .profiles import MonthlyVolumes
+from .scenarios import scenario_matrix
+from .simulation import SimulationResult, simulate
+from .whatif import WhatIfGrid, what_if, what_if_grid
+
+__all__ = [
+    "ForecastCache",
+    "ForecastResult",
+    "ForecastSettings",
+    "IncrementalForecast",
+    "LRUCache",
+    "MonthlyVolumes",
+    "PositionVolumes",
+    "Prioritization",
+    "SeasonalVolumes",
+    "SimulationResult",
+    "UploadCache",
+    "WhatIfGrid",
+    "adjusted_target_position",
+    "ctr_lookup_table",
+    "forecast",
+    "get_ctr",
+    "keyword_traffic_gain",
+    "lookup_ctr",
+    "prioritize",
+    "scenario_matrix",
+    "simulate",
+    "total_traffic_gain",
+    "what_if",
+    "what_if_grid",
+]
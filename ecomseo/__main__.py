@@ -0,0 +1,6 @@
+"""``python -m ecomseo``: see :mod:`ecomseo.cli`."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,192 @@
+"""Portfolio forecasting: one forecast per client keyword file, fanned out over a process pool.
+
+Every ``.csv``/``.xlsx``/``.xls`` file in the input directory is a client, named after the file stem. A
+manifest supplies each client's settings (the same keys as ``st.session_state.settings``, plus
+``custom_ctr``)::
+
+    {"defaults": {"projection_months": 12},
+     "clients": {"acme": {"category": "Fashion & Apparel", "aov": 80, "currency_selection": "GBP (£)"}}}
+
+A CSV manifest with a ``client`` column and one settings column per key works too. Each worker reads,
+forecasts and writes its own client's outputs, and sends back only a one-row summary. Large keyword frames
+therefore never cross process boundaries.
+
+Usage::
+
+    python -m ecomseo.batch keywords/ manifest.json --output forecasts/ --workers 8
+"""
+import argparse
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from .engine import ForecastSettings, forecast
+from .export import write_csv
+from .ingest import read_keywords, read_monthly_volumes
+from .models import DEFAULT_CUSTOM_CTR, DEFAULT_SETTINGS
+from .report import currency_symbol, monthly_projections
+
+KEYWORD_FILE_SUFFIXES = (".csv", ".xlsx", ".xls")
+SUMMARY_FILE = "summary.csv"
+SUMMARY_COLUMNS = ["Client", "File", "Keywords", "Category", "CTR Model", "Projection Months", "Currency", "Current Traffic",
+                   "Traffic Gain", "Traffic CI Low", "Traffic CI High", "Conversion Gain", "Revenue Gain", "Revenue CI Low",
+                   "Revenue CI High", "Implementation Cost", "CPA", "Break-Even Month", "Error"]
+_INTEGER_SUMMARY_COLUMNS = ["Keywords", "Projection Months", "Conversion Gain", "Break-Even Month"]
+
+
+@dataclass
+class ClientJob:
+    name: str
+    path: Path
+    settings: dict = field(default_factory=dict)
+
+
+def _manifest_value(value):
+    """Undo CSV typing: blank cells are dropped, whole floats become ints, and true/false and JSON cells
+    (e.g. ``custom_ctr``) are decoded."""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str):
+        if value.strip().lower() in ("true", "false"):
+            return value.strip().lower() == "true"
+        if value[:1] in "{[":
+            return json.loads(value)
+    return value
+
+
+def normalize_custom_ctr(custom_ctr):
+    """Custom CTR values from JSON (string position keys) on top of the defaults, keyed like ``DEFAULT_CUSTOM_CTR``."""
+    merged = dict(DEFAULT_CUSTOM_CTR)
+    for key, value in custom_ctr.items():
+        merged[int(key) if str(key).isdigit() else key] = float(value)
+    return merged
+
+
+def load_manifest(path):
+    """Return ``(defaults, {client: settings})`` from a JSON or CSV manifest."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        rows = pd.read_csv(path).to_dict("records")
+        clients = {str(row.pop("client")): {k: v for k, v in ((k, _manifest_value(v)) for k, v in row.items()) if v is not None}
+                   for row in rows}
+        return {}, clients
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if "clients" not in manifest:
+        return {}, manifest
+    return manifest.get("defaults", {}), manifest["clients"]
+
+
+def client_jobs(directory, manifest=None):
+    """One :class:`ClientJob` per keyword file in ``directory``, with defaults and client settings merged."""
+    defaults, clients = load_manifest(manifest) if manifest else ({}, {})
+    files = sorted(p for p in Path(directory).iterdir() if p.suffix.lower() in KEYWORD_FILE_SUFFIXES)
+    jobs = []
+    for p in files:
+        settings = dict(DEFAULT_SETTINGS, **defaults, **clients.get(p.stem, {}))
+        if settings.get("custom_ctr") is not None:
+            settings["custom_ctr"] = normalize_custom_ctr(settings["custom_ctr"])
+        jobs.append(ClientJob(p.stem, p, settings))
+    missing = set(clients) - {job.name for job in jobs}
+    if missing:
+        raise FileNotFoundError(f"No keyword file in {directory} for client(s): {', '.join(sorted(missing))}")
+    return jobs
+
+
+def _summary_row(job, settings, result):
+    return {
+        "Client": job.name,
+        "File": job.path.name,
+        "Keywords": len(result.keywords),
+        "Category": settings.category,
+        "CTR Model": settings.ctr_model,
+        "Projection Months": settings.projection_months,
+        "Currency": job.settings.get("currency_selection"),
+        "Current Traffic": result.total_current_traffic,
+        "Traffic Gain": result.total_traffic_gain,
+        "Traffic CI Low": result.traffic_ci[0],
+        "Traffic CI High": result.traffic_ci[1],
+        "Conversion Gain": result.total_conversion_gain,
+        "Revenue Gain": result.total_revenue_gain,
+        "Revenue CI Low": result.revenue_ci[0],
+        "Revenue CI High": result.revenue_ci[1],
+        "Implementation Cost": settings.implementation_cost,
+        "CPA": result.cpa if result.cpa != float("inf") else None,  # no conversions: left empty, "N/A" in the app
+        "Break-Even Month": result.break_even_month,
+        "Error": None,
+    }
+
+
+def run_client(job, output_dir):
+    """Forecast one client and write ``<output_dir>/<client>/keyword_details.csv`` and ``monthly_projections.csv``.
+
+    Returns the client's summary row; failures are reported in its ``Error`` field instead of raised.
+    """
+    try:
+        with open(job.path, "rb") as f:
+            settings = ForecastSettings.from_dict(job.settings, monthly_volumes=read_monthly_volumes(f, job.path.name))
+            keywords = read_keywords(f, job.path.name)
+        result = forecast(keywords, settings)
+        symbol = currency_symbol(job.settings.get("currency_selection"))
+
+        client_dir = Path(output_dir) / job.name
+        client_dir.mkdir(parents=True, exist_ok=True)
+        with open(client_dir / "keyword_details.csv", "wb") as f:
+            write_csv(result.keywords, f)
+        monthly_projections(result.monthly, symbol).to_csv(client_dir / "monthly_projections.csv", index=False)
+        return _summary_row(job, settings, result)
+    except Exception as e:  # one bad file should not sink the whole portfolio
+        return {"Client": job.name, "File": job.path.name, "Error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(directory, manifest, output_dir, max_workers=None):
+    """Forecast every client in ``directory`` in parallel and write the roll-up to ``<output_dir>/summary.csv``.
+
+    Returns the roll-up frame (one row per client, in file-name order). Revenue figures are in each client's own
+    currency and are not summed across clients.
+    """
+    jobs = client_jobs(directory, manifest)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    if max_workers == 1 or len(jobs) <= 1:
+        rows = [run_client(job, output_dir) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers or os.cpu_count() or 1, len(jobs))) as pool:
+            rows = list(pool.map(run_client, jobs, [output_dir] * len(jobs)))
+    summary = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+    summary[_INTEGER_SUMMARY_COLUMNS] = summary[_INTEGER_SUMMARY_COLUMNS].astype("Int64")  # NA for failed clients
+    summary.to_csv(Path(output_dir) / SUMMARY_FILE, index=False)
+    return summary
+
+
+def add_arguments(parser):
+    parser.add_argument("directory", help="directory of client keyword files (.csv, .xlsx, .xls)")
+    parser.add_argument("manifest", nargs="?", help="JSON or CSV file with per-client settings")
+    parser.add_argument("--output", "-o", default="forecasts", help="output directory (default: forecasts)")
+    parser.add_argument("--workers", "-j", type=int, help="worker processes (default: one per CPU)")
+
+
+def run(args):
+    summary = run_batch(args.directory, args.manifest, args.output, max_workers=args.workers)
+    failed = summary["Error"].notna()
+    print(f"Forecast {int((~failed).sum())} of {len(summary)} clients into {args.output}", file=sys.stderr)
+    for row in summary[failed].to_dict("records"):
+        print(f"  {row['Client']}: {row['Error']}", file=sys.stderr)
+    return 1 if failed.any() else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Forecast a directory of client keyword files in parallel.")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
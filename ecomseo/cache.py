@@ -0,0 +1,266 @@
+"""In-memory result caching.
+
+``LRUCache`` is a small thread-safe LRU with optional TTL and a byte budget. ``ForecastCache`` keys it on a
+stable fingerprint of the keyword frame plus the forecast settings, so revisiting a scenario (6 vs 12 months,
+another currency) returns the stored result instead of recomputing it. ``UploadCache`` keys parsed keyword files
+on a hash of their bytes, so the same export uploaded in several sessions is only parsed once.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .engine import _as_settings, forecast
+from .ingest import read_keywords
+from .profiling import stage
+from .schema import read_keyword_file, write_keyword_file
+from .schedule import start_month_index
+from .simulation import DEFAULT_SCENARIOS, simulate
+
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by entry count, total bytes and (optionally) age in seconds."""
+
+    def __init__(self, max_entries=32, max_bytes=256 * 1024 * 1024, ttl=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (value, nbytes, stored_at)
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, count=False) is not None
+
+    def get(self, key, default=None, count=True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and self._clock() - entry[2] > self.ttl:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, nbytes=0):
+        """Store ``value``. Values larger than the whole byte budget are not cached (any older value is dropped)."""
+        if nbytes > self.max_bytes:
+            with self._lock:
+                if key in self._entries:
+                    self._drop(key)
+            return
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, nbytes, self._clock())
+            self._nbytes += nbytes
+            while len(self._entries) > self.max_entries or self._nbytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                evicted.append((oldest, self._entries[oldest][0]))
+                self._drop(oldest)
+                self.evictions += 1
+        for old_key, old_value in evicted:
+            self._evicted(old_key, old_value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self):
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), self._nbytes)
+
+    def _drop(self, key):
+        _, nbytes, _ = self._entries.pop(key)
+        self._nbytes -= nbytes
+
+    def _evicted(self, key, value):
+        """Called (outside the lock) for each entry pushed out by the size limits; subclasses may spill it."""
+
+
+def _hash_strings(digest, values):
+    digest.update(pd.isna(values).tobytes())
+    digest.update("\x1f".join(map(str, values)).encode("utf-8", "surrogatepass"))
+
+
+def frame_fingerprint(df):
+    """Content hash of a DataFrame (values, column names and dtypes; the index is ignored).
+
+    Numeric buffers are hashed directly and text is hashed as one joined blob, which is several times faster
+    than ``pd.util.hash_pandas_object`` on large keyword columns.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    for _, column in df.items():
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            digest.update(np.ascontiguousarray(column.cat.codes.to_numpy()).tobytes())
+            _hash_strings(digest, column.cat.categories.to_numpy(dtype=object))
+        elif pd.api.types.is_numeric_dtype(column.dtype) and not pd.api.types.is_extension_array_dtype(column.dtype):
+            digest.update(np.ascontiguousarray(column.to_numpy()).tobytes())
+        else:
+            _hash_strings(digest, column.to_numpy(dtype=object))
+    return digest.hexdigest()
+
+
+def settings_fingerprint(settings):
+    """Stable key for the inputs that affect a forecast."""
+    settings = _as_settings(settings)
+    values = []
+    for f in fields(settings):
+        value = getattr(settings, f.name)
+        if f.name == "custom_ctr":
+            # Only the Custom model reads the custom CTR values
+            value = sorted((str(k), v) for k, v in value.items()) if value is not None and settings.ctr_model == "Custom" else None
+        elif f.name == "start_month":
+            value = start_month_index(settings)
+        elif f.name == "monthly_volumes":
+            value = value.fingerprint if value is not None else None
+        values.append((f.name, value))
+    return hashlib.blake2b(repr(values).encode(), digest_size=16).hexdigest()
+
+
+def forecast_key(keywords, settings):
+    with stage("fingerprint", rows=len(keywords)):
+        return frame_fingerprint(keywords), settings_fingerprint(settings)
+
+
+def result_nbytes(result):
+    """Approximate in-memory size of a :class:`~ecomseo.engine.ForecastResult`."""
+    frames = (result.keywords, result.monthly, result.break_even)
+    return int(sum(frame.memory_usage(index=True, deep=True).sum() for frame in frames))
+
+
+class ForecastCache(LRUCache):
+    """LRU of :class:`~ecomseo.engine.ForecastResult` keyed on keyword content and settings.
+
+    Cached results are shared between callers and must be treated as read-only.
+    """
+
+    def forecast(self, keywords, settings=None, compute=forecast):
+        """Cached ``compute(keywords, settings)``; ``compute`` defaults to :func:`~ecomseo.engine.forecast`."""
+        key = forecast_key(keywords, settings)
+        result = self.get(key)
+        if result is None:
+            result = compute(keywords, settings)
+            self.put(key, result, result_nbytes(result))
+        return result
+
+    def simulation(self, keywords, settings=None, n_scenarios=DEFAULT_SCENARIOS, seed=0):
+        """Cached :func:`~ecomseo.simulation.simulate` run (seeded, so the same inputs give the same ranges)."""
+        key = forecast_key(keywords, settings) + ("simulation", n_scenarios, seed)
+        result = self.get(key)
+        if result is None:
+            result = simulate(keywords, settings, n_scenarios=n_scenarios, seed=seed)
+            self.put(key, result, 4 * result.traffic_gain.nbytes)
+        return result
+
+
+def content_key(source, name, block_size=1 << 20):
+    """Hash of a file-like object's bytes plus its format (``csv``/``xlsx``/``xls``); the position is restored."""
+    digest = hashlib.sha256()  # hardware-accelerated on most CPUs; about twice blake2b's throughput here
+    start = source.tell()
+    if hasattr(source, "getbuffer"):  # BytesIO/UploadedFile: hash in place, no copy
+        digest.update(source.getbuffer())
+    else:
+        for block in iter(lambda: source.read(block_size), b""):
+            digest.update(block)
+    source.seek(start)
+    return digest.hexdigest(), Path(name).suffix.lower().lstrip(".")
+
+
+class UploadCache(LRUCache):
+    """Normalized keyword frames of uploaded files, keyed by :func:`content_key`, shared across sessions.
+
+    A repeated upload of the same file skips parsing. Entries pushed out of memory are written to ``spill_dir``
+    (if given) as Arrow files, which reload memory-mapped; the spill directory is trimmed oldest-first to
+    ``max_spill_bytes``. Cached frames are shared and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=16, max_bytes=512 * 1024 * 1024, ttl=None, spill_dir=None,
+                 max_spill_bytes=2 * 1024 * 1024 * 1024, clock=time.monotonic):
+        super().__init__(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl, clock=clock)
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.max_spill_bytes = max_spill_bytes
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    def read(self, source, name, key=None, search_console_months=None, **read_options):
+        """Cached :func:`~ecomseo.ingest.read_keywords`; pass ``key`` if the file's :func:`content_key` is known."""
+        key = key or content_key(source, name)
+        if search_console_months is not None:  # the same export read over another period is another table
+            key = (f"{key[0]}-{search_console_months:g}m", key[1])
+            read_options["search_console_months"] = search_console_months
+        keywords = self.get(key)
+        if keywords is None:
+            keywords = self._unspill(key)
+            if keywords is None:
+                keywords = read_keywords(source, name, **read_options)
+            self.put(key, keywords, int(keywords.memory_usage(deep=True).sum()))
+        elif read_options.get("progress") is not None:
+            read_options["progress"](1.0, len(keywords))
+        return keywords
+
+    def _spill_path(self, key):
+        return self.spill_dir / f"{key[0]}.{key[1]}.arrow"
+
+    def _unspill(self, key):
+        if self.spill_dir is None:
+            return None
+        path = self._spill_path(key)
+        if not path.exists():
+            return None
+        with stage("upload_unspill") as timing:
+            keywords = read_keyword_file(path)
+            timing.rows = len(keywords)
+        path.touch()  # most recently used survives trimming
+        return keywords
+
+    def _evicted(self, key, value):
+        if self.spill_dir is None:
+            return
+        path = self._spill_path(key)
+        if not path.exists():
+            with stage("upload_spill", rows=len(value)):
+                write_keyword_file(value, path)
+        self._trim_spill()
+
+    def _trim_spill(self):
+        files = sorted(self.spill_dir.glob("*.arrow"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self.max_spill_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
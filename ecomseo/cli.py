@@ -0,0 +1,172 @@
+"""Command-line entry point (``python -m ecomseo``).
+
+``forecast`` runs a single keyword file through the same pipeline as the Home page and writes the same
+keyword export as its download button (CSV, Parquet or Excel) plus the monthly projection table; ``batch`` is :mod:`ecomseo.batch`
+and ``serve`` is :mod:`ecomseo.service`. Only pandas/NumPy are imported, so the command starts quickly enough for
+cron jobs and pipelines.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+
+from . import batch, service
+from .engine import ForecastSettings, forecast
+from .export import EXPORT_FORMATS, export_file
+from .ingest import read_keywords, read_monthly_volumes
+from .models import CTR_MODELS, CURRENCY_OPTIONS, DEFAULT_SETTINGS, SEASONALITY
+from .report import MONTHLY_COLUMNS, monthly_projections
+
+DEFAULT_KEYWORDS_OUTPUT = "seo_forecast_results.csv"  # same name as the app's download
+
+
+def currency_option(value):
+    """Accept a full currency option (``"GBP (£)"``) or just its code (``"GBP"``)."""
+    for option in CURRENCY_OPTIONS:
+        if value == option or value.upper() == option.split()[0]:
+            return option
+    raise argparse.ArgumentTypeError(f"unknown currency {value!r} (choose from {', '.join(o.split()[0] for o in CURRENCY_OPTIONS)})")
+
+
+def export_format(value):
+    """Accept an export format name or file extension, case-insensitively (``"csv"``, ``"xlsx"``, ``"Excel"``)."""
+    for name, (extension, _) in EXPORT_FORMATS.items():
+        if value.lower() in (name.lower(), extension):
+            return name
+    raise argparse.ArgumentTypeError(f"unknown format {value!r} (choose from {', '.join(f.lower() for f in EXPORT_FORMATS)})")
+
+
+def positive_months(value):
+    """A period in months greater than zero (fractions allowed, e.g. ``0.5`` for two weeks)."""
+    try:
+        months = float(value)
+    except ValueError:
+        months = 0.0
+    if not months > 0:
+        raise argparse.ArgumentTypeError(f"expected a positive number of months, got {value!r}")
+    return months
+
+
+def _output_format(args):
+    if args.format:
+        return args.format
+    for name, (extension, _) in EXPORT_FORMATS.items():
+        if args.output.lower().endswith("." + extension):
+            return name
+    return "CSV"
+
+
+def _settings(args):
+    settings = dict(DEFAULT_SETTINGS)
+    if args.settings:
+        with open(args.settings, encoding="utf-8") as f:
+            settings.update(json.load(f))
+    overrides = {
+        "category": args.category, "projection_months": args.months, "conversion_rate": args.conversion_rate,
+        "aov": args.aov, "implementation_cost": args.implementation_cost, "ctr_model": args.ctr_model,
+        "currency_selection": args.currency,
+    }
+    settings.update({k: v for k, v in overrides.items() if v is not None})
+    for flag in ("featured_snippet_present", "in_featured_snippet", "faq_present", "in_faq"):
+        settings[flag] = settings.get(flag, False) or getattr(args, flag)
+    if args.custom_ctr:
+        settings["custom_ctr"] = json.loads(args.custom_ctr)
+    if settings.get("custom_ctr") is not None:
+        settings["custom_ctr"] = batch.normalize_custom_ctr(settings["custom_ctr"])
+    if args.start_month is not None:
+        settings["start_month"] = args.start_month - 1
+    return settings
+
+
+def _print_summary(result, symbol, out):
+    low, high = result.traffic_ci
+    print(f"Total Traffic Gain:    {int(result.total_traffic_gain):,} ({result.traffic_percent:+.1f}%)  95% CI: {int(low):,} - {int(high):,}", file=out)
+    low, high = result.conversion_ci
+    print(f"Total Conversion Gain: {result.total_conversion_gain:,} ({result.conversion_percent:+.1f}%)  95% CI: {low:,} - {high:,}", file=out)
+    low, high = result.revenue_ci
+    print(f"Total Revenue Gain:    {symbol}{int(result.total_revenue_gain):,} ({result.revenue_percent:+.1f}%)  "
+          f"95% CI: {symbol}{int(low):,} - {symbol}{int(high):,}", file=out)
+    print(f"CPA:                   {f'{symbol}{result.cpa:.2f}' if result.cpa != float('inf') else 'N/A'}", file=out)
+    if result.break_even_month:
+        print(f"Break-even:            month {result.break_even_month}", file=out)
+    else:
+        print(f"Break-even:            not reached within {result.settings.projection_months} months", file=out)
+
+
+def run_forecast(args):
+    settings = _settings(args)
+    symbol = CURRENCY_OPTIONS[settings.get("currency_selection") or DEFAULT_SETTINGS["currency_selection"]]
+    with open(args.keywords, "rb") as f:
+        monthly_volumes = read_monthly_volumes(f, args.keywords)
+        keywords = read_keywords(f, args.keywords, search_console_months=args.search_console_months)
+    if not len(keywords):
+        print(f"No keywords found in {args.keywords}", file=sys.stderr)
+        return 1
+    result = forecast(keywords, ForecastSettings.from_dict(settings, monthly_volumes=monthly_volumes))
+
+    monthly = monthly_projections(result.monthly, symbol)
+    with export_file(result, _output_format(args)) as export:
+        if args.output == "-":
+            shutil.copyfileobj(export, sys.stdout.buffer)
+            sys.stdout.buffer.flush()
+        else:
+            with open(args.output, "wb") as f:
+                shutil.copyfileobj(export, f)
+    if args.monthly:
+        monthly.to_csv(args.monthly, index=False)
+
+    # Keep stdout clean when it carries the CSV
+    out = sys.stderr if args.output == "-" else sys.stdout
+    _print_summary(result, symbol, out)
+    print(f"\nMonthly Projections ({settings['projection_months']} Months)", file=out)
+    print(monthly[MONTHLY_COLUMNS].to_string(index=False), file=out)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m ecomseo", description="EcomSEO Predictor forecasts without the web app.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("forecast", help="forecast a single keyword file")
+    p.add_argument("keywords", help="keyword export (.csv, .xlsx or .xls)")
+    p.add_argument("--settings", help="JSON file with settings (same keys as the app); flags below override it")
+    p.add_argument("--category", choices=list(SEASONALITY))
+    p.add_argument("--months", type=int, help="projection period in months")
+    p.add_argument("--conversion-rate", type=float, help="conversion rate in percent")
+    p.add_argument("--aov", type=float, help="average order value")
+    p.add_argument("--implementation-cost", type=float)
+    p.add_argument("--currency", type=currency_option, help="GBP, EUR, USD, AED or SAR")
+    p.add_argument("--ctr-model", choices=list(CTR_MODELS))
+    p.add_argument("--custom-ctr", help='JSON CTRs for the Custom model, e.g. \'{"1": 0.25, "beyond_10": 0.005}\'')
+    p.add_argument("--featured-snippet", dest="featured_snippet_present", action="store_true", help="a featured snippet is present")
+    p.add_argument("--in-featured-snippet", action="store_true", help="your site is in the featured snippet")
+    p.add_argument("--faq", dest="faq_present", action="store_true", help="an FAQ box is present")
+    p.add_argument("--in-faq", action="store_true", help="your site is in the FAQ box")
+    p.add_argument("--search-console-months", type=positive_months, metavar="MONTHS",
+                   help="period covered by a Search Console export without a Date column (default: 1)")
+    p.add_argument("--start-month", type=int, choices=range(1, 13), metavar="1-12", help="first projected month (default: current)")
+    p.add_argument("--output", "-o", default=DEFAULT_KEYWORDS_OUTPUT, help=f"keyword export ('-' for stdout; default: {DEFAULT_KEYWORDS_OUTPUT})")
+    p.add_argument("--format", type=export_format, help="csv, parquet or xlsx (default: from the --output extension, else csv)")
+    p.add_argument("--monthly", help="also write the Monthly Projections table to this CSV")
+    p.set_defaults(run=run_forecast)
+
+    p = commands.add_parser("batch", help="forecast a directory of client files in parallel")
+    batch.add_arguments(p)
+    p.set_defaults(run=batch.run)
+
+    p = commands.add_parser("serve", help="serve forecasts over HTTP/JSON")
+    service.add_arguments(p)
+    p.set_defaults(run=service.run)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.run(args)
+    except BrokenPipeError:
+        # The reader went away (``... -o - | head``): stop quietly, and point stdout at devnull so the
+        # interpreter's final flush doesn't raise again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
@@ -0,0 +1,77 @@
+"""Click-through-rate lookups.
+
+``get_ctr`` is the scalar reference definition. For whole keyword columns, ``ctr_lookup_table`` expands a model
+(with the SERP feature adjustments baked in) into a dense array indexed by position, so a column of positions
+becomes a single NumPy gather via ``lookup_ctr``.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .models import CTR_MODELS, DEFAULT_CUSTOM_CTR
+
+# Positions beyond this (and below 1) share the CTR of the nearest end of the table
+MAX_POSITION = 100
+
+
+def get_ctr(position, ctr_table, featured_snippet_present=False, in_featured_snippet=False, faq_present=False, in_faq=False,
+            custom_ctr=None):
+    """CTR for a single position. An empty ``ctr_table`` selects the custom model."""
+    position = int(position)
+
+    if not ctr_table:  # Custom model
+        custom_ctr = custom_ctr if custom_ctr is not None else DEFAULT_CUSTOM_CTR
+        ctr = custom_ctr.get(position, custom_ctr['beyond_10'])
+    else:  # Predefined model
+        if position in ctr_table:
+            ctr = ctr_table[position]
+        else:
+            for i in range(position, 0, -1):
+                if i in ctr_table:
+                    ctr = ctr_table[i]
+                    break
+            else:
+                for i in range(position, 100):
+                    if i in ctr_table:
+                        ctr = ctr_table[i]
+                        break
+                else:
+                    ctr = 0.005
+
+    # Apply SERP feature modifiers
+    if ctr_table and featured_snippet_present:
+        if position == 1:
+            ctr *= 1.1 if in_featured_snippet else 0.8
+        elif 2 <= position <= 5:
+            ctr *= 0.9
+    if ctr_table and faq_present and position == 1:
+        ctr *= 1.1 if in_faq else 0.9
+
+    return max(0.001, ctr)
+
+
+@lru_cache(maxsize=64)
+def _cached_table(ctr_model, serp_flags, custom_items):
+    ctr_table = CTR_MODELS.get(ctr_model, {})
+    custom_ctr = dict(custom_items) if custom_items is not None else None
+    # Index 0 stands in for every position below 1; get_ctr treats those identically
+    table = np.array([get_ctr(pos, ctr_table, *serp_flags, custom_ctr=custom_ctr) for pos in range(MAX_POSITION + 1)])
+    table.flags.writeable = False
+    return table
+
+
+def ctr_lookup_table(ctr_model, featured_snippet_present=False, in_featured_snippet=False, faq_present=False, in_faq=False,
+                     custom_ctr=None):
+    """Dense, read-only CTR array for positions ``0..MAX_POSITION`` (cached per model and SERP flags)."""
+    ctr_table = CTR_MODELS.get(ctr_model, {})
+    custom_items = None
+    if not ctr_table:
+        custom_items = frozenset((custom_ctr if custom_ctr is not None else DEFAULT_CUSTOM_CTR).items())
+    serp_flags = (bool(featured_snippet_present), bool(in_featured_snippet), bool(faq_present), bool(in_faq))
+    return _cached_table(ctr_model, serp_flags, custom_items)
+
+
+def lookup_ctr(positions, table):
+    """Vectorized ``get_ctr`` for an array-like of positions against a table from :func:`ctr_lookup_table`."""
+    idx = np.asarray(positions).astype(np.int64, copy=False)
+    return table[np.clip(idx, 0, MAX_POSITION)]
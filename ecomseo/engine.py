@@ -0,0 +1,360 @@
+"""Headless forecasting engine.
+
+Pure pandas/NumPy port of the forecast math behind the Home page. Nothing in
+here imports Streamlit or a charting library, so it can be used from batch
+jobs, workers and benchmarks.
+"""
+from dataclasses import dataclass, field, fields
+from typing import Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .ctr import MAX_POSITION, ctr_lookup_table, lookup_ctr
+from .models import CTR_STD, DEFAULT_SETTINGS, DIFFICULTY_DIVISOR, SEASONALITY, Z_SCORE
+from .profiles import MONTHS_PER_YEAR, PROFILE_CHUNKSIZE, MonthlyVolumes
+from .profiling import stage
+from .schedule import break_even_month as find_break_even_month, monthly_schedule
+
+
+@dataclass(frozen=True)
+class ForecastSettings:
+    """Scenario inputs for a forecast (mirrors ``st.session_state.settings``)."""
+    category: str = DEFAULT_SETTINGS["category"]
+    projection_months: int = DEFAULT_SETTINGS["projection_months"]
+    conversion_rate: float = DEFAULT_SETTINGS["conversion_rate"]  # percent
+    aov: float = DEFAULT_SETTINGS["aov"]
+    implementation_cost: float = DEFAULT_SETTINGS["implementation_cost"]
+    ctr_model: str = DEFAULT_SETTINGS["ctr_model"]
+    featured_snippet_present: bool = False
+    in_featured_snippet: bool = False
+    faq_present: bool = False
+    in_faq: bool = False
+    custom_ctr: Optional[Mapping] = None
+    start_month: Optional[int] = None  # 0-based calendar month; defaults to the current month
+    # Per-keyword monthly volume history; keywords without one follow the category curve
+    monthly_volumes: Optional[MonthlyVolumes] = field(default=None, repr=False)
+
+    @classmethod
+    def from_dict(cls, settings, **overrides):
+        """Build settings from a plain dict, ignoring UI-only keys such as ``currency_selection``."""
+        names = {f.name for f in fields(cls)}
+        values = {k: v for k, v in dict(settings, **overrides).items() if k in names}
+        if values.get("custom_ctr") is not None:
+            values["custom_ctr"] = dict(values["custom_ctr"])  # snapshot; the UI mutates its dict in place
+        return cls(**values)
+
+    @property
+    def ctr_lookup(self):
+        """Dense CTR-by-position array for this model and SERP flags (see :func:`ctr.ctr_lookup_table`)."""
+        return ctr_lookup_table(self.ctr_model, *self.serp_flags, custom_ctr=self.custom_ctr)
+
+    @property
+    def serp_flags(self):
+        return (self.featured_snippet_present, self.in_featured_snippet, self.faq_present, self.in_faq)
+
+
+@dataclass
+class ForecastResult:
+    """Output of :func:`forecast`. All values are numeric; formatting is left to the caller."""
+    keywords: pd.DataFrame
+    total_current_traffic: float
+    total_traffic_gain: float
+    total_traffic_gain_std: float
+    traffic_ci: Tuple[float, float]
+    total_conversion_gain: int
+    total_conversion_gain_std: float
+    conversion_ci: Tuple[int, int]
+    total_revenue_gain: float
+    total_revenue_gain_std: float
+    revenue_ci: Tuple[float, float]
+    cpa: float
+    traffic_percent: float
+    conversion_percent: float
+    revenue_percent: float
+    break_even: pd.DataFrame
+    break_even_month: Optional[int]
+    monthly: pd.DataFrame
+    settings: ForecastSettings = field(repr=False, default=None)
+
+
+def _as_settings(settings):
+    if settings is None:
+        return ForecastSettings()
+    if isinstance(settings, ForecastSettings):
+        return settings
+    return ForecastSettings.from_dict(settings)
+
+
+def adjusted_target_position(position, target_position, keyword_difficulty):
+    """Realistic target: the position gap shrunk by keyword difficulty, never worse than the current position."""
+    # Float math so compact unsigned inputs (uint8 positions) cannot wrap around on subtraction
+    position = np.asarray(position, dtype=np.float64)
+    target_position = np.asarray(target_position, dtype=np.float64)
+    keyword_difficulty = np.asarray(keyword_difficulty, dtype=np.float64)
+    adjusted = np.trunc(position - (position - target_position) * (1 - keyword_difficulty / DIFFICULTY_DIVISOR))
+    return np.maximum(1, np.minimum(position, adjusted)).astype(np.int64)
+
+
+def keyword_traffic_gain(keywords, settings):
+    """Per-keyword traffic gain as a NumPy array, without building the intermediate frame columns."""
+    table = settings.ctr_lookup
+    position = keywords['position'].to_numpy()
+    adjusted = adjusted_target_position(position, keywords['targetPosition'].to_numpy(), keywords['keywordDifficulty'].to_numpy())
+    volume = keywords['searchVolume'].to_numpy()
+    return volume * lookup_ctr(adjusted, table) - volume * lookup_ctr(position, table)
+
+
+@dataclass(frozen=True)
+class PositionVolumes:
+    """Search volume (and squared volume) summed by current and by adjusted target position.
+
+    Every keyword with the same position contributes the same CTR, so the traffic totals reduce to dot products
+    of these ``MAX_POSITION + 1``-long histograms with the cached CTR table. None of it depends on the settings:
+    build it once per keyword frame and the totals for any CTR model or SERP flags cost a few hundred flops.
+    """
+    current: np.ndarray
+    target: np.ndarray
+    current_sq: np.ndarray
+    target_sq: np.ndarray
+
+    @classmethod
+    def from_keywords(cls, keywords):
+        position = keywords['position'].to_numpy()
+        adjusted = adjusted_target_position(position, keywords['targetPosition'].to_numpy(), keywords['keywordDifficulty'].to_numpy())
+        volume = keywords['searchVolume'].to_numpy(dtype=np.float64)
+        volume_sq = volume * volume
+        size = MAX_POSITION + 1
+        # Same clipping as lookup_ctr, so out-of-range positions land on the same CTR
+        position = np.clip(position.astype(np.int64, copy=False), 0, MAX_POSITION)
+        adjusted = np.clip(adjusted, 0, MAX_POSITION)
+        return cls(
+            current=np.bincount(position, weights=volume, minlength=size),
+            target=np.bincount(adjusted, weights=volume, minlength=size),
+            current_sq=np.bincount(position, weights=volume_sq, minlength=size),
+            target_sq=np.bincount(adjusted, weights=volume_sq, minlength=size),
+        )
+
+    def traffic_gain(self, settings):
+        """Total traffic gain, equal to ``keyword_traffic_gain(keywords, settings).sum()``."""
+        table = _as_settings(settings).ctr_lookup
+        return float(self.target @ table - self.current @ table)
+
+    def traffic_gain_std(self, settings):
+        """Standard deviation of the total traffic gain, as :func:`forecast` reports it."""
+        table = _as_settings(settings).ctr_lookup
+        table_sq = table * table
+        return float(np.sqrt((self.current_sq @ table_sq + self.target_sq @ table_sq) * CTR_STD**2))
+
+
+def total_traffic_gain(keywords, settings, with_std=False):
+    """Total traffic gain (and its std if ``with_std``) in one reduction, without per-keyword metric columns."""
+    with stage("traffic_gain_total", rows=len(keywords)):
+        volumes = PositionVolumes.from_keywords(keywords)
+        if with_std:
+            return volumes.traffic_gain(settings), volumes.traffic_gain_std(settings)
+        return volumes.traffic_gain(settings)
+
+
+@dataclass(frozen=True)
+class SeasonalVolumes:
+    """:class:`PositionVolumes` split by calendar month, for keywords with a monthly volume history.
+
+    ``current[p, m]`` sums volume x seasonal index (the keyword's month-``m`` volume over its monthly mean) over
+    keywords currently at position ``p``. ``target`` does the same by adjusted target position. Keywords without a
+    usable history only go into the ``fallback_*`` histograms and take the category curve. The traffic gain of
+    calendar month ``m``, summed over all keywords, is then a product of these histograms with the CTR table.
+    """
+    current: np.ndarray
+    target: np.ndarray
+    fallback_current: np.ndarray
+    fallback_target: np.ndarray
+
+    @classmethod
+    def from_keywords(cls, keywords, monthly_volumes, chunksize=PROFILE_CHUNKSIZE):
+        position = keywords['position'].to_numpy()
+        if 'adjustedTargetPosition' in keywords:  # a metrics frame already has it
+            adjusted = keywords['adjustedTargetPosition'].to_numpy()
+        else:
+            adjusted = adjusted_target_position(position, keywords['targetPosition'].to_numpy(),
+                                                keywords['keywordDifficulty'].to_numpy())
+        position = np.clip(position.astype(np.int64, copy=False), 0, MAX_POSITION)
+        adjusted = np.clip(adjusted, 0, MAX_POSITION)
+        volume = keywords['searchVolume'].to_numpy(dtype=np.float64)
+        rows = monthly_volumes.rows(keywords['keyword'])
+
+        size = MAX_POSITION + 1
+        current, target = np.zeros((size, MONTHS_PER_YEAR)), np.zeros((size, MONTHS_PER_YEAR))
+        fallback_current, fallback_target = np.zeros(size), np.zeros(size)
+        # Chunked so the float32 index block stays small at 1M keywords
+        for start in range(0, len(rows), chunksize):
+            chunk = slice(start, start + chunksize)
+            index, valid = monthly_volumes.seasonal_index(rows[chunk])
+            pos, adj, vol = position[chunk], adjusted[chunk], volume[chunk]
+            fallback_current += np.bincount(pos[~valid], weights=vol[~valid], minlength=size)
+            fallback_target += np.bincount(adj[~valid], weights=vol[~valid], minlength=size)
+            weighted = index[valid] * vol[valid, None]
+            pos, adj = pos[valid], adj[valid]
+            for month in range(MONTHS_PER_YEAR):
+                current[:, month] += np.bincount(pos, weights=weighted[:, month], minlength=size)
+                target[:, month] += np.bincount(adj, weights=weighted[:, month], minlength=size)
+        return cls(current, target, fallback_current, fallback_target)
+
+    def season(self, settings, category=None):
+        """Traffic gain per calendar month (Jan..Dec), to be used as the schedule's seasonal curve.
+
+        Fallback keywords follow ``category`` (default: the settings' category). Only the curve's shape matters
+        to the schedule.
+        """
+        settings = _as_settings(settings)
+        return self.seasons(settings.ctr_lookup[None], [category or settings.category])[0, 0]
+
+    def seasons(self, tables, categories):
+        """:meth:`season` for every CTR table (rows of ``tables``) and category, shaped ``(tables, categories, 12)``.
+
+        Category curves are rescaled to a mean of 1 so fallback keywords weigh the same as profiled ones.
+        """
+        curves = np.array([SEASONALITY[category] for category in categories], dtype=np.float64)
+        curves /= curves.mean(axis=1, keepdims=True)
+        fallback_gain = tables @ (self.fallback_target - self.fallback_current)
+        return (tables @ (self.target - self.current))[:, None, :] + fallback_gain[:, None, None] * curves[None]
+
+
+def seasonal_curve(keywords, settings):
+    """Seasonal curve from ``settings.monthly_volumes`` for these keywords, or ``None`` to use the category's."""
+    if settings.monthly_volumes is None:
+        return None
+    with stage("seasonal_profile", rows=len(keywords)):
+        return SeasonalVolumes.from_keywords(keywords, settings.monthly_volumes).season(settings)
+
+
+def keyword_metric_arrays(keywords, settings):
+    """Per-keyword CTR, adjusted target, traffic, conversion, revenue and std columns as NumPy arrays."""
+    table = settings.ctr_lookup
+    search_volume = keywords['searchVolume'].to_numpy()
+    position = keywords['position'].to_numpy()
+
+    with stage("ctr_assignment", rows=len(position)):
+        current_ctr = lookup_ctr(position, table)
+        adjusted = adjusted_target_position(position, keywords['targetPosition'].to_numpy(), keywords['keywordDifficulty'].to_numpy())
+        target_ctr = lookup_ctr(adjusted, table)
+
+    metrics = {}
+    metrics['currentCTR'] = current_ctr
+    metrics['adjustedTargetPosition'] = adjusted
+    metrics['targetCTR'] = target_ctr
+    metrics['currentTraffic'] = current_traffic = search_volume * current_ctr
+    metrics['targetTraffic'] = target_traffic = search_volume * target_ctr
+    metrics['trafficGain'] = traffic_gain = target_traffic - current_traffic
+    metrics['conversionGain'] = conversion_gain = traffic_gain * (settings.conversion_rate / 100)
+    metrics['revenueGain'] = conversion_gain * settings.aov
+
+    # Confidence intervals
+    metrics['currentTraffic_std'] = current_std = search_volume * current_ctr * CTR_STD
+    metrics['targetTraffic_std'] = target_std = search_volume * target_ctr * CTR_STD
+    metrics['trafficGain_std'] = np.sqrt(current_std**2 + target_std**2)
+    return metrics
+
+
+def compute_keyword_metrics(keywords, settings):
+    """The keyword frame with the :func:`keyword_metric_arrays` columns appended."""
+    with stage("keyword_metrics", rows=len(keywords)):
+        keywords = keywords.copy(deep=False)  # only new columns are added, so the caller's frame is untouched
+        for column, values in keyword_metric_arrays(keywords, settings).items():
+            keywords[column] = values
+    return keywords
+
+
+@dataclass
+class KeywordTotals:
+    """Column sums the summary figures are derived from. All are additive, so they can be patched per row."""
+    count: int = 0
+    current_traffic: float = 0.0
+    traffic_gain: float = 0.0
+    traffic_gain_var: float = 0.0  # sum of trafficGain_std ** 2
+    conversion_gain: float = 0.0
+    keyword_difficulty: float = 0.0
+
+    @classmethod
+    def from_metrics(cls, keywords):
+        """Totals over a frame produced by :func:`compute_keyword_metrics` (or a dict of its columns)."""
+        return cls(
+            count=len(keywords['trafficGain']),
+            current_traffic=keywords['currentTraffic'].sum(),
+            traffic_gain=keywords['trafficGain'].sum(),
+            traffic_gain_var=(keywords['trafficGain_std']**2).sum(),
+            conversion_gain=keywords['conversionGain'].sum(),
+            keyword_difficulty=float(keywords['keywordDifficulty'].sum()),
+        )
+
+    def __add__(self, other):
+        return KeywordTotals(*(getattr(self, f.name) + getattr(other, f.name) for f in fields(self)))
+
+    def __sub__(self, other):
+        return KeywordTotals(*(getattr(self, f.name) - getattr(other, f.name) for f in fields(self)))
+
+
+def summarize(keywords, totals, settings):
+    """Build the :class:`ForecastResult` (CIs, ROI, schedule) from per-keyword metrics and their totals."""
+    conversion_rate = settings.conversion_rate
+    aov = settings.aov
+    implementation_cost = settings.implementation_cost
+
+    with stage("confidence_intervals", rows=totals.count):
+        total_traffic_gain = totals.traffic_gain
+        total_traffic_gain_std = np.sqrt(totals.traffic_gain_var)
+        traffic_ci = (total_traffic_gain - Z_SCORE * total_traffic_gain_std, total_traffic_gain + Z_SCORE * total_traffic_gain_std)
+
+        total_conversion_gain = int(round(totals.conversion_gain))
+        total_conversion_gain_std = total_traffic_gain_std * (conversion_rate / 100)
+        conversion_ci = (int(round(total_conversion_gain - Z_SCORE * total_conversion_gain_std)),
+                         int(round(total_conversion_gain + Z_SCORE * total_conversion_gain_std)))
+
+        total_revenue_gain = total_conversion_gain * aov
+        total_revenue_gain_std = total_conversion_gain_std * aov
+        revenue_ci = (total_revenue_gain - Z_SCORE * total_revenue_gain_std, total_revenue_gain + Z_SCORE * total_revenue_gain_std)
+
+        cpa = implementation_cost / total_conversion_gain if total_conversion_gain > 0 else float('inf')
+
+        total_current_traffic = totals.current_traffic
+        if total_current_traffic != 0:
+            traffic_percent = total_traffic_gain / total_current_traffic * 100
+            conversion_percent = total_conversion_gain / (total_current_traffic * conversion_rate / 100) * 100
+            revenue_percent = total_revenue_gain / (total_current_traffic * conversion_rate / 100 * aov) * 100
+        else:
+            traffic_percent = conversion_percent = revenue_percent = 0
+
+    avg_difficulty = totals.keyword_difficulty / totals.count if totals.count else float('nan')
+    with stage("monthly_schedule", rows=settings.projection_months):
+        season = seasonal_curve(keywords, settings)
+        break_even, monthly = monthly_schedule(total_traffic_gain, avg_difficulty, settings, season=season)
+        break_even_month = find_break_even_month(break_even['Cumulative Revenue'], implementation_cost)
+
+    return ForecastResult(
+        keywords=keywords,
+        total_current_traffic=total_current_traffic,
+        total_traffic_gain=total_traffic_gain,
+        total_traffic_gain_std=total_traffic_gain_std,
+        traffic_ci=traffic_ci,
+        total_conversion_gain=total_conversion_gain,
+        total_conversion_gain_std=total_conversion_gain_std,
+        conversion_ci=conversion_ci,
+        total_revenue_gain=total_revenue_gain,
+        total_revenue_gain_std=total_revenue_gain_std,
+        revenue_ci=revenue_ci,
+        cpa=cpa,
+        traffic_percent=traffic_percent,
+        conversion_percent=conversion_percent,
+        revenue_percent=revenue_percent,
+        break_even=break_even,
+        break_even_month=break_even_month,
+        monthly=monthly,
+        settings=settings,
+    )
+
+
+def forecast(keywords_df: pd.DataFrame, settings: Union[ForecastSettings, Mapping, None] = None) -> ForecastResult:
+    """Run the full forecast for a keyword frame with the columns in ``models.KEYWORD_COLUMNS``."""
+    settings = _as_settings(settings)
+    keywords = compute_keyword_metrics(keywords_df, settings)
+    return summarize(keywords, KeywordTotals.from_metrics(keywords), settings)
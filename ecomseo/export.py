@@ -0,0 +1,160 @@
+"""Forecast exports: numeric CSV, Parquet and multi-sheet Excel.
+
+Files are written chunk by chunk into a spooled temporary file (in memory while small, on disk beyond
+``SPOOL_MAX_BYTES``), so an export never holds the full encoded text next to the frame. The Home page hands
+:func:`export_bytes` to ``st.download_button`` as a callable, which means nothing is generated until someone
+actually downloads.
+"""
+import io
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .profiling import stage
+
+DEFAULT_CHUNKSIZE = 50_000
+SPOOL_MAX_BYTES = 64 * 1024 * 1024
+EXCEL_MAX_ROWS = 1_048_576  # per sheet, including the header
+
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def _chunks(frame, chunksize):
+    for start in range(0, max(len(frame), 1), chunksize):
+        yield frame.iloc[start:start + chunksize]
+
+
+def write_csv(frame, target, chunksize=DEFAULT_CHUNKSIZE):
+    """Write ``frame`` as UTF-8 CSV to a binary file object, one chunk at a time.
+
+    Uses Arrow's CSV writer, which formats floats about ten times faster than ``DataFrame.to_csv``; falls back
+    to pandas without pyarrow.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:  # pragma: no cover - pyarrow ships with Streamlit
+        text = io.TextIOWrapper(target, encoding="utf-8", newline="", write_through=True)
+        try:
+            for i, chunk in enumerate(_chunks(frame, chunksize)):
+                chunk.to_csv(text, index=False, header=i == 0)
+        finally:
+            text.detach()  # leave ``target`` open for the caller
+        return
+
+    writer = None
+    try:
+        for chunk in _chunks(frame, chunksize):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pa_csv.CSVWriter(target, table.schema, write_options=pa_csv.WriteOptions(quoting_style="needed"))
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_parquet(frame, target, chunksize=DEFAULT_CHUNKSIZE):
+    """Write ``frame`` as Parquet, one row group per chunk (needs pyarrow)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in _chunks(frame, chunksize):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(target, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _excel_rows(frame, chunksize):
+    for chunk in _chunks(frame, chunksize):
+        # openpyxl cannot store NaN/NA; empty cells instead
+        values = chunk.astype(object).where(chunk.notna(), None)
+        yield from values.itertuples(index=False, name=None)
+
+
+def write_excel(tables, target, chunksize=DEFAULT_CHUNKSIZE):
+    """Write ``{sheet name: frame}`` to an .xlsx workbook in openpyxl's streaming (write-only) mode.
+
+    Tables longer than an Excel sheet continue on ``"<name> (2)"``, ``"<name> (3)"``, ...
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for name, frame in tables.items():
+        rows_per_sheet = EXCEL_MAX_ROWS - 1
+        for part, start in enumerate(range(0, max(len(frame), 1), rows_per_sheet)):
+            sheet = workbook.create_sheet(name if part == 0 else f"{name} ({part + 1})")
+            sheet.append([str(col) for col in frame.columns])
+            for row in _excel_rows(frame.iloc[start:start + rows_per_sheet], chunksize):
+                sheet.append(row)
+    workbook.save(target)
+
+
+def summary_table(result):
+    """Headline figures of a :class:`~ecomseo.engine.ForecastResult` as a two-column table."""
+    rows = [
+        ("Total Current Traffic", result.total_current_traffic),
+        ("Total Traffic Gain", result.total_traffic_gain),
+        ("Traffic Gain 95% CI Low", result.traffic_ci[0]),
+        ("Traffic Gain 95% CI High", result.traffic_ci[1]),
+        ("Total Conversion Gain", result.total_conversion_gain),
+        ("Conversion Gain 95% CI Low", result.conversion_ci[0]),
+        ("Conversion Gain 95% CI High", result.conversion_ci[1]),
+        ("Total Revenue Gain", result.total_revenue_gain),
+        ("Revenue Gain 95% CI Low", result.revenue_ci[0]),
+        ("Revenue Gain 95% CI High", result.revenue_ci[1]),
+        ("CPA", result.cpa if np.isfinite(result.cpa) else None),
+        ("Break-Even Month", result.break_even_month),
+    ]
+    return pd.DataFrame(rows, columns=["Metric", "Value"])
+
+
+def export_tables(result, what_if=None):
+    """Sheets of the Excel export: summary, keyword details, monthly projections, break-even and what-if."""
+    tables = {
+        "Summary": summary_table(result),
+        "Keyword Details": result.keywords,
+        "Monthly Projections": result.monthly,
+        "Break-Even": result.break_even,
+    }
+    if what_if is not None:
+        tables["What-If"] = what_if
+    return tables
+
+
+def export_file(result, file_format="CSV", what_if=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Build an export of ``result`` and return it as a binary file object positioned at the start.
+
+    CSV and Parquet contain the numeric per-keyword table; Excel has one sheet per table of
+    :func:`export_tables`. ``what_if`` may be a frame or a zero-argument callable returning one (only called for
+    Excel).
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {file_format!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+    target = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    with stage(f"export_{EXPORT_FORMATS[file_format][0]}", rows=len(result.keywords)):
+        if file_format == "CSV":
+            write_csv(result.keywords, target, chunksize)
+        elif file_format == "Parquet":
+            write_parquet(result.keywords, target, chunksize)
+        else:
+            write_excel(export_tables(result, what_if() if callable(what_if) else what_if), target, chunksize)
+    target.seek(0)
+    return target
+
+
+def export_bytes(result, file_format="CSV", what_if=None, chunksize=DEFAULT_CHUNKSIZE):
+    """:func:`export_file` read into ``bytes`` (what ``st.download_button`` accepts)."""
+    with export_file(result, file_format, what_if, chunksize) as f:
+        return f.read()
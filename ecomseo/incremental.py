@@ -0,0 +1,116 @@
+"""Incremental re-forecasting for edited keyword tables.
+
+``st.data_editor`` hands back a whole new frame after every edit. ``IncrementalForecast`` diffs it against the
+previous one by index, recomputes metrics only for changed, added and removed rows, and patches the running
+totals (traffic gain, sum of squared stds, ...) instead of re-summing every keyword.
+"""
+import numpy as np
+import pandas as pd
+
+from .cache import settings_fingerprint
+from .engine import KeywordTotals, _as_settings, compute_keyword_metrics, keyword_metric_arrays, summarize
+from .models import KEYWORD_COLUMNS
+from .profiling import stage
+
+
+def changed_mask(previous, current, columns=KEYWORD_COLUMNS):
+    """Boolean mask of rows that differ in any of ``columns`` between two row-aligned frames."""
+    same = np.ones(len(current), dtype=bool)
+    for column in columns:
+        a = previous[column]
+        b = current[column]
+        # Compare the backing arrays directly; converting Arrow/str columns to object arrays is the slow part
+        equal = a.array == b.array
+        equal = equal.to_numpy(dtype=bool, na_value=False) if hasattr(equal, "to_numpy") else np.asarray(equal, dtype=bool)
+        same &= equal | (a.isna().to_numpy() & b.isna().to_numpy())
+    return ~same
+
+
+def changed_rows(previous, current, columns=KEYWORD_COLUMNS):
+    """Index labels present in both frames whose values differ in any of ``columns``."""
+    common = current.index.intersection(previous.index, sort=False)
+    if len(common) == 0:
+        return common
+    return common[changed_mask(previous.loc[common], current.loc[common], columns)]
+
+
+class IncrementalForecast:
+    """Per-keyword metrics and totals that are kept up to date across edits.
+
+    ``update`` falls back to a full recompute when the settings change or the index is not unique.
+    """
+
+    def __init__(self):
+        self.keywords = None
+        self.totals = None
+        self.settings = None
+        self.rows_recomputed = 0
+        self._settings_key = None
+
+    def reset(self, keywords, settings):
+        self.settings = _as_settings(settings)
+        self._settings_key = settings_fingerprint(self.settings)
+        self.keywords = compute_keyword_metrics(keywords, self.settings)
+        self.totals = KeywordTotals.from_metrics(self.keywords)
+        self.rows_recomputed = len(keywords)
+
+    def update(self, keywords, settings=None):
+        """Bring the state in line with ``keywords`` and return the resulting :class:`ForecastResult`."""
+        settings = _as_settings(settings)
+        if (self.keywords is None or not keywords.index.is_unique
+                or settings_fingerprint(settings) != self._settings_key):
+            self.reset(keywords, settings)
+            return self.result()
+
+        previous = self.keywords
+        if previous.index.equals(keywords.index):
+            self._patch_in_place(previous, keywords, settings)
+        else:
+            self._patch_reindexed(previous, keywords, settings)
+        return self.result()
+
+    def _patch_in_place(self, previous, keywords, settings):
+        with stage("change_detection", rows=len(keywords)):
+            positions = np.flatnonzero(changed_mask(previous, keywords))
+        self.rows_recomputed = len(positions)
+        if not len(positions):
+            self.keywords = previous
+            return
+        rows = keywords.iloc[positions]
+        fresh = keyword_metric_arrays(rows, settings)
+        stale = {column: previous[column].to_numpy()[positions] for column in fresh}
+        stale['keywordDifficulty'] = previous['keywordDifficulty'].to_numpy()[positions]
+        fresh['keywordDifficulty'] = rows['keywordDifficulty'].to_numpy()
+        self.totals = self.totals - KeywordTotals.from_metrics(stale) + KeywordTotals.from_metrics(fresh)
+
+        # Inputs come from the edited frame; metric columns are patched copies (earlier results may
+        # still reference the previous arrays)
+        metrics = keywords.copy(deep=False)
+        for column, values in fresh.items():
+            if column in metrics:
+                continue
+            patched = previous[column].to_numpy().copy()
+            patched[positions] = values
+            metrics[column] = patched
+        self.keywords = metrics
+
+    def _patch_reindexed(self, previous, keywords, settings):
+        with stage("change_detection", rows=len(keywords)):
+            removed = previous.index.difference(keywords.index, sort=False)
+            added = keywords.index.difference(previous.index, sort=False)
+            changed = changed_rows(previous, keywords)
+        self.rows_recomputed = len(added) + len(changed)
+
+        if len(removed) or len(changed):
+            self.totals = self.totals - KeywordTotals.from_metrics(previous.loc[removed.append(changed)])
+        dirty = changed.append(added)
+        if len(dirty):
+            fresh = compute_keyword_metrics(keywords.loc[dirty], settings)
+            self.totals = self.totals + KeywordTotals.from_metrics(fresh)
+            kept = previous.drop(removed.append(changed))
+            self.keywords = pd.concat([kept, fresh]).loc[keywords.index]
+        else:
+            self.keywords = previous.loc[keywords.index]
+
+    def result(self):
+        return summarize(self.keywords, self.totals, self.settings)
@@ -0,0 +1,413 @@
+"""Keyword file ingestion.
+
+Column detection only needs the header row. The data is then read in chunks, restricted to the detected
+keyword/volume/position/difficulty columns, and each chunk is normalized to compact dtypes before being kept,
+so peak memory stays close to the size of the normalized result rather than a multiple of the raw export.
+
+Google Search Console performance exports (one row per query, page and day, with clicks, impressions and average
+position) are recognized by their header and aggregated per query while streaming. Memory then grows with the
+number of distinct queries, not with the row count.
+"""
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .profiles import MONTHS_PER_YEAR, MonthlyVolumes, calendar_volumes
+from .profiling import stage
+from .schema import KEYWORD_STRING_DTYPE, empty_keywords, enforce_schema
+
+DEFAULT_CHUNKSIZE = 100_000
+DAYS_PER_MONTH = 365.25 / 12
+
+# Monthly volume headers: "Jan 2024", "Searches: January 2024", "Volume (Jan 2024)", "2024-01"
+_MONTH_NAMES = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+_NAMED_MONTH = re.compile(r"(?<![a-z])(" + "|".join(_MONTH_NAMES) + r")[a-z]*\W*(?:19|20)\d\d(?!\d)")
+_ISO_MONTH = re.compile(r"(?<!\d)(?:19|20)\d\d-(0[1-9]|1[0-2])(?!\d)")
+
+
+@dataclass(frozen=True)
+class ColumnMap:
+    """Source column names (as they appear in the file) for each normalized column."""
+    keyword: str
+    volume: Optional[str] = None
+    position: Optional[str] = None
+    difficulty: Optional[str] = None
+
+    @property
+    def usecols(self):
+        return list(dict.fromkeys(col for col in (self.keyword, self.volume, self.position, self.difficulty) if col is not None))
+
+
+def _month_of_column(column):
+    """0-based calendar month a monthly volume header refers to, or ``None``."""
+    column = str(column).lower()
+    match = _NAMED_MONTH.search(column)
+    if match:
+        return _MONTH_NAMES.index(match.group(1))
+    match = _ISO_MONTH.search(column)
+    return int(match.group(1)) - 1 if match else None
+
+
+def detect_month_columns(columns):
+    """``{column: calendar month}`` for monthly volume columns, or ``{}`` unless all 12 months are covered."""
+    months = {str(col): month for col in columns if (month := _month_of_column(col)) is not None}
+    return months if len(set(months.values())) == MONTHS_PER_YEAR else {}
+
+
+def detect_trend_column(columns):
+    """SEMrush's ``Trend``/``Trends`` column (12 comma-separated relative volumes), if present."""
+    return next((str(col) for col in columns if str(col).strip().lower() in ("trend", "trends")), None)
+
+
+def detect_columns(columns):
+    """Guess the keyword, volume, position and difficulty columns from header names.
+
+    Matching is case-insensitive; without a match, volume and position fall back to the second and third
+    columns. The returned names keep the file's original casing.
+    """
+    columns = [str(col) for col in columns]
+    lowered = [col.lower() for col in columns]
+
+    def find(names, fallback=None, exclude=lambda col: False):
+        # Positions, not names: headers differing only in case ("Volume", "volume") stay distinct
+        index = next((i for i, col in enumerate(lowered) if any(name in col for name in names) and not exclude(col)), fallback)
+        return columns[index] if index is not None and index < len(columns) else None
+
+    return ColumnMap(
+        find(["keyword", "term", "query", "search term"], 0),
+        find(["volume", "search volume", "monthly searches"], 1, exclude=lambda col: _month_of_column(col) is not None),
+        find(["position", "rank", "ranking", "pos", "serp"], 2),
+        find(["difficulty", "keyword difficulty"]),
+    )
+
+
+def normalize_keywords(df, column_map):
+    """Map a raw chunk onto the compact keyword schema (targets default to half the current position)."""
+    sources = {"keyword": column_map.keyword, "searchVolume": column_map.volume,
+               "position": column_map.position, "keywordDifficulty": column_map.difficulty}
+    raw = pd.DataFrame({name: df[col].array for name, col in sources.items() if col is not None})
+    return enforce_schema(raw)
+
+
+@dataclass(frozen=True)
+class SearchConsoleColumns:
+    """Source columns of a Search Console performance export (``date`` is absent from pre-aggregated exports)."""
+    query: str
+    impressions: str
+    position: str
+    date: Optional[str] = None
+
+    @property
+    def usecols(self):
+        return [col for col in (self.query, self.impressions, self.position, self.date) if col is not None]
+
+
+def detect_search_console_columns(columns):
+    """The Search Console columns of a header, or ``None`` when it is not a Search Console export.
+
+    An export is recognized by an ``impressions`` column next to a query and a position column (``Query`` or
+    ``Top queries``, ``Position``, and optionally ``Date``, as in the UI and API exports).
+    """
+    columns = [str(col) for col in columns]
+    lowered = [col.lower().strip() for col in columns]
+
+    def find(*names, exact=False):
+        return next((original for col, original in zip(lowered, columns)
+                     if (col in names if exact else any(name in col for name in names))), None)
+
+    query, impressions, position = find("query", "queries"), find("impressions"), find("position")
+    if query is None or impressions is None or position is None:
+        return None
+    return SearchConsoleColumns(query, impressions, position, find("date", exact=True))
+
+
+def read_search_console_columns(source, name):
+    """:func:`detect_search_console_columns` for a file's header (``None`` for Excel files); the position is restored.
+
+    Lets a caller ask for the period covered by an export without a ``Date`` column before reading it.
+    """
+    if not name.lower().endswith('.csv'):
+        return None
+    start = source.tell() if hasattr(source, "tell") else None
+    try:
+        return detect_search_console_columns(pd.read_csv(source, nrows=0).columns)
+    finally:
+        if start is not None:
+            source.seek(start)
+
+
+class QueryTotals:
+    """Running per-query impression totals (and impression-weighted position sums) over streamed chunks.
+
+    Each chunk is reduced to one row per query before it is kept. The partial totals are merged again whenever
+    they outgrow the last merge by ``compact_factor``, so memory stays proportional to the number of distinct
+    queries however many rows are read.
+    """
+
+    def __init__(self, compact_factor=2):
+        self.compact_factor = compact_factor
+        self._partials = []
+        self._rows = 0
+        self._compacted_rows = 0
+        self.first_date = None
+        self.last_date = None
+
+    def add(self, chunk, columns):
+        impressions = pd.to_numeric(chunk[columns.impressions], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        position = pd.to_numeric(chunk[columns.position], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = (impressions > 0) & ~np.isnan(position)
+        partial = pd.DataFrame({
+            "query": chunk[columns.query].array[valid],
+            "impressions": impressions[valid],
+            "weighted_position": (position * impressions)[valid],
+        }).groupby("query", sort=False, observed=True).sum()
+        self._partials.append(partial)
+        self._rows += len(partial)
+        if columns.date is not None and len(chunk):
+            dates = chunk[columns.date].dropna()
+            if len(dates):
+                first, last = pd.to_datetime(dates.min()), pd.to_datetime(dates.max())
+                self.first_date = first if self.first_date is None else min(self.first_date, first)
+                self.last_date = last if self.last_date is None else max(self.last_date, last)
+        if self._rows > self.compact_factor * max(self._compacted_rows, 1):
+            self._compact()
+
+    def _compact(self):
+        if len(self._partials) > 1:
+            self._partials = [pd.concat(self._partials).groupby(level=0, sort=False).sum()]
+        self._rows = self._compacted_rows = sum(len(partial) for partial in self._partials)
+
+    def months(self):
+        """Months spanned by the dates seen (calendar days / 30.44), or ``None`` without a date column."""
+        if self.first_date is None:
+            return None
+        return ((self.last_date - self.first_date).days + 1) / DAYS_PER_MONTH
+
+    def to_keywords(self, months=None):
+        """Normalized keyword frame: monthly impressions as ``searchVolume``, weighted mean as ``position``.
+
+        ``months`` overrides the period the impressions cover; by default it is the date span of the export, or a
+        single month when the export has no dates.
+        """
+        if months is not None and not months > 0:
+            raise ValueError(f"months must be positive, got {months}")
+        self._compact()
+        if not self._partials:
+            return empty_keywords()
+        totals = self._partials[0]
+        months = months or self.months() or 1
+        return enforce_schema(pd.DataFrame({
+            "keyword": totals.index.array,
+            "searchVolume": np.round(totals["impressions"].to_numpy() / months),
+            "position": np.round(totals["weighted_position"].to_numpy() / totals["impressions"].to_numpy()),
+        }))
+
+
+def read_search_console_csv(source, columns=None, chunksize=DEFAULT_CHUNKSIZE, progress=None, months=None):
+    """Stream a Search Console performance CSV and aggregate it per query (see :class:`QueryTotals`)."""
+    if columns is None:
+        start = source.tell() if hasattr(source, "tell") else None
+        with stage("column_detection"):
+            columns = detect_search_console_columns(pd.read_csv(source, nrows=0).columns)
+        if columns is None:
+            raise ValueError("not a Search Console export: expected query, impressions and position columns")
+        if start is not None:
+            source.seek(start)
+    size = _file_size(source)
+
+    totals = QueryTotals()
+    rows = 0
+    dtypes = {columns.query: KEYWORD_STRING_DTYPE}
+    if columns.date is not None:
+        dtypes[columns.date] = KEYWORD_STRING_DTYPE
+    with stage("search_console_aggregation") as timing:
+        with pd.read_csv(source, usecols=columns.usecols, dtype=dtypes, chunksize=chunksize) as reader:
+            for chunk in reader:
+                totals.add(chunk, columns)
+                rows += len(chunk)
+                if progress is not None:
+                    fraction = source.tell() / size if size else 0.0
+                    progress(min(fraction, 1.0), rows)
+        keywords = totals.to_keywords(months)
+        timing.rows = rows
+    if progress is not None:
+        progress(1.0, rows)
+    return keywords
+
+
+def _concat(chunks):
+    if not chunks:
+        return empty_keywords()
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _file_size(source):
+    try:
+        position = source.tell()
+        size = source.seek(0, 2)
+        source.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+
+def read_csv_keywords(source, chunksize=DEFAULT_CHUNKSIZE, progress=None, search_console_months=None):
+    """Stream a CSV export into a normalized keyword frame, reading only the detected columns.
+
+    Search Console performance exports are aggregated per query instead (:func:`read_search_console_csv`);
+    ``search_console_months`` is the period they cover when they have no ``Date`` column.
+    """
+    start = source.tell() if hasattr(source, "tell") else None
+    with stage("column_detection"):
+        header = pd.read_csv(source, nrows=0).columns
+        search_console = detect_search_console_columns(header)
+        column_map = detect_columns(header)
+    if start is not None:
+        source.seek(start)
+    if search_console is not None:
+        return read_search_console_csv(source, search_console, chunksize=chunksize, progress=progress,
+                                       months=search_console_months)
+    size = _file_size(source)
+
+    chunks = []
+    rows = 0
+    reader = pd.read_csv(source, usecols=column_map.usecols, dtype={column_map.keyword: KEYWORD_STRING_DTYPE}, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            chunks.append(normalize_keywords(chunk, column_map))
+            rows += len(chunk)
+            if progress is not None:
+                fraction = source.tell() / size if size else 0.0
+                progress(min(fraction, 1.0), rows)
+    if progress is not None:
+        progress(1.0, rows)
+    return _concat(chunks)
+
+
+def read_xlsx_keywords(source, chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    """Stream the first sheet of an .xlsx workbook row by row (openpyxl read-only mode)."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        rows_iter = sheet.iter_rows(values_only=True)
+        header = next(rows_iter, None)
+        if header is None:
+            return _concat([])
+        header = [str(col) if col is not None else f"Unnamed: {i}" for i, col in enumerate(header)]
+        with stage("column_detection"):
+            column_map = detect_columns(header)
+        usecols = column_map.usecols
+        indices = [header.index(col) for col in usecols]
+        total = (sheet.max_row or 0) - 1
+
+        chunks = []
+        rows = 0
+        buffer = []
+        for row in rows_iter:
+            buffer.append([row[i] if i < len(row) else None for i in indices])
+            if len(buffer) >= chunksize:
+                chunks.append(normalize_keywords(pd.DataFrame(buffer, columns=usecols), column_map))
+                rows += len(buffer)
+                buffer = []
+                if progress is not None:
+                    progress(min(rows / total, 1.0) if total > 0 else 0.0, rows)
+        if buffer:
+            chunks.append(normalize_keywords(pd.DataFrame(buffer, columns=usecols), column_map))
+            rows += len(buffer)
+    finally:
+        workbook.close()
+    if progress is not None:
+        progress(1.0, rows)
+    return _concat(chunks)
+
+
+def read_xls_keywords(source, progress=None):
+    """Legacy .xls workbooks cannot be streamed; read the header first, then only the detected columns."""
+    start = source.tell() if hasattr(source, "tell") else None
+    with stage("column_detection"):
+        column_map = detect_columns(pd.read_excel(source, nrows=0).columns)
+    if start is not None:
+        source.seek(start)
+    df = normalize_keywords(pd.read_excel(source, usecols=column_map.usecols), column_map)
+    if progress is not None:
+        progress(1.0, len(df))
+    return df
+
+
+def _trend_months(end_month):
+    """Calendar month of each of the 12 trend values, oldest first, ending in ``end_month``."""
+    return (end_month - MONTHS_PER_YEAR + 1 + np.arange(MONTHS_PER_YEAR)) % MONTHS_PER_YEAR
+
+
+def _profile_block(chunk, month_columns, trend_column, trend_end_month):
+    if trend_column is None:
+        values = chunk[list(month_columns)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+        return calendar_volumes(values, list(month_columns.values()))
+    values = chunk[trend_column].astype(str).str.split(",", expand=True).reindex(columns=range(MONTHS_PER_YEAR))
+    values = values.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+    return calendar_volumes(values, _trend_months(trend_end_month))
+
+
+def read_monthly_volumes(source, name, chunksize=DEFAULT_CHUNKSIZE, trend_end_month=None):
+    """Per-keyword monthly volumes from a keyword export, or ``None`` if it has no (non-empty) monthly history.
+
+    Month columns must cover all 12 calendar months; a longer history is averaged per calendar month. A SEMrush
+    ``Trend`` column is read as the 12 months ending in ``trend_end_month`` (0-based; default: last month).
+    CSV files are read in chunks of ``chunksize`` rows, restricted to the keyword and monthly columns. The
+    source's position is restored afterwards, so the same file object can then go to :func:`read_keywords`.
+    """
+    name = name.lower()
+    read = pd.read_csv if name.endswith('.csv') else pd.read_excel
+    start = source.tell() if hasattr(source, "tell") else None
+    try:
+        header = read(source, nrows=0).columns
+        month_columns = detect_month_columns(header)
+        trend_column = None if month_columns else detect_trend_column(header)
+        if not month_columns and trend_column is None:
+            return None
+        if trend_end_month is None:
+            trend_end_month = (pd.Timestamp.now().month - 2) % MONTHS_PER_YEAR
+        keyword_column = detect_columns(header).keyword
+        usecols = [keyword_column, *month_columns] if trend_column is None else [keyword_column, trend_column]
+        if start is not None:
+            source.seek(start)
+
+        keywords, blocks = [], []
+        with stage("monthly_volumes") as timing:
+            if read is pd.read_csv:
+                dtypes = {keyword_column: KEYWORD_STRING_DTYPE}
+                with pd.read_csv(source, usecols=usecols, dtype=dtypes, chunksize=chunksize) as reader:
+                    for chunk in reader:
+                        keywords.append(chunk[keyword_column].array)
+                        blocks.append(_profile_block(chunk, month_columns, trend_column, trend_end_month))
+            else:  # Excel exports are capped at ~1M rows; read the few columns in one go
+                chunk = pd.read_excel(source, usecols=usecols, dtype={keyword_column: str})
+                keywords.append(chunk[keyword_column].array)
+                blocks.append(_profile_block(chunk, month_columns, trend_column, trend_end_month))
+            volumes = MonthlyVolumes.from_arrays(pd.concat([pd.Series(k) for k in keywords], ignore_index=True).array,
+                                                 np.concatenate(blocks))
+            timing.rows = len(volumes)
+        return volumes if len(volumes) else None  # header-only file or no named keywords
+    finally:
+        if start is not None:
+            source.seek(start)
+
+
+def read_keywords(source, name, chunksize=DEFAULT_CHUNKSIZE, progress=None, search_console_months=None):
+    """Read a CSV/Excel keyword export into the normalized frame the forecast consumes.
+
+    ``progress``, if given, is called as ``progress(fraction, rows_read)`` after each chunk.
+    ``search_console_months`` is the period covered by a Search Console export without a ``Date`` column (the
+    UI's ``Queries.csv``); without it, such an export counts as one month.
+    """
+    name = name.lower()
+    if name.endswith('.csv'):
+        return read_csv_keywords(source, chunksize=chunksize, progress=progress, search_console_months=search_console_months)
+    if name.endswith('.xlsx'):
+        return read_xlsx_keywords(source, chunksize=chunksize, progress=progress)
+    return read_xls_keywords(source, progress=progress)
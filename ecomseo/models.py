@@ -0,0 +1,59 @@
+"""Static model data shared by the Streamlit pages and the forecasting engine."""
+
+# CTR models
+CTR_MODELS = {
+    "Default": {1: 0.25, 2: 0.15, 3: 0.10, 4: 0.07, 5: 0.07, 6: 0.03, 7: 0.03, 8: 0.03, 9: 0.03, 10: 0.03, 11: 0.01, 20: 0.01, 21: 0.005},
+    "E-commerce": {1: 0.30, 2: 0.20, 3: 0.12, 4: 0.08, 5: 0.06, 6: 0.04, 7: 0.03, 8: 0.02, 9: 0.02, 10: 0.01, 11: 0.008, 20: 0.005, 21: 0.002},
+    "Informational": {1: 0.35, 2: 0.25, 3: 0.15, 4: 0.10, 5: 0.08, 6: 0.05, 7: 0.04, 8: 0.03, 9: 0.02, 10: 0.01, 11: 0.005, 20: 0.003, 21: 0.001},
+    "Custom": {}
+}
+
+# Custom CTR defaults (E-commerce curve for the top 10, flat beyond)
+DEFAULT_CUSTOM_CTR = {pos: CTR_MODELS["E-commerce"][pos] for pos in range(1, 11)}
+DEFAULT_CUSTOM_CTR['beyond_10'] = 0.005
+
+# Monthly seasonal multipliers per category (Jan..Dec)
+SEASONALITY = {
+    "BBQ & Outdoor Cooking": [0.4, 0.5, 0.7, 1.0, 1.5, 2.0, 2.0, 1.5, 1.0, 0.7, 0.7, 0.6],
+    "Christmas & Seasonal": [0.2, 0.2, 0.2, 0.2, 0.3, 0.3, 0.4, 0.6, 1.0, 1.5, 2.0, 2.5],
+    "Fashion & Apparel": [1.0, 0.8, 1.2, 1.5, 1.3, 1.0, 1.0, 1.5, 1.8, 1.3, 2.0, 1.8],
+    "Electronics & Technology": [1.0, 0.8, 0.8, 0.9, 0.9, 0.9, 0.9, 1.0, 1.1, 1.3, 2.2, 2.5],
+    "Gardening & Outdoor": [0.5, 0.7, 1.3, 1.8, 2.0, 1.8, 1.5, 1.3, 1.1, 0.8, 0.6, 0.5],
+    "Furniture & Home": [1.2, 1.0, 1.1, 1.2, 1.3, 1.3, 1.2, 1.2, 1.3, 1.2, 1.2, 0.9]
+}
+
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Default settings
+DEFAULT_SETTINGS = {
+    "category": "BBQ & Outdoor Cooking",
+    "projection_months": 6,
+    "conversion_rate": 3.0,
+    "currency_selection": "USD ($)",
+    "aov": 250,
+    "implementation_cost": 5000,
+    "ctr_model": "E-commerce",  # Changed to E-commerce for more realistic default
+    "featured_snippet_present": False,
+    "in_featured_snippet": False,
+    "faq_present": False,
+    "in_faq": False
+}
+
+CURRENCY_OPTIONS = {"GBP (£)": "£", "EUR (€)": "€", "USD ($)": "$", "AED (د.إ)": "د.إ", "SAR (﷼)": "﷼"}
+
+KEYWORD_COLUMNS = ["keyword", "searchVolume", "position", "targetPosition", "keywordDifficulty"]
+
+# Confidence interval assumptions
+CTR_STD = 0.10
+Z_SCORE = 1.96
+
+# Keyword difficulty (1-10) scales how much of the position gap is closed: gap * (1 - difficulty / divisor)
+DIFFICULTY_DIVISOR = 15
+
+# Sigmoid growth curve delay (fraction of the projection period)
+GROWTH_DELAY = 0.2
+
+# Monte Carlo simulation: spread of the share of the position gap actually closed, and relative spread of the
+# site conversion rate between scenarios
+RANKING_STD = 0.2
+CONVERSION_RATE_STD = 0.15
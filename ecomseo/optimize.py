@@ -0,0 +1,106 @@
+"""Budget-constrained keyword prioritization.
+
+Each keyword's effort is the number of positions it has to climb (current to adjusted target) weighted by its
+difficulty, priced at a cost per position. Choosing which keywords to fund within a budget is then a 0/1
+knapsack on the forecast's per-keyword ``revenueGain``. An exact solution is out of reach for a million
+candidates, so keywords are funded greedily by revenue per unit cost. The sorted prefix is the LP-relaxation
+optimum up to the first keyword that does not fit, and the leftover budget is then filled with the next ones
+that still fit, so the result is within one keyword's revenue of the optimum. One sort plus a few vectorized
+passes runs in well under a second at 1M keywords.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .profiling import stage
+
+# Default price of climbing one position at the midpoint difficulty; cost scales linearly with difficulty
+POSITION_COST = 100.0
+REFERENCE_DIFFICULTY = 5
+CURVE_POINTS = 200
+
+
+def keyword_cost(keywords, cost_per_position=POSITION_COST):
+    """Estimated cost of moving each keyword from its position to its adjusted target (needs forecast metrics)."""
+    climb = keywords['position'].to_numpy(dtype=np.float64) - keywords['adjustedTargetPosition'].to_numpy(dtype=np.float64)
+    difficulty = keywords['keywordDifficulty'].to_numpy(dtype=np.float64)
+    return np.maximum(climb, 0) * (difficulty / REFERENCE_DIFFICULTY) * cost_per_position
+
+
+@dataclass
+class Prioritization:
+    """Funded keywords and the marginal-ROI curve for one budget."""
+    budget: float
+    order: np.ndarray  # row positions of every fundable keyword, best revenue per cost first
+    selected: np.ndarray  # row positions of the funded keywords, in funding order
+    cost: np.ndarray  # per-keyword cost, aligned with the keyword frame
+    revenue: np.ndarray  # per-keyword revenue gain, aligned with the keyword frame
+
+    @property
+    def total_cost(self):
+        return float(self.cost[self.selected].sum())
+
+    @property
+    def total_revenue(self):
+        return float(self.revenue[self.selected].sum())
+
+    @property
+    def roi(self):
+        """ROI (%) of the funded set, as the app reports ROI: (revenue - cost) / cost."""
+        return (self.total_revenue - self.total_cost) / self.total_cost * 100 if self.total_cost > 0 else 0.0
+
+    def funded(self, keywords):
+        """The funded rows of ``keywords`` in funding order, with ``cost`` and ``roi`` (percent) columns."""
+        rows = keywords.iloc[self.selected].copy()
+        rows['cost'] = self.cost[self.selected]
+        rows['roi'] = (self.revenue[self.selected] - rows['cost']) / rows['cost'] * 100
+        return rows
+
+    def curve(self, points=CURVE_POINTS):
+        """Revenue against spend when keywords are funded in ratio order, with the marginal ROI at each point.
+
+        Downsampled to at most ``points`` rows (plus the origin), so it can be charted for any keyword count.
+        """
+        cost = np.cumsum(self.cost[self.order])
+        revenue = np.cumsum(self.revenue[self.order])
+        marginal = (self.revenue[self.order] / self.cost[self.order] - 1) * 100
+        steps = np.unique(np.linspace(0, len(self.order) - 1, min(points, len(self.order))).round().astype(np.int64))
+        return pd.DataFrame({
+            "Spend": np.concatenate([[0.0], cost[steps]]),
+            "Revenue Gain": np.concatenate([[0.0], revenue[steps]]),
+            "Keywords Funded": np.concatenate([[0], steps + 1]),
+            "Marginal ROI (%)": np.concatenate([[marginal[0] if len(marginal) else np.nan], marginal[steps]]),
+        })
+
+
+def _fill(candidates, cost, budget):
+    """Greedy fill: take ``candidates`` in order whenever they still fit in the remaining budget."""
+    chosen = []
+    remaining = budget
+    while len(candidates):
+        candidates = candidates[cost[candidates] <= remaining]
+        if not len(candidates):
+            break
+        spent = np.cumsum(cost[candidates])
+        fits = int(np.searchsorted(spent, remaining, side="right"))  # >= 1: the first candidate fits
+        chosen.append(candidates[:fits])
+        remaining -= spent[fits - 1]
+        candidates = candidates[fits:]  # starts with the first that did not fit; dropped by the next filter
+    return np.concatenate(chosen) if chosen else np.empty(0, dtype=np.int64)
+
+
+def prioritize(keywords, budget, cost_per_position=POSITION_COST, cost=None):
+    """Pick the keywords to fund within ``budget``, maximizing the forecast's total ``revenueGain``.
+
+    ``keywords`` is a forecast's metrics frame (``ForecastResult.keywords``). ``cost`` overrides the
+    :func:`keyword_cost` estimate with any per-keyword cost array.
+    """
+    with stage("prioritization", rows=len(keywords)):
+        revenue = keywords['revenueGain'].to_numpy(dtype=np.float64)
+        cost = keyword_cost(keywords, cost_per_position) if cost is None else np.asarray(cost, dtype=np.float64)
+        fundable = np.flatnonzero((revenue > 0) & (cost > 0))
+        ratio = revenue[fundable] / cost[fundable]
+        order = fundable[np.argsort(-ratio, kind="stable")]
+        selected = _fill(order, cost, float(budget))
+    return Prioritization(budget=float(budget), order=order, selected=selected, cost=cost, revenue=revenue)
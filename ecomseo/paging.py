@@ -0,0 +1,125 @@
+"""Server-side filtering, sorting and pagination of keyword tables.
+
+Browsers choke on 200k-row ``st.dataframe``/``st.data_editor`` payloads. The page asks for one page at a time:
+filter (keyword prefix, position range) and sort run over the full NumPy/Arrow columns here, and only the
+selected rows are formatted and sent. Totals are unaffected because they come from the whole frame.
+"""
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .incremental import changed_mask
+from .models import KEYWORD_COLUMNS
+from .schema import enforce_schema
+
+PAGE_SIZES = [25, 50, 100, 500]
+DEFAULT_PAGE_SIZE = 50
+EDITOR_PAGE_SIZE = 1000  # keyword sets larger than this are edited page by page
+
+# Sortable Keyword Details columns: label -> metric column
+SORT_COLUMNS = {
+    "Revenue Gain": "revenueGain",
+    "Traffic Gain": "trafficGain",
+    "Search Volume": "searchVolume",
+    "Current Position": "position",
+    "Keyword Difficulty": "keywordDifficulty",
+    "Keyword": "keyword",
+}
+
+
+@dataclass(frozen=True)
+class KeywordQuery:
+    sort_by: Optional[str] = None  # column name; None keeps the frame's order
+    descending: bool = True
+    prefix: str = ""  # case-insensitive keyword prefix
+    min_position: Optional[int] = None
+    max_position: Optional[int] = None
+    page: int = 0  # 0-based
+    page_size: int = DEFAULT_PAGE_SIZE
+
+
+@dataclass
+class KeywordPage:
+    rows: pd.DataFrame  # the requested page, original index kept
+    positions: np.ndarray  # row positions of ``rows`` in the full frame
+    matching: int  # rows passing the filters
+    total: int  # rows in the full frame
+    page: int
+    page_count: int
+    page_size: int
+
+    @property
+    def first_row(self):
+        """1-based number of the first row shown (0 for an empty page)."""
+        return self.page * self.page_size + 1 if len(self.rows) else 0
+
+    @property
+    def last_row(self):
+        return self.page * self.page_size + len(self.rows)
+
+
+def filter_mask(keywords, query):
+    """Boolean mask of rows matching ``query``'s prefix and position filters, or ``None`` when nothing is filtered."""
+    mask = None
+    if query.prefix:
+        keyword = keywords['keyword']
+        matches = keyword.str.lower().str.startswith(query.prefix.lower())
+        mask = matches.to_numpy(dtype=bool, na_value=False)
+    if query.min_position is not None or query.max_position is not None:
+        position = keywords['position'].to_numpy()
+        in_range = np.ones(len(position), dtype=bool)
+        if query.min_position is not None:
+            in_range &= position >= query.min_position
+        if query.max_position is not None:
+            in_range &= position <= query.max_position
+        mask = in_range if mask is None else mask & in_range
+    return mask
+
+
+def matching_positions(keywords, query):
+    """Row positions passing ``query``'s filters, in its sort order (stable, so pages never overlap)."""
+    mask = filter_mask(keywords, query)
+    positions = np.flatnonzero(mask) if mask is not None else np.arange(len(keywords))
+    if query.sort_by is None:
+        return positions
+    key = keywords[query.sort_by].iloc[positions].reset_index(drop=True)
+    order = key.sort_values(ascending=not query.descending, kind="stable", na_position="last").index.to_numpy()
+    return positions[order]
+
+
+def page_count(rows, page_size):
+    return max(1, math.ceil(rows / page_size))
+
+
+def page_of(keywords, positions, page=0, page_size=DEFAULT_PAGE_SIZE):
+    """One page of the rows at ``positions`` (from :func:`matching_positions`); ``page`` is clamped to the range."""
+    pages = page_count(len(positions), page_size)
+    page = min(max(page, 0), pages - 1)
+    selected = positions[page * page_size:(page + 1) * page_size]
+    return KeywordPage(rows=keywords.iloc[selected], positions=selected, matching=len(positions), total=len(keywords),
+                       page=page, page_count=pages, page_size=page_size)
+
+
+def query_keywords(keywords, query=KeywordQuery()):
+    """Filter, sort and slice ``keywords`` down to the page ``query`` asks for."""
+    return page_of(keywords, matching_positions(keywords, query), query.page, query.page_size)
+
+
+def apply_page_edits(keywords, positions, edited):
+    """Write an edited page (same rows, same order) back into the full keyword frame.
+
+    Returns ``keywords`` itself when nothing changed, so caches and incremental state keyed on it stay valid.
+    """
+    edited = enforce_schema(edited)
+    page = keywords.iloc[positions]
+    changed = changed_mask(page, edited.set_axis(page.index), KEYWORD_COLUMNS)
+    if not changed.any():
+        return keywords
+    updated = keywords.copy()
+    rows = positions[changed]
+    for column in KEYWORD_COLUMNS:
+        updated.iloc[rows, updated.columns.get_loc(column)] = edited[column].array[changed]
+    return updated
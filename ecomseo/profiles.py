@@ -0,0 +1,104 @@
+"""Per-keyword monthly search volume profiles.
+
+Keyword research exports often carry a 12-month volume history per keyword (Keyword Planner's ``Searches: Jan
+2024`` columns, month columns in Ahrefs/SEMrush exports, SEMrush's ``Trend`` column). :class:`MonthlyVolumes`
+holds it as a keywords x calendar-months ``float32`` matrix, about 48 MB at 1M keywords. Rows are looked up by
+keyword text, so the matrix stays valid while the keyword table is edited, filtered or reordered. The forecast
+spreads each keyword's traffic gain over the year with its own profile. Keywords without a history follow the
+category curve (see :class:`~ecomseo.engine.SeasonalVolumes`).
+"""
+import hashlib
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .schema import KEYWORD_STRING_DTYPE
+
+MONTHS_PER_YEAR = 12
+PROFILE_CHUNKSIZE = 100_000
+
+
+def calendar_volumes(values, months):
+    """Average ``values`` (rows x columns) into calendar months, given each column's 0-based ``months`` index.
+
+    Columns for the same calendar month (a 24-month history) are averaged; months without a value are NaN.
+    """
+    values = np.asarray(values, dtype=np.float32)
+    onehot = np.zeros((len(months), MONTHS_PER_YEAR), dtype=np.float32)
+    onehot[np.arange(len(months)), months] = 1
+    present = ~np.isnan(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (np.where(present, values, 0) @ onehot) / (present.astype(np.float32) @ onehot)
+
+
+@dataclass(eq=False)
+class MonthlyVolumes:
+    """Monthly search volumes (Jan..Dec) per keyword; ``volumes[i]`` belongs to ``keywords[i]``."""
+    keywords: pd.Index
+    volumes: np.ndarray  # float32, len(keywords) x 12, NaN for unknown months
+    fingerprint: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(self.volumes).tobytes())
+        digest.update("\x1f".join(self.keywords.to_numpy(dtype=object)).encode("utf-8", "surrogatepass"))
+        self.fingerprint = digest.hexdigest()
+        self._lookup = (None, None)
+        self._row_means = None
+
+    @classmethod
+    def from_arrays(cls, keywords, volumes):
+        """Build from parallel keyword and (n x 12) volume arrays; a repeated keyword keeps its first row."""
+        keywords = pd.Index(pd.array(keywords, dtype=KEYWORD_STRING_DTYPE))
+        volumes = np.asarray(volumes, dtype=np.float32).reshape(len(keywords), MONTHS_PER_YEAR)
+        keep = ~keywords.duplicated() & keywords.notna()
+        return cls(keywords[keep], np.ascontiguousarray(volumes[keep]))
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def __getstate__(self):
+        return dict(self.__dict__, _lookup=(None, None))  # don't ship the memoized frame column to workers
+
+    def rows(self, keywords):
+        """Row of each keyword in ``volumes`` (-1 when it has no history). The last lookup is memoized."""
+        keywords = keywords.array if isinstance(keywords, pd.Series) else keywords
+        last, rows = self._lookup
+        if last is keywords:
+            return rows
+        keywords_index = pd.Index(keywords, dtype=KEYWORD_STRING_DTYPE)
+        if len(keywords_index) == len(self.keywords) and self.keywords.equals(keywords_index):
+            rows = np.arange(len(keywords_index))  # the frame is still in file order: no hash lookup needed
+        else:
+            rows = self.keywords.get_indexer(keywords_index)
+        self._lookup = (keywords, rows)
+        return rows
+
+    def seasonal_index(self, rows):
+        """Each row's volumes divided by its mean (``float32``), and whether the row has a usable profile.
+
+        Missing months count as an average month; rows without history or with no searches are not usable.
+        """
+        if len(self) == 0:
+            return np.ones((len(rows), MONTHS_PER_YEAR), dtype=np.float32), np.zeros(len(rows), dtype=bool)
+        valid = rows >= 0
+        rows = np.where(valid, rows, 0)
+        mean = self._means[rows]
+        valid &= mean > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            index = self.volumes[rows] / mean[:, None]
+        return np.where(np.isnan(index), np.float32(1), index), valid
+
+    @property
+    def _means(self):
+        """Mean monthly volume per row (NaN without any), computed once in chunks."""
+        if self._row_means is None:
+            means = np.empty(len(self.volumes), dtype=np.float32)
+            for start in range(0, len(means), PROFILE_CHUNKSIZE):
+                block = self.volumes[start:start + PROFILE_CHUNKSIZE]
+                present = ~np.isnan(block)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    means[start:start + PROFILE_CHUNKSIZE] = np.where(present, block, 0).sum(axis=1) / present.sum(axis=1)
+            self._row_means = means
+        return self._row_means
@@ -0,0 +1,122 @@
+"""Lightweight per-stage timing.
+
+Pipeline code marks its stages with :func:`stage`, which does nothing unless a :class:`StageProfiler` is active
+in the current context. The Home page activates one per rerun, so parsing, CTR assignment, CI math, the
+monthly schedule, chart building, table serialization and exports each get a wall time, a row count and an
+RSS delta, shown in the sidebar and logged as one JSON record per rerun.
+"""
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import pandas as pd
+
+LOGGER = logging.getLogger("ecomseo.performance")
+
+_active = ContextVar("ecomseo_profiler", default=None)
+
+
+def _rss_bytes():
+    """Current resident set size (Linux), or ``None`` where it cannot be read cheaply."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+@dataclass
+class StageTiming:
+    name: str
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    memory_delta: Optional[int] = None  # bytes of RSS; allocator reuse makes this approximate
+    depth: int = 0  # nesting level, for stages timed inside another stage
+
+
+class _Unprofiled:
+    """Stand-in yielded by :func:`stage` when nothing is being profiled; attribute writes are harmless."""
+    rows = None
+
+
+class StageProfiler:
+    """Collects :class:`StageTiming` records for the stages run while it is active."""
+
+    def __init__(self, clock=time.perf_counter, memory=_rss_bytes):
+        self.stages = []
+        self._clock = clock
+        self._memory = memory
+        self._depth = 0
+        self._token = None
+
+    def activate(self):
+        """Make this the profiler :func:`stage` reports to (in the current thread/context)."""
+        self._token = _active.set(self)
+        return self
+
+    def deactivate(self):
+        if self._token is not None:
+            _active.reset(self._token)
+            self._token = None
+
+    def __enter__(self):
+        return self.activate()
+
+    def __exit__(self, *exc):
+        self.deactivate()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Time the body; the yielded :class:`StageTiming`'s ``rows`` may be filled in inside it."""
+        timing = StageTiming(name, rows=rows, depth=self._depth)
+        self.stages.append(timing)
+        memory_before = self._memory()
+        start = self._clock()
+        self._depth += 1
+        try:
+            yield timing
+        finally:
+            self._depth -= 1
+            timing.seconds = self._clock() - start
+            memory_after = self._memory()
+            if memory_before is not None and memory_after is not None:
+                timing.memory_delta = memory_after - memory_before
+
+    @property
+    def total_seconds(self):
+        return sum(s.seconds for s in self.stages if s.depth == 0)
+
+    def to_frame(self):
+        """One row per stage, nested stages indented under their parent."""
+        return pd.DataFrame({
+            "Stage": ["  " * s.depth + s.name for s in self.stages],
+            "Time (ms)": [s.seconds * 1000 for s in self.stages],
+            "Rows": pd.array([s.rows for s in self.stages], dtype="Int64"),
+            "Memory Δ (MB)": [s.memory_delta / 2**20 if s.memory_delta is not None else float("nan") for s in self.stages],
+        })
+
+    def record(self, **context):
+        """JSON-serializable summary of this run, with any ``context`` fields (page, keyword count, ...)."""
+        return dict(context, total_seconds=self.total_seconds, stages=[asdict(s) for s in self.stages])
+
+    def log(self, logger=LOGGER, level=logging.INFO, **context):
+        """Emit :meth:`record` as one JSON log line (also attached to the log record as ``profile``)."""
+        if logger.isEnabledFor(level):
+            record = self.record(**context)
+            logger.log(level, json.dumps(record, default=str), extra={"profile": record})
+
+
+@contextmanager
+def stage(name, rows=None):
+    """Time a pipeline stage on the active :class:`StageProfiler`, if any."""
+    profiler = _active.get()
+    if profiler is None:
+        yield _Unprofiled()
+        return
+    with profiler.stage(name, rows) as timing:
+        yield timing
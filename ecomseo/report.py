@@ -0,0 +1,55 @@
+"""Result tables as presented on the Home page.
+
+The Keyword Details and Monthly Projections tables (including their currency/percent formatting and the TOTAL
+row) are built here, so the app, the batch runner and the command line all produce identical outputs.
+"""
+import numpy as np
+import pandas as pd
+
+from .models import CURRENCY_OPTIONS, DEFAULT_SETTINGS
+
+KEYWORD_DETAIL_COLUMNS = ['keyword', 'searchVolume', 'position', 'targetPosition', 'keywordDifficulty', 'adjustedTargetPosition',
+                          'Current Traffic', 'Target Traffic', 'Traffic Gain', 'Traffic Gain %', 'Revenue Gain']
+MONTHLY_COLUMNS = ["Month", "Traffic Gain", "Conversion Gain", "Revenue", "ROI", "Cumulative"]
+
+
+def currency_symbol(currency_selection=None):
+    """Symbol for a currency option such as ``"GBP (£)"`` (the default currency when not given)."""
+    return CURRENCY_OPTIONS[currency_selection or DEFAULT_SETTINGS["currency_selection"]]
+
+
+def keyword_details(keywords, symbol="$"):
+    """Per-keyword metrics plus the rounded/formatted display columns.
+
+    The whole frame is what the CSV download contains; ``KEYWORD_DETAIL_COLUMNS`` is the on-screen subset.
+    """
+    keyword_display = keywords.copy(deep=False)
+    keyword_display['Current Traffic'] = keyword_display['currentTraffic'].round(0).astype(int)
+    keyword_display['Target Traffic'] = keyword_display['targetTraffic'].round(0).astype(int)
+    keyword_display['Traffic Gain'] = keyword_display['trafficGain'].round(0).astype(int)
+    keyword_display['Revenue Gain'] = symbol + keyword_display['revenueGain'].round(0).astype(int).astype(str)
+    current_traffic = keyword_display['currentTraffic'].to_numpy()
+    traffic_gain_pct = np.divide(keyword_display['trafficGain'].to_numpy(), current_traffic,
+                                 out=np.zeros(len(keyword_display)), where=current_traffic != 0) * 100
+    keyword_display['Traffic Gain %'] = pd.Series(traffic_gain_pct, index=keyword_display.index).map("{:.1f}%".format)
+    return keyword_display
+
+
+def monthly_projections(monthly, symbol="$"):
+    """Monthly table with formatted Revenue/ROI columns and a TOTAL row.
+
+    The numeric ``Revenue Gain`` column is kept for charting; ``MONTHLY_COLUMNS`` is the displayed subset.
+    """
+    monthly_data = [{
+        "Month": row["Month"], "Traffic Gain": int(row["Traffic Gain"]), "Conversion Gain": row["Conversion Gain"],
+        "Revenue": f"{symbol}{int(row['Revenue Gain']):,}", "ROI": f"{row['ROI']:.1f}%", "Cumulative": f"{row['Cumulative ROI']:.1f}%",
+        "Revenue Gain": int(row["Revenue Gain"])
+    } for row in monthly.to_dict("records")]
+
+    cumulative_revenue = monthly['Revenue Gain'].sum()
+    monthly_data.append({
+        "Month": "TOTAL", "Traffic Gain": int(monthly['Traffic Gain'].sum()), "Conversion Gain": int(monthly['Conversion Gain'].sum()),
+        "Revenue": f"{symbol}{int(cumulative_revenue):,}", "ROI": "", "Cumulative": f"{monthly['Cumulative ROI'].iloc[-1]:.1f}%",
+        "Revenue Gain": int(cumulative_revenue)
+    })
+    return pd.DataFrame(monthly_data)
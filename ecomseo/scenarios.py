@@ -0,0 +1,105 @@
+"""Scenario matrix: every CTR model x SERP state x category x horizon in one batched computation.
+
+The keyword-level work is a single :class:`~ecomseo.engine.PositionVolumes` pass. The per-scenario CTR tables are
+stacked into one matrix, so all traffic totals and stds come from two matrix-vector products. Category and
+horizon only decide how that total is spread over the months, and all the schedules are broadcast together. With
+per-keyword monthly volumes in the settings, the seasonal curve also depends on the CTR scenario; it comes from
+one :class:`~ecomseo.engine.SeasonalVolumes` pass.
+The result is a tidy table with one row per combination, matching what :func:`~ecomseo.engine.forecast`
+reports for that combination.
+"""
+import itertools
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from .engine import PositionVolumes, SeasonalVolumes, _as_settings
+from .models import CTR_MODELS, CTR_STD, SEASONALITY, Z_SCORE
+from .profiling import stage
+from .schedule import schedule_weights, start_month_index
+
+DEFAULT_HORIZONS = (6, 12)
+
+# Every consistent (featured_snippet_present, in_featured_snippet, faq_present, in_faq) combination
+SERP_STATES = [
+    (snippet, in_snippet, faq, in_faq)
+    for snippet, in_snippet in ((False, False), (True, False), (True, True))
+    for faq, in_faq in ((False, False), (True, False), (True, True))
+]
+
+MATRIX_COLUMNS = ["CTR Model", "Featured Snippet", "In Featured Snippet", "FAQ", "In FAQ", "Category", "Projection Months",
+                  "Traffic Gain", "Traffic CI Low", "Traffic CI High", "Conversion Gain", "Revenue Gain", "CPA", "ROI (%)",
+                  "Break-Even Month"]
+
+
+def scenario_matrix(keywords, settings=None, ctr_models=None, categories=None, horizons=DEFAULT_HORIZONS, serp_states=None):
+    """Forecast totals for every combination of the given axes as a tidy frame (columns: ``MATRIX_COLUMNS``).
+
+    Conversion rate, AOV, implementation cost, custom CTRs and start month come from ``settings``. Axes left as
+    ``None`` cover every CTR model, every category and every SERP state. ``Break-Even Month`` is ``<NA>`` when
+    the cost is not recovered within the horizon.
+    """
+    settings = _as_settings(settings)
+    ctr_models = list(CTR_MODELS) if ctr_models is None else list(ctr_models)
+    categories = list(SEASONALITY) if categories is None else list(categories)
+    horizons = [int(h) for h in horizons]
+    serp_states = SERP_STATES if serp_states is None else [tuple(map(bool, state)) for state in serp_states]
+    conversion_rate, aov, cost = settings.conversion_rate, settings.aov, settings.implementation_cost
+
+    with stage("scenario_matrix", rows=len(keywords)):
+        volumes = PositionVolumes.from_keywords(keywords)
+        avg_difficulty = float(keywords['keywordDifficulty'].sum()) / len(keywords) if len(keywords) else float('nan')
+
+        # (CTR model, SERP state) axis: one CTR table per row
+        ctr_axis = list(itertools.product(ctr_models, serp_states))
+        tables = np.stack([replace(settings, ctr_model=model, featured_snippet_present=state[0], in_featured_snippet=state[1],
+                                   faq_present=state[2], in_faq=state[3]).ctr_lookup for model, state in ctr_axis])
+        traffic_gain = tables @ (volumes.target - volumes.current)
+        traffic_std = np.sqrt((tables**2 @ (volumes.current_sq + volumes.target_sq)) * CTR_STD**2)
+        conversion_gain = np.round(traffic_gain * (conversion_rate / 100))
+        revenue_gain = conversion_gain * aov
+
+        # (category, horizon) axis: schedule weights zero-padded to the longest horizon, per CTR scenario only when
+        # keyword volume histories make the seasonal curve depend on it
+        schedule_axis = list(itertools.product(categories, horizons))
+        start_month = start_month_index(settings)
+        seasons = None
+        if settings.monthly_volumes is not None:
+            seasons = SeasonalVolumes.from_keywords(keywords, settings.monthly_volumes).seasons(tables, categories)
+        weights = np.zeros((1 if seasons is None else len(ctr_axis), len(schedule_axis), max(horizons, default=0)))
+        for i, (category, months) in enumerate(schedule_axis):
+            for c in range(len(weights)):
+                season = None if seasons is None else seasons[c, categories.index(category)]
+                weights[c, i, :months] = schedule_weights(months, avg_difficulty, category, start_month, season)
+
+        # Cumulative revenue per (ctr scenario, schedule, month), in the same operation order as the monthly table
+        cumulative = np.cumsum(traffic_gain[:, None, None] * weights * (conversion_rate / 100) * aov, axis=2)
+        reached = cumulative >= cost
+        reached &= np.arange(weights.shape[-1]) < np.array([months for _, months in schedule_axis])[None, :, None]
+        break_even = np.where(reached.any(axis=2), reached.argmax(axis=2) + 1, 0).astype(np.int64)  # 0: not reached
+
+    n_ctr, n_schedule = len(ctr_axis), len(schedule_axis)
+    ctr_index = np.repeat(np.arange(n_ctr), n_schedule)
+    schedule_index = np.tile(np.arange(n_schedule), n_ctr)
+    states = np.array([state for _, state in ctr_axis], dtype=bool).reshape(n_ctr, 4)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cpa = np.where(conversion_gain > 0, cost / conversion_gain, np.inf)
+        roi = np.where(cost > 0, (revenue_gain - cost) / cost * 100, 0.0)
+    return pd.DataFrame({
+        "CTR Model": [ctr_axis[i][0] for i in ctr_index],
+        "Featured Snippet": states[ctr_index, 0],
+        "In Featured Snippet": states[ctr_index, 1],
+        "FAQ": states[ctr_index, 2],
+        "In FAQ": states[ctr_index, 3],
+        "Category": [schedule_axis[j][0] for j in schedule_index],
+        "Projection Months": np.array([schedule_axis[j][1] for j in schedule_index], dtype=np.int64),
+        "Traffic Gain": traffic_gain[ctr_index],
+        "Traffic CI Low": (traffic_gain - Z_SCORE * traffic_std)[ctr_index],
+        "Traffic CI High": (traffic_gain + Z_SCORE * traffic_std)[ctr_index],
+        "Conversion Gain": conversion_gain[ctr_index].astype(np.int64),
+        "Revenue Gain": revenue_gain[ctr_index],
+        "CPA": cpa[ctr_index],
+        "ROI (%)": roi[ctr_index],
+        "Break-Even Month": pd.arrays.IntegerArray(break_even.ravel(), break_even.ravel() == 0),
+    }, columns=MATRIX_COLUMNS)
@@ -0,0 +1,89 @@
+"""Monthly projection schedule.
+
+The steady-state traffic gain is spread over the projection period with a sigmoid growth curve times a seasonal
+curve: the category's multipliers, or one built from per-keyword volume histories (:mod:`ecomseo.profiles`).
+Curve, seasonality and normalization are built once as arrays, so both the break-even and the monthly tables
+come from the same weights and long horizons (36/60 months) stay linear.
+"""
+import numpy as np
+import pandas as pd
+
+from .models import GROWTH_DELAY, MONTH_NAMES, SEASONALITY
+
+
+def start_month_index(settings):
+    """0-based calendar month the projection starts in (the current month unless pinned in settings)."""
+    return settings.start_month if settings.start_month is not None else pd.Timestamp.now().month - 1
+
+
+def month_indices(projection_months, start_month):
+    """Calendar month index (0-11) of each projected month."""
+    return (start_month + np.arange(projection_months)) % 12
+
+
+def month_labels(projection_months, start_month):
+    """Month names; horizons beyond a year get a projection-year suffix so labels stay unique."""
+    names = [MONTH_NAMES[i] for i in month_indices(projection_months, start_month)]
+    if projection_months <= 12:
+        return names
+    return [f"{name} Y{i // 12 + 1}" for i, name in enumerate(names)]
+
+
+def growth_curve(projection_months, avg_difficulty):
+    """Sigmoid ramp-up over the period; harder keyword sets ramp more slowly."""
+    k = 10 / (1 + avg_difficulty / 2)
+    progress = np.arange(projection_months) / (projection_months - 1) if projection_months > 1 else np.ones(1)
+    return 1 / (1 + np.exp(-k * (progress - GROWTH_DELAY)))
+
+
+def schedule_weights(projection_months, avg_difficulty, category, start_month, season=None):
+    """Share of the total traffic gain landing in each month (sums to 1).
+
+    ``season`` (12 calendar-month values, Jan..Dec, any scale) replaces the category's curve when given.
+    """
+    season = np.asarray(SEASONALITY[category] if season is None else season)[month_indices(projection_months, start_month)]
+    month_factor = growth_curve(projection_months, avg_difficulty) * season
+    return month_factor / month_factor.sum()
+
+
+def break_even_month(cumulative_revenue, implementation_cost):
+    """1-based month in which cumulative revenue first covers the cost, or ``None``."""
+    reached = np.asarray(cumulative_revenue) >= implementation_cost
+    return int(reached.argmax()) + 1 if reached.any() else None
+
+
+def schedule_tables(traffic_gain, labels, settings):
+    """Break-even and monthly tables from an array of monthly traffic gains."""
+    conversion_rate = settings.conversion_rate
+    aov = settings.aov
+    implementation_cost = settings.implementation_cost
+
+    break_even = pd.DataFrame({"Month": labels, "Cumulative Revenue": np.cumsum(traffic_gain * (conversion_rate / 100) * aov)})
+
+    conversion_gain = np.round(traffic_gain * (conversion_rate / 100)).astype(np.int64)
+    revenue_gain = conversion_gain * aov
+    cumulative_revenue = np.cumsum(revenue_gain)
+    if implementation_cost > 0:
+        monthly_cost = np.zeros(len(traffic_gain))
+        monthly_cost[:1] = implementation_cost
+        roi = (revenue_gain - monthly_cost) / implementation_cost * 100
+        cumulative_roi = (cumulative_revenue - implementation_cost) / implementation_cost * 100
+    else:
+        roi = cumulative_roi = np.zeros(len(traffic_gain))
+    monthly = pd.DataFrame({
+        "Month": labels, "Traffic Gain": traffic_gain, "Conversion Gain": conversion_gain,
+        "Revenue Gain": revenue_gain, "ROI": roi, "Cumulative ROI": cumulative_roi
+    })
+    return break_even, monthly
+
+
+def monthly_schedule(total_traffic_gain, avg_difficulty, settings, season=None):
+    """Spread the steady-state traffic gain over the projection period (``season``: see :func:`schedule_weights`).
+
+    Returns ``(break_even, monthly)``: cumulative revenue from unrounded monthly conversions (used for
+    break-even), and the monthly table with whole conversions per month.
+    """
+    start_month = start_month_index(settings)
+    weights = schedule_weights(settings.projection_months, avg_difficulty, settings.category, start_month, season)
+    labels = month_labels(settings.projection_months, start_month)
+    return schedule_tables(total_traffic_gain * weights, labels, settings)
@@ -0,0 +1,103 @@
+"""Compact in-memory schema for keyword tables.
+
+Positions (1-100) and difficulty (1-10) fit in ``uint8`` and search volumes in ``uint32``; keywords are stored as
+Arrow-backed strings. Ingestion, manual entry and the data editor all pass through :func:`enforce_schema`, so the
+session frame stays a fraction of the size of the int64/object frame pandas would infer.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .models import KEYWORD_COLUMNS
+
+try:
+    import pyarrow  # noqa: F401
+    KEYWORD_STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:  # pragma: no cover - pyarrow ships with Streamlit
+    KEYWORD_STRING_DTYPE = pd.StringDtype()
+
+KEYWORD_DTYPES = {
+    "keyword": KEYWORD_STRING_DTYPE,
+    "searchVolume": np.dtype("uint32"),
+    "position": np.dtype("uint8"),
+    "targetPosition": np.dtype("uint8"),
+    "keywordDifficulty": np.dtype("uint8"),
+}
+
+MIN_POSITION, MAX_POSITION = 1, 100
+MIN_DIFFICULTY, MAX_DIFFICULTY = 1, 10
+MAX_SEARCH_VOLUME = np.iinfo(np.uint32).max
+
+# Fill values for missing cells (e.g. rows added in the data editor)
+DEFAULT_POSITION = 20
+DEFAULT_DIFFICULTY = 5
+
+
+def conforms(df):
+    """True when ``df`` already has exactly the schema's columns and dtypes."""
+    return list(df.columns) == KEYWORD_COLUMNS and all(df[col].dtype == dtype for col, dtype in KEYWORD_DTYPES.items())
+
+
+def empty_keywords():
+    return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in KEYWORD_DTYPES.items()})
+
+
+def _numeric(df, column):
+    if column not in df:
+        return np.full(len(df), np.nan)
+    return np.trunc(pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+def default_target_position(position):
+    """Target used when none is given: half the current position, at least 1."""
+    return np.maximum(1, np.trunc(np.asarray(position, dtype=np.float64) * 0.5))
+
+
+def enforce_schema(df):
+    """Return ``df`` restricted to ``KEYWORD_COLUMNS`` with compact dtypes, keeping its index.
+
+    Values are coerced to numbers, missing cells get defaults and out-of-range values are clipped. A frame that
+    already conforms is returned as is, without a copy.
+    """
+    if conforms(df):
+        return df
+    keyword = df['keyword'] if 'keyword' in df else pd.Series(pd.NA, index=df.index)
+
+    volume = np.nan_to_num(_numeric(df, 'searchVolume'), nan=0)
+    position = np.nan_to_num(_numeric(df, 'position'), nan=DEFAULT_POSITION)
+    position = np.clip(position, MIN_POSITION, MAX_POSITION)
+    target = _numeric(df, 'targetPosition')
+    target = np.where(np.isnan(target), default_target_position(position), target)
+    difficulty = np.nan_to_num(np.clip(_numeric(df, 'keywordDifficulty'), MIN_DIFFICULTY, MAX_DIFFICULTY), nan=DEFAULT_DIFFICULTY)
+
+    return pd.DataFrame({
+        "keyword": keyword.astype(KEYWORD_STRING_DTYPE).array,
+        "searchVolume": np.clip(volume, 0, MAX_SEARCH_VOLUME).astype(KEYWORD_DTYPES["searchVolume"]),
+        "position": position.astype(KEYWORD_DTYPES["position"]),
+        "targetPosition": np.clip(target, MIN_POSITION, MAX_POSITION).astype(KEYWORD_DTYPES["targetPosition"]),
+        "keywordDifficulty": difficulty.astype(KEYWORD_DTYPES["keywordDifficulty"]),
+    }, index=df.index)
+
+
+def write_keyword_file(keywords, path):
+    """Save a keyword frame as an uncompressed Arrow IPC file, atomically (readers never see a partial file)."""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    path = Path(path)
+    temporary = path.with_name(path.name + ".tmp")
+    feather.write_feather(pa.Table.from_pandas(enforce_schema(keywords), preserve_index=False), temporary,
+                          compression="uncompressed")
+    os.replace(temporary, path)
+
+
+def read_keyword_file(path):
+    """Load a file written by :func:`write_keyword_file`. The file is memory-mapped, so this costs milliseconds."""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    table = feather.read_table(path, memory_map=True)
+    strings = {pa.string(): KEYWORD_STRING_DTYPE, pa.large_string(): KEYWORD_STRING_DTYPE}
+    return enforce_schema(table.to_pandas(types_mapper=strings.get))
@@ -0,0 +1,411 @@
+"""Asyncio HTTP/JSON forecasting service (``python -m ecomseo serve``).
+
+``POST /forecast`` takes a JSON body with ``keywords`` (a list of rows, or a dict of columns) and ``settings``
+(the app's settings keys). ``POST /forecast/upload?name=keywords.csv`` takes a raw CSV/Excel export as the body,
+with settings as a JSON ``settings`` query parameter. Both return the summary totals with their 95% CIs, the
+break-even month and table, the monthly projections and the per-keyword details, all as plain numbers.
+
+Request bodies are passed to the worker pool as received. Parsing, the forecast and JSON encoding all run there,
+so the event loop only hashes bodies and moves bytes. Responses are cached by a hash of the request, and
+identical requests that arrive while one is being computed share its result. At most ``max_concurrency``
+forecasts run at once and at most ``max_pending`` wait, beyond which requests get ``503``.
+
+:class:`ServiceClient` calls the service in-process, without sockets, for scripts and tests. Only the standard
+library is used on top of the engine's pandas/NumPy.
+"""
+import asyncio
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from .batch import normalize_custom_ctr
+from .cache import LRUCache
+from .engine import ForecastSettings, forecast
+from .ingest import detect_columns, normalize_keywords, read_keywords, read_monthly_volumes
+from .models import CTR_MODELS, CURRENCY_OPTIONS, DEFAULT_SETTINGS, SEASONALITY
+from .schema import enforce_schema
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+MAX_BODY_BYTES = 256 * 1024 * 1024
+MAX_PROJECTION_MONTHS = 120  # the monthly schedule is allocated per request; the app offers up to 60
+JSON_TYPE = "application/json"
+
+
+class RequestError(ValueError):
+    """A request the service cannot forecast (reported as ``400`` with the message)."""
+
+
+@dataclass
+class Response:
+    status: int
+    body: bytes
+    headers: dict = field(default_factory=dict)
+
+    def json(self):
+        return json.loads(self.body)
+
+
+def _dumps(payload, **options):
+    return json.dumps(payload, separators=(",", ":"), **options)
+
+
+def _encode(payload):
+    return _dumps(payload).encode("utf-8")
+
+
+def _json_response(status, payload, **headers):
+    return Response(status, _encode(payload), {"Content-Type": JSON_TYPE, **headers})
+
+
+def _error(status, message, **headers):
+    return _json_response(status, {"error": message}, **headers)
+
+
+def parse_settings(settings):
+    """App settings dict (defaults filled in) and the :class:`ForecastSettings` it describes."""
+    if settings is None:
+        settings = {}
+    if not isinstance(settings, dict):
+        raise RequestError("settings must be a JSON object")
+    settings = dict(DEFAULT_SETTINGS, **settings)
+    if settings["category"] not in SEASONALITY:
+        raise RequestError(f"unknown category {settings['category']!r}")
+    if settings["ctr_model"] not in CTR_MODELS:
+        raise RequestError(f"unknown ctr_model {settings['ctr_model']!r}")
+    if settings["currency_selection"] not in CURRENCY_OPTIONS:
+        raise RequestError(f"unknown currency_selection {settings['currency_selection']!r}")
+    try:
+        if settings.get("custom_ctr") is not None:
+            settings["custom_ctr"] = normalize_custom_ctr(settings["custom_ctr"])
+        settings["projection_months"] = int(settings["projection_months"])
+        for key in ("conversion_rate", "aov", "implementation_cost"):
+            settings[key] = float(settings[key])
+        if settings.get("start_month") is not None:
+            settings["start_month"] = int(settings["start_month"])
+    except (AttributeError, TypeError, ValueError) as e:
+        raise RequestError(f"invalid settings: {e}") from None
+    if not 1 <= settings["projection_months"] <= MAX_PROJECTION_MONTHS:
+        raise RequestError(f"projection_months must be between 1 and {MAX_PROJECTION_MONTHS}")
+    for key in ("conversion_rate", "aov", "implementation_cost"):
+        if not settings[key] >= 0:  # also rejects NaN
+            raise RequestError(f"{key} must be a non-negative number")
+    if settings.get("start_month") is not None and not 0 <= settings["start_month"] < 12:
+        raise RequestError("start_month must be between 0 and 11")
+    try:
+        return settings, ForecastSettings.from_dict(settings)
+    except TypeError as e:
+        raise RequestError(f"invalid settings: {e}") from None
+
+
+def keywords_from_payload(keywords):
+    """Normalized keyword frame from JSON rows or columns.
+
+    The engine's own column names (``keyword``, ``searchVolume``, ``position``, optionally ``targetPosition``
+    and ``keywordDifficulty``) are used as given; other headers go through the upload's column detection.
+    """
+    if not isinstance(keywords, (list, dict)) or not keywords:
+        raise RequestError("keywords must be a non-empty list of rows or dict of columns")
+    if isinstance(keywords, list) and not all(isinstance(row, dict) for row in keywords):
+        raise RequestError("keyword rows must be JSON objects")
+    if isinstance(keywords, dict) and not all(isinstance(column, list) for column in keywords.values()):
+        raise RequestError("keyword columns must be JSON arrays")
+    try:
+        df = pd.DataFrame(keywords)
+    except ValueError as e:
+        raise RequestError(f"invalid keywords: {e}") from None
+    if {"keyword", "searchVolume", "position"} <= set(df.columns):
+        return enforce_schema(df)
+    return normalize_keywords(df, detect_columns(df.columns))
+
+
+def result_json(result, settings, details=True):
+    """Encode a :class:`~ecomseo.engine.ForecastResult` as the service's JSON response body."""
+    summary = {
+        "keywords": len(result.keywords),
+        "total_current_traffic": result.total_current_traffic,
+        "total_traffic_gain": result.total_traffic_gain,
+        "traffic_ci": list(result.traffic_ci),
+        "total_conversion_gain": result.total_conversion_gain,
+        "conversion_ci": list(result.conversion_ci),
+        "total_revenue_gain": result.total_revenue_gain,
+        "revenue_ci": list(result.revenue_ci),
+        "cpa": result.cpa if result.cpa != float("inf") else None,
+        "traffic_percent": result.traffic_percent,
+        "conversion_percent": result.conversion_percent,
+        "revenue_percent": result.revenue_percent,
+        "break_even_month": result.break_even_month,
+    }
+    # Tables go through DataFrame.to_json (C encoder, NaN/inf as null); only the small parts use the json module
+    parts = [
+        '{"summary":', _dumps(summary, default=float),
+        ',"settings":', _dumps(settings, default=str),
+        ',"monthly":', result.monthly.to_json(orient="records", double_precision=15),
+        ',"break_even":', result.break_even.to_json(orient="records", double_precision=15),
+    ]
+    if details:
+        parts += [',"keyword_details":', result.keywords.to_json(orient="records", double_precision=15)]
+    parts.append("}")
+    return "".join(parts).encode("utf-8")
+
+
+def forecast_request(body):
+    """Worker side of ``POST /forecast``: JSON body in, JSON response body out."""
+    try:
+        payload = json.loads(body)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise RequestError(f"invalid JSON: {e}") from None
+    if not isinstance(payload, dict):
+        raise RequestError("request body must be a JSON object")
+    settings, forecast_settings = parse_settings(payload.get("settings"))
+    keywords = keywords_from_payload(payload.get("keywords"))
+    return result_json(forecast(keywords, forecast_settings), settings, details=payload.get("details", True))
+
+
+def forecast_upload(body, name, settings, details=True):
+    """Worker side of ``POST /forecast/upload``: a raw CSV/Excel export in, JSON response body out."""
+    settings, forecast_settings = parse_settings(settings)
+    if not name.lower().endswith((".csv", ".xlsx", ".xls")):
+        raise RequestError("name must end in .csv, .xlsx or .xls")
+    source = io.BytesIO(body)
+    forecast_settings = replace(forecast_settings, monthly_volumes=read_monthly_volumes(source, name))
+    keywords = read_keywords(source, name)
+    if not len(keywords):
+        raise RequestError(f"no keywords found in {name}")
+    return result_json(forecast(keywords, forecast_settings), settings, details=details)
+
+
+def _flag(value):
+    return value.lower() not in ("0", "false", "no")
+
+
+class ServiceBusy(Exception):
+    """Raised when ``max_pending`` forecasts are already queued."""
+
+
+class ForecastService:
+    """Routes requests to a bounded worker pool, with a response cache and concurrency limits.
+
+    ``executor`` is ``"process"`` (default; forecasts run in parallel across CPUs) or ``"thread"`` (no worker
+    start-up, suited to small payloads and tests).
+    """
+
+    def __init__(self, max_workers=None, executor="process", max_concurrency=None, max_pending=64,
+                 cache_entries=128, cache_bytes=256 * 1024 * 1024, cache_ttl=3600):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        elif executor == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ecomseo-forecast")
+        else:
+            raise ValueError(f"executor must be 'process' or 'thread', not {executor!r}")
+        self.max_concurrency = max_concurrency or self.max_workers
+        self.max_pending = max_pending
+        self.cache = LRUCache(max_entries=cache_entries, max_bytes=cache_bytes, ttl=cache_ttl)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._inflight = {}  # request key -> task computing its response body
+        self._pending = 0
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    async def handle(self, method, target, body=b""):
+        """Answer one request; never raises for bad input (errors come back as JSON ``{"error": ...}``)."""
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        routes = {"/health": ("GET", self._health), "/options": ("GET", self._options),
+                  "/forecast": ("POST", self._forecast), "/forecast/upload": ("POST", self._upload)}
+        if url.path not in routes:
+            return _error(404, f"no route for {url.path}")
+        allowed, handler = routes[url.path]
+        if method != allowed:
+            return _error(405, f"{url.path} only accepts {allowed}", Allow=allowed)
+        try:
+            return await handler(query, body)
+        except RequestError as e:
+            return _error(400, str(e))
+        except ValueError as e:  # unreadable file contents
+            return _error(422, f"{type(e).__name__}: {e}")
+        except ServiceBusy:
+            return _error(503, "too many forecasts pending, retry later", **{"Retry-After": "1"})
+        except Exception as e:
+            return _error(500, f"{type(e).__name__}: {e}")
+
+    async def _health(self, query, body):
+        stats = self.cache.stats()
+        return _json_response(200, {"status": "ok", "workers": self.max_workers, "pending": self._pending,
+                                    "cache": {"entries": stats.entries, "hits": stats.hits, "misses": stats.misses}})
+
+    async def _options(self, query, body):
+        return _json_response(200, {"categories": list(SEASONALITY), "ctr_models": list(CTR_MODELS),
+                                    "currencies": list(CURRENCY_OPTIONS), "defaults": DEFAULT_SETTINGS})
+
+    async def _forecast(self, query, body):
+        return await self._cached(hashlib.sha256(b"forecast\0" + body).hexdigest(), forecast_request, body)
+
+    async def _upload(self, query, body):
+        name = query.get("name", "")
+        try:
+            settings = json.loads(query.get("settings", "{}"))
+        except ValueError as e:
+            raise RequestError(f"invalid settings JSON: {e}") from None
+        details = _flag(query.get("details", "1"))
+        key = hashlib.sha256(json.dumps(["upload", name, settings, details], sort_keys=True).encode() + b"\0" + body).hexdigest()
+        return await self._cached(key, forecast_upload, body, name, settings, details)
+
+    async def _cached(self, key, fn, *args):
+        cached = self.cache.get(key)
+        if cached is not None:
+            return Response(200, cached, {"Content-Type": JSON_TYPE, "X-Cache": "hit"})
+        task = self._inflight.get(key)
+        if task is None:
+            if self._pending >= self.max_pending:
+                raise ServiceBusy()
+            self._pending += 1
+            task = asyncio.ensure_future(self._compute(key, fn, args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._finished(key))
+        # Shielded: a client that disconnects does not cancel a result other requests are waiting for
+        body = await asyncio.shield(task)
+        return Response(200, body, {"Content-Type": JSON_TYPE, "X-Cache": "miss"})
+
+    async def _compute(self, key, fn, args):
+        async with self._semaphore:
+            body = await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        self.cache.put(key, body, nbytes=len(body))
+        return body
+
+    def _finished(self, key):
+        self._inflight.pop(key, None)
+        self._pending -= 1
+
+
+class ServiceClient:
+    """Synchronous in-process client: requests go straight to :meth:`ForecastService.handle`, no sockets.
+
+    >>> with ForecastService(executor="thread") as service, ServiceClient(service) as client:
+    ...     client.post("/forecast", json={"keywords": [...], "settings": {...}}).json()
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self._loop = asyncio.new_event_loop()
+
+    def close(self):
+        self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def request(self, method, target, body=b""):
+        return self._loop.run_until_complete(self.service.handle(method, target, body))
+
+    def get(self, target):
+        return self.request("GET", target)
+
+    def post(self, target, json=None, data=b""):
+        if json is not None:
+            data = _encode(json)
+        return self.request("POST", target, data)
+
+
+async def _read_request(reader, max_body_bytes):
+    """(method, target, version, headers, body) of the next request, or ``None`` at end of stream."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise RequestError("malformed request line") from None
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "transfer-encoding" in headers:
+        raise RequestError("chunked bodies are not supported; send Content-Length")
+    length = int(headers.get("content-length") or 0)
+    if length > max_body_bytes:
+        raise OverflowError(f"body larger than {max_body_bytes} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version, headers, body
+
+
+def _write_response(writer, response, keep_alive):
+    headers = {**response.headers, "Content-Length": str(len(response.body)), "Connection": "keep-alive" if keep_alive else "close"}
+    head = f"HTTP/1.1 {response.status} {HTTPStatus(response.status).phrase}\r\n"
+    head += "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+    writer.write(head.encode("latin-1") + response.body)
+
+
+async def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT, max_body_bytes=MAX_BODY_BYTES, ready=None):
+    """Serve ``service`` over HTTP/1.1 until cancelled. ``ready``, if given, is called with the bound sockets."""
+    async def connection(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader, max_body_bytes)
+                except RequestError as e:
+                    _write_response(writer, _error(400, str(e)), keep_alive=False)
+                    break
+                except OverflowError as e:
+                    _write_response(writer, _error(413, str(e)), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                _write_response(writer, await service.handle(method, target, body), keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(connection, host, port)
+    if ready is not None:
+        ready(server.sockets)
+    async with server:
+        await server.serve_forever()
+
+
+def add_arguments(parser):
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", "-j", type=int, help="forecast workers (default: one per CPU)")
+    parser.add_argument("--threads", action="store_true", help="run forecasts in threads instead of worker processes")
+    parser.add_argument("--max-pending", type=int, default=64, help="queued forecasts before answering 503 (default: 64)")
+
+
+def run(args):
+    service = ForecastService(max_workers=args.workers, executor="thread" if args.threads else "process", max_pending=args.max_pending)
+
+    def announce(sockets):
+        print(f"Serving forecasts on http://{args.host}:{sockets[0].getsockname()[1]}", file=sys.stderr, flush=True)
+
+    with service:
+        try:
+            asyncio.run(serve(service, args.host, args.port, ready=announce))
+        except KeyboardInterrupt:
+            pass
+    return 0
@@ -0,0 +1,182 @@
+"""Monte Carlo confidence intervals.
+
+The analytic CIs in :func:`engine.summarize` treat every keyword as an independent normal with a fixed CTR
+spread and scale conversions and revenue linearly. ``simulate`` instead draws N scenarios, each with its own
+ranking outcome per keyword, CTR noise and site conversion rate, and reports percentiles of the resulting
+totals and break-even month.
+
+Ranking outcomes are the costly part: one draw per scenario and keyword. Each keyword's possible outcomes
+are tabulated once as the target CTR at 256 quantiles of the gap-closing share, so a draw is a random byte
+plus a table lookup. The (keywords x scenarios) matrix is processed in blocks of ``chunk_elements``, so
+memory stays bounded whatever the scenario and keyword counts. Given the ranking outcomes, summed
+per-keyword CTR noise is exactly normal and is drawn once per scenario.
+"""
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from .ctr import lookup_ctr
+from .engine import _as_settings, adjusted_target_position, seasonal_curve
+from .models import CONVERSION_RATE_STD, CTR_STD, DIFFICULTY_DIVISOR, RANKING_STD
+from .schedule import schedule_weights, start_month_index
+
+DEFAULT_SCENARIOS = 10_000
+DEFAULT_CHUNK_ELEMENTS = 1 << 22  # ~4M cells, ~40MB of working arrays
+DEFAULT_PERCENTILES = (2.5, 50, 97.5)
+
+QUANTILE_LEVELS = 256  # one random byte per ranking draw
+_RANKING_QUANTILES = np.array([NormalDist().inv_cdf((i + 0.5) / QUANTILE_LEVELS) for i in range(QUANTILE_LEVELS)])
+
+METRICS = ("Traffic Gain", "Conversion Gain", "Revenue Gain", "Break-Even Month")
+
+
+@dataclass
+class SimulationResult:
+    """Per-scenario totals from :func:`simulate`. ``break_even_month`` is NaN where cost is not recovered."""
+    traffic_gain: np.ndarray
+    conversion_gain: np.ndarray
+    revenue_gain: np.ndarray
+    break_even_month: np.ndarray
+    projection_months: int
+
+    @property
+    def n_scenarios(self):
+        return len(self.traffic_gain)
+
+    @property
+    def break_even_probability(self):
+        """Share of scenarios that break even within the projection period."""
+        return float(np.mean(~np.isnan(self.break_even_month))) if self.n_scenarios else 0.0
+
+    def interval(self, metric, level=95):
+        """Central ``level``% interval of one of :data:`METRICS`."""
+        bands = self.bands(((100 - level) / 2, (100 + level) / 2))
+        return tuple(bands.loc[metric])
+
+    def bands(self, percentiles=DEFAULT_PERCENTILES):
+        """Percentile table: one row per metric, one ``P<q>`` column per percentile.
+
+        Break-even percentiles count unrecovered scenarios as later than the horizon, so they come out NaN
+        when fewer than that share of scenarios break even.
+        """
+        percentiles = np.asarray(percentiles, dtype=np.float64)
+        never = self.projection_months + 1
+        break_even = np.nan_to_num(self.break_even_month, nan=never)
+        rows = [np.percentile(values, percentiles) for values in (self.traffic_gain, self.conversion_gain, self.revenue_gain)]
+        months = np.percentile(break_even, percentiles, method="inverted_cdf").astype(np.float64)
+        rows.append(np.where(months >= never, np.nan, months))
+        columns = [f"P{q:g}" for q in percentiles]
+        return pd.DataFrame(rows, index=pd.Index(METRICS, name="Metric"), columns=columns)
+
+
+def outcome_ctr_table(position, target_position, keyword_difficulty, ctr_table):
+    """Target CTR of each keyword at each ranking quantile, shape ``(keywords, QUANTILE_LEVELS)``.
+
+    The share of the position gap closed is normal around the deterministic ``1 - difficulty / divisor``
+    with spread ``RANKING_STD``, clipped to [0, 1]; the realized position is then truncated and clamped
+    exactly like :func:`engine.adjusted_target_position`.
+
+    CTR is convex in position, so these raw outcomes average above the CTR at the deterministic target and
+    the simulated totals would sit above the headline forecast. Each row is therefore scaled to average the
+    deterministic CTR: the draws keep their relative spread, and the totals center on the point estimate.
+    """
+    deterministic = lookup_ctr(adjusted_target_position(position, target_position, keyword_difficulty), ctr_table)
+    position = np.asarray(position, dtype=np.float64)[:, None]
+    gap = position - np.asarray(target_position, dtype=np.float64)[:, None]
+    closed = 1 - np.asarray(keyword_difficulty, dtype=np.float64)[:, None] / DIFFICULTY_DIVISOR
+    closed = np.clip(closed + RANKING_STD * _RANKING_QUANTILES, 0, 1)
+    realized = np.maximum(1, np.minimum(position, np.trunc(position - gap * closed)))
+    outcomes = lookup_ctr(realized, ctr_table)
+    mean = outcomes.mean(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(mean > 0, deterministic / mean, 1.0)
+    return (outcomes * scale[:, None]).astype(np.float32)
+
+
+def _target_traffic_moments(keywords, settings, n_scenarios, rng, chunk_elements):
+    """Per-scenario sum of target traffic and of its squares over keywords (for the CTR noise variance)."""
+    table = settings.ctr_lookup
+    position = keywords['position'].to_numpy()
+    target = keywords['targetPosition'].to_numpy()
+    difficulty = keywords['keywordDifficulty'].to_numpy()
+    volume = keywords['searchVolume'].to_numpy().astype(np.float64)
+
+    traffic = np.zeros(n_scenarios)
+    traffic_sq = np.zeros(n_scenarios)
+
+    # Keywords with no gap to close have a fixed outcome
+    fixed = position <= target
+    fixed_traffic = volume[fixed] * lookup_ctr(adjusted_target_position(position[fixed], target[fixed], difficulty[fixed]), table)
+    traffic += fixed_traffic.sum()
+    traffic_sq += (fixed_traffic ** 2).sum()
+
+    open_rows = np.flatnonzero(~fixed)
+    scenario_block = max(1, min(n_scenarios, chunk_elements))
+    keyword_block = max(1, min(chunk_elements // scenario_block, chunk_elements // QUANTILE_LEVELS))
+    draws = np.empty((keyword_block, scenario_block), dtype=np.float32)
+    for start in range(0, len(open_rows), keyword_block):
+        rows = open_rows[start:start + keyword_block]
+        outcomes = outcome_ctr_table(position[rows], target[rows], difficulty[rows], table)
+        varies = outcomes.min(axis=1) != outcomes.max(axis=1)
+        constant = volume[rows[~varies]] * outcomes[~varies, 0]
+        traffic += constant.sum()
+        traffic_sq += (constant ** 2).sum()
+
+        outcomes = outcomes[varies]
+        weights = volume[rows[varies]].astype(np.float32)
+        for s in range(0, n_scenarios, scenario_block):
+            n = min(scenario_block, n_scenarios - s)
+            ctr = draws[:len(outcomes), :n]
+            quantiles = np.frombuffer(rng.bytes(len(outcomes) * n), dtype=np.uint8).reshape(len(outcomes), n)
+            for i, row in enumerate(outcomes):
+                np.take(row, quantiles[i], out=ctr[i])
+            traffic[s:s + n] += weights @ ctr
+            np.square(ctr, out=ctr)
+            traffic_sq[s:s + n] += np.square(weights) @ ctr
+    return traffic, traffic_sq
+
+
+def _break_even_months(revenue_gain, settings, avg_difficulty, season=None):
+    weights = schedule_weights(settings.projection_months, avg_difficulty, settings.category, start_month_index(settings), season)
+    recovered_share = np.cumsum(weights)
+    cost = settings.implementation_cost
+    with np.errstate(divide="ignore", invalid="ignore"):
+        needed = np.where(revenue_gain > 0, cost / revenue_gain, np.inf)
+    if cost <= 0:
+        needed = np.where(revenue_gain >= 0, 0.0, np.inf)
+    months = np.searchsorted(recovered_share, needed, side="left") + 1.0
+    months[months > settings.projection_months] = np.nan
+    return months
+
+
+def simulate(keywords, settings=None, n_scenarios=DEFAULT_SCENARIOS, seed=None, chunk_elements=DEFAULT_CHUNK_ELEMENTS):
+    """Simulate ``n_scenarios`` forecasts for a keyword frame and return a :class:`SimulationResult`.
+
+    Each scenario samples every keyword's ranking outcome, CTR noise (``CTR_STD`` relative, as in the
+    analytic CIs) and one site-wide conversion rate (``CONVERSION_RATE_STD`` relative). Results are
+    reproducible for a given ``seed`` and ``chunk_elements``.
+    """
+    settings = _as_settings(settings)
+    rng = np.random.default_rng(seed)
+    table = settings.ctr_lookup
+    volume = keywords['searchVolume'].to_numpy().astype(np.float64)
+    current_traffic = volume * lookup_ctr(keywords['position'].to_numpy(), table)
+
+    target_traffic, target_sq = _target_traffic_moments(keywords, settings, n_scenarios, rng, chunk_elements)
+    noise_std = CTR_STD * np.sqrt(target_sq + (current_traffic ** 2).sum())
+    traffic_gain = target_traffic - current_traffic.sum() + noise_std * rng.standard_normal(n_scenarios)
+
+    conversion_rate = settings.conversion_rate * np.maximum(0, 1 + CONVERSION_RATE_STD * rng.standard_normal(n_scenarios))
+    conversion_gain = traffic_gain * (conversion_rate / 100)
+    revenue_gain = conversion_gain * settings.aov
+
+    avg_difficulty = keywords['keywordDifficulty'].mean() if len(keywords) else float('nan')
+    return SimulationResult(
+        traffic_gain=traffic_gain,
+        conversion_gain=conversion_gain,
+        revenue_gain=revenue_gain,
+        break_even_month=_break_even_months(revenue_gain, settings, avg_difficulty, seasonal_curve(keywords, settings)),
+        projection_months=settings.projection_months,
+    )
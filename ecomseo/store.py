@@ -0,0 +1,135 @@
+"""On-disk project store for keyword sets and named scenarios.
+
+A project is a normalized keyword frame plus any number of named scenarios (the app's settings dict and its
+custom CTRs). Keyword frames are saved as uncompressed Arrow IPC files in the compact :mod:`schema` dtypes, so
+reopening one memory-maps the columns instead of re-ingesting the original export; scenarios and the project
+index live in a small SQLite database next to them.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .batch import normalize_custom_ctr
+from .profiling import stage
+from .schema import read_keyword_file, write_keyword_file
+
+DEFAULT_STORE_DIR = Path.home() / ".ecomseo" / "projects"
+STORE_DIR_ENV = "ECOMSEO_PROJECT_DIR"  # overrides the default location
+INDEX_FILE = "projects.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    keywords_file TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scenarios (
+    project TEXT NOT NULL REFERENCES projects(name) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    updated TEXT NOT NULL,
+    PRIMARY KEY (project, name)
+);
+"""
+
+
+@dataclass
+class ProjectInfo:
+    name: str
+    rows: int
+    updated: str  # ISO timestamp (UTC)
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _keywords_file(project):
+    """File name for a project's keywords; hashed so any project name is a safe path."""
+    return hashlib.sha1(project.encode("utf-8")).hexdigest()[:16] + ".arrow"
+
+
+class ProjectStore:
+    """Projects saved under ``root`` (default: ``$ECOMSEO_PROJECT_DIR`` or ``~/.ecomseo/projects``)."""
+
+    def __init__(self, root=None):
+        self.root = Path(root or os.environ.get(STORE_DIR_ENV) or DEFAULT_STORE_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        # A connection per call: Streamlit reruns scripts on different threads
+        conn = sqlite3.connect(self.root / INDEX_FILE)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return closing(conn)
+
+    def projects(self):
+        """Saved projects, most recently updated first."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT name, rows, updated FROM projects ORDER BY updated DESC, name").fetchall()
+        return [ProjectInfo(*row) for row in rows]
+
+    def save_keywords(self, project, keywords):
+        """Create or replace ``project``'s keyword set."""
+        filename = _keywords_file(project)
+        with stage("project_save", rows=len(keywords)):
+            write_keyword_file(keywords, self.root / filename)
+        with self._connect() as conn, conn:
+            conn.execute("INSERT INTO projects (name, keywords_file, rows, updated) VALUES (?, ?, ?, ?) "
+                         "ON CONFLICT(name) DO UPDATE SET keywords_file = excluded.keywords_file, rows = excluded.rows, "
+                         "updated = excluded.updated", (project, filename, len(keywords), _now()))
+
+    def load_keywords(self, project):
+        """``project``'s keyword set in the compact schema. Raises ``KeyError`` for an unknown project."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT keywords_file FROM projects WHERE name = ?", (project,)).fetchone()
+        if row is None:
+            raise KeyError(project)
+        with stage("project_load") as timing:
+            keywords = read_keyword_file(self.root / row[0])
+            timing.rows = len(keywords)
+        return keywords
+
+    def delete_project(self, project):
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM projects WHERE name = ?", (project,))
+        (self.root / _keywords_file(project)).unlink(missing_ok=True)
+
+    def scenarios(self, project):
+        """Names of ``project``'s saved scenarios, most recently updated first."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT name FROM scenarios WHERE project = ? ORDER BY updated DESC, name", (project,)).fetchall()
+        return [name for (name,) in rows]
+
+    def save_scenario(self, project, name, settings, custom_ctr=None):
+        """Save the settings dict (same keys as the app) and custom CTRs under ``name``; the project must exist."""
+        settings = dict(settings)
+        if custom_ctr is not None:
+            settings["custom_ctr"] = custom_ctr
+        with self._connect() as conn, conn:
+            if conn.execute("SELECT 1 FROM projects WHERE name = ?", (project,)).fetchone() is None:
+                raise KeyError(project)
+            conn.execute("INSERT OR REPLACE INTO scenarios (project, name, settings, updated) VALUES (?, ?, ?, ?)",
+                         (project, name, json.dumps(settings), _now()))
+
+    def load_scenario(self, project, name):
+        """Saved settings dict; ``custom_ctr`` (if any) comes back with integer position keys."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT settings FROM scenarios WHERE project = ? AND name = ?", (project, name)).fetchone()
+        if row is None:
+            raise KeyError((project, name))
+        settings = json.loads(row[0])
+        if settings.get("custom_ctr") is not None:
+            settings["custom_ctr"] = normalize_custom_ctr(settings["custom_ctr"])
+        return settings
+
+    def delete_scenario(self, project, name):
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM scenarios WHERE project = ? AND name = ?", (project, name))
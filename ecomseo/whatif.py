@@ -0,0 +1,62 @@
+"""What-if analysis over conversion rate, AOV and implementation cost grids.
+
+The traffic gain does not depend on any of the what-if inputs, so it is computed once and the grid is an outer
+product: conversions over conversion rates, revenue over conversion rate x AOV, ROI over all three axes.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .engine import _as_settings, total_traffic_gain
+
+
+@dataclass
+class WhatIfGrid:
+    """Totals for every grid point. Array axes are ``(conversion_rates, aovs, implementation_costs)``."""
+    traffic_gain: float
+    conversion_rates: np.ndarray  # percent
+    aovs: np.ndarray
+    implementation_costs: np.ndarray
+    conversion_gain: np.ndarray  # (n_rates,)
+    revenue_gain: np.ndarray  # (n_rates, n_aovs)
+    roi: np.ndarray  # (n_rates, n_aovs, n_costs), percent of implementation cost
+
+    def to_frame(self):
+        """Tidy table with one row per grid point."""
+        rates, aovs, costs = np.meshgrid(self.conversion_rates, self.aovs, self.implementation_costs, indexing="ij")
+        return pd.DataFrame({
+            "Conversion Rate (%)": rates.ravel(),
+            "AOV": aovs.ravel(),
+            "Implementation Cost": costs.ravel(),
+            "Traffic Gain": np.full(rates.size, self.traffic_gain),
+            "Conversion Gain": np.broadcast_to(self.conversion_gain[:, None, None], rates.shape).ravel(),
+            "Revenue Gain": np.broadcast_to(self.revenue_gain[:, :, None], rates.shape).ravel(),
+            "ROI (%)": self.roi.ravel(),
+        })
+
+
+def what_if_grid(traffic_gain, conversion_rates, aovs, implementation_costs):
+    """Broadcast a total traffic gain against the what-if axes."""
+    conversion_rates = np.atleast_1d(np.asarray(conversion_rates, dtype=float))
+    aovs = np.atleast_1d(np.asarray(aovs, dtype=float))
+    implementation_costs = np.atleast_1d(np.asarray(implementation_costs, dtype=float))
+
+    conversion_gain = traffic_gain * (conversion_rates / 100)
+    revenue_gain = np.multiply.outer(conversion_gain, aovs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(implementation_costs > 0,
+                       (revenue_gain[:, :, None] - implementation_costs) / implementation_costs * 100, 0.0)
+    return WhatIfGrid(float(traffic_gain), conversion_rates, aovs, implementation_costs, conversion_gain, revenue_gain, roi)
+
+
+def what_if(keywords, settings=None, conversion_rates=None, aovs=None, implementation_costs=None):
+    """What-if grid for a keyword frame. Axes left as ``None`` fall back to the single value in ``settings``."""
+    settings = _as_settings(settings)
+    traffic_gain = total_traffic_gain(keywords, settings)
+    return what_if_grid(
+        traffic_gain,
+        settings.conversion_rate if conversion_rates is None else conversion_rates,
+        settings.aov if aovs is None else aovs,
+        settings.implementation_cost if implementation_costs is None else implementation_costs,
+    )
@@ -1,10 +1,23 @@
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-from io import StringIO
+import os
+from functools import partial
+
+from ecomseo import ForecastCache, ForecastSettings, IncrementalForecast, PositionVolumes, UploadCache, what_if
+from ecomseo.cache import content_key, frame_fingerprint
+from ecomseo.export import EXPORT_FORMATS, export_bytes
+from ecomseo.ingest import read_monthly_volumes, read_search_console_columns
+from ecomseo.models import CTR_MODELS, CURRENCY_OPTIONS, DEFAULT_CUSTOM_CTR, DEFAULT_SETTINGS, Z_SCORE
+from ecomseo.optimize import POSITION_COST, prioritize
+from ecomseo.paging import (EDITOR_PAGE_SIZE, PAGE_SIZES, SORT_COLUMNS, KeywordQuery, apply_page_edits, matching_positions,
+                             page_count, page_of, query_keywords)
+from ecomseo.profiling import StageProfiler
+from ecomseo.report import KEYWORD_DETAIL_COLUMNS, MONTHLY_COLUMNS, keyword_details, monthly_projections
+from ecomseo.scenarios import scenario_matrix
+from ecomseo.schema import empty_keywords, enforce_schema
+from ecomseo.store import ProjectStore
 
 # Set page configuration
 st.set_page_config(
@@ -13,6 +26,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Per-rerun stage timings (shown under "Performance" in the sidebar and logged at the end of the run)
+profiler = StageProfiler().activate()
+
 # Inject meta tags
 st.markdown("""
     <head>
@@ -101,19 +117,7 @@ st.markdown("""
 st.sidebar.header("Settings")
 
 # Default settings
-default_settings = {
-    "category": "BBQ & Outdoor Cooking",
-    "projection_months": 6,
-    "conversion_rate": 3.0,
-    "currency_selection": "USD ($)",
-    "aov": 250,
-    "implementation_cost": 5000,
-    "ctr_model": "E-commerce",  # Changed to E-commerce for more realistic default
-    "featured_snippet_present": False,
-    "in_featured_snippet": False,
-    "faq_present": False,
-    "in_faq": False
-}
+default_settings = DEFAULT_SETTINGS
 
 # Initialize session state
 if 'settings' not in st.session_state:
@@ -125,26 +129,20 @@ else:
 
 # Initialize keywords with more ambitious targets
 if 'keywords' not in st.session_state:
-    st.session_state.keywords = pd.DataFrame({
+    st.session_state.keywords = enforce_schema(pd.DataFrame({
         "keyword": ["gas bbq", "charcoal bbq", "bbq grill"],
         "searchVolume": [8000, 6500, 5000],
         "position": [8, 12, 9],
         "targetPosition": [1, 3, 2],  # More ambitious targets
         "keywordDifficulty": [5, 5, 5]
-    })
+    }))
 
 # CTR models
-ctr_models = {
-    "Default": {1: 0.25, 2: 0.15, 3: 0.10, 4: 0.07, 5: 0.07, 6: 0.03, 7: 0.03, 8: 0.03, 9: 0.03, 10: 0.03, 11: 0.01, 20: 0.01, 21: 0.005},
-    "E-commerce": {1: 0.30, 2: 0.20, 3: 0.12, 4: 0.08, 5: 0.06, 6: 0.04, 7: 0.03, 8: 0.02, 9: 0.02, 10: 0.01, 11: 0.008, 20: 0.005, 21: 0.002},
-    "Informational": {1: 0.35, 2: 0.25, 3: 0.15, 4: 0.10, 5: 0.08, 6: 0.05, 7: 0.04, 8: 0.03, 9: 0.02, 10: 0.01, 11: 0.005, 20: 0.003, 21: 0.001},
-    "Custom": {}
-}
+ctr_models = CTR_MODELS
 
 # Initialize custom CTR with realistic defaults
 if 'custom_ctr' not in st.session_state:
-    st.session_state.custom_ctr = {pos: ctr_models["E-commerce"][pos] for pos in range(1, 11)}
-    st.session_state.custom_ctr['beyond_10'] = 0.005
+    st.session_state.custom_ctr = DEFAULT_CUSTOM_CTR.copy()
 else:
     # Ensure custom CTR has valid values
     for pos in range(1, 11):
@@ -153,38 +151,32 @@ else:
     if 'beyond_10' not in st.session_state.custom_ctr or st.session_state.custom_ctr['beyond_10'] == 0.0:
         st.session_state.custom_ctr['beyond_10'] = 0.005
 
-# Modified CTR calculation function
-def get_ctr(position, ctr_table, featured_snippet_present=False, in_featured_snippet=False, faq_present=False, in_faq=False):
-    position = int(position)
-    
-    if not ctr_table:  # Custom model
-        ctr = st.session_state.custom_ctr.get(position, st.session_state.custom_ctr['beyond_10'])
-    else:  # Predefined model
-        if position in ctr_table:
-            ctr = ctr_table[position]
-        else:
-            for i in range(position, 0, -1):
-                if i in ctr_table:
-                    ctr = ctr_table[i]
-                    break
-            else:
-                for i in range(position, 100):
-                    if i in ctr_table:
-                        ctr = ctr_table[i]
-                        break
-                else:
-                    ctr = 0.005
-
-    # Apply SERP feature modifiers
-    if ctr_table and featured_snippet_present:
-        if position == 1:
-            ctr *= 1.1 if in_featured_snippet else 0.8
-        elif 2 <= position <= 5:
-            ctr *= 0.9
-    if ctr_table and faq_present and position == 1:
-        ctr *= 1.1 if in_faq else 0.9
-
-    return max(0.001, ctr)
+# Saved projects: keyword sets and named scenarios on disk
+@st.cache_resource
+def get_project_store():
+    return ProjectStore()
+
+project_store = get_project_store()
+
+def open_project(project, scenario=None):
+    """Load a saved project into the session; runs before the sidebar widgets so they pick up its settings."""
+    st.session_state.keywords = project_store.load_keywords(project)
+    if scenario:
+        saved = project_store.load_scenario(project, scenario)
+        custom_ctr = saved.pop("custom_ctr", None)
+        st.session_state.settings = {**default_settings, **{k: v for k, v in saved.items() if k in default_settings}}
+        if custom_ctr is not None:
+            st.session_state.custom_ctr = custom_ctr
+            for i in range(1, 11):  # keyed inputs keep their own state; drop it so they show the loaded values
+                st.session_state.pop(f"custom_ctr_{i}", None)
+        st.session_state.ctr_model_choice = st.session_state.settings["ctr_model"]
+    for key in ['forecast_state', 'show_results', 'preview_volumes', 'monthly_volumes']:
+        st.session_state.pop(key, None)
+    st.session_state.project_name = project
+    st.session_state.scenario_name = scenario or "Base"
+
+if 'open_project' in st.session_state:
+    open_project(*st.session_state.pop('open_project'))
 
 # Quick Start button
 if st.sidebar.button("Quick Start"):
@@ -199,11 +191,14 @@ if st.sidebar.button("Quick Start"):
     st.rerun()
 
 # Settings inputs (mostly unchanged)
-category = st.sidebar.selectbox("Product Category", ["BBQ & Outdoor Cooking", "Christmas & Seasonal", "Fashion & Apparel", 
-    "Electronics & Technology", "Gardening & Outdoor", "Furniture & Home"])
-projection_months = st.sidebar.radio("Projection Period", [6, 12])
+category_options = ["BBQ & Outdoor Cooking", "Christmas & Seasonal", "Fashion & Apparel", 
+    "Electronics & Technology", "Gardening & Outdoor", "Furniture & Home"]
+category = st.sidebar.selectbox("Product Category", category_options, index=category_options.index(st.session_state.settings["category"]))
+projection_options = [6, 12, 24, 36, 60]
+projection_months = st.sidebar.radio("Projection Period", projection_options, 
+    index=projection_options.index(st.session_state.settings["projection_months"]))
 conversion_rate = st.sidebar.slider("Conversion Rate (%)", 0.1, 10.0, st.session_state.settings["conversion_rate"], 0.1)
-currency_options = {"GBP (£)": "£", "EUR (€)": "€", "USD ($)": "$", "AED (د.إ)": "د.إ", "SAR (﷼)": "﷼"}
+currency_options = CURRENCY_OPTIONS
 currency_selection = st.sidebar.selectbox("Currency", list(currency_options.keys()), 
     index=list(currency_options.keys()).index(st.session_state.settings["currency_selection"]))
 currency_symbol = currency_options[currency_selection]
@@ -221,7 +216,7 @@ st.sidebar.markdown("""
         </div>
     </div>
 """, unsafe_allow_html=True)
-ctr_model = st.sidebar.selectbox("", list(ctr_models.keys()))
+ctr_model = st.sidebar.selectbox("", list(ctr_models.keys()), key="ctr_model_choice")
 
 # Custom CTR input
 if ctr_model == "Custom":
@@ -242,6 +237,12 @@ in_featured_snippet = st.sidebar.checkbox("My site is in the Featured Snippet",
 faq_present = st.sidebar.checkbox("FAQ Present", value=st.session_state.settings["faq_present"])
 in_faq = st.sidebar.checkbox("My site is in the FAQ", value=st.session_state.settings["in_faq"]) if faq_present else False
 
+# Optional Monte Carlo ranges
+st.sidebar.markdown("### Confidence Intervals")
+simulate_ranges = st.sidebar.checkbox("Simulate ranges (Monte Carlo)", value=False,
+    help="Samples ranking outcomes, CTR and conversion rate per scenario instead of assuming fixed normal errors.")
+n_scenarios = st.sidebar.number_input("Scenarios", 1000, 100000, 10000, 1000) if simulate_ranges else 0
+
 # Update settings
 st.session_state.settings.update({
     "category": category,
@@ -257,9 +258,53 @@ st.session_state.settings.update({
     "in_faq": in_faq
 })
 
+forecast_settings = ForecastSettings.from_dict(st.session_state.settings, custom_ctr=st.session_state.custom_ctr,
+    monthly_volumes=st.session_state.get('monthly_volumes'))
+
+# Process-wide forecast result cache, shared across sessions
+@st.cache_resource
+def get_forecast_cache():
+    return ForecastCache(max_entries=64, max_bytes=512 * 1024 * 1024, ttl=3600)
+
+forecast_cache = get_forecast_cache()
+
+# Process-wide cache of parsed uploads keyed by file content, optionally spilling to disk
+@st.cache_resource
+def get_upload_cache():
+    return UploadCache(max_entries=16, max_bytes=512 * 1024 * 1024, spill_dir=os.environ.get("ECOMSEO_UPLOAD_SPILL_DIR"))
+
+upload_cache = get_upload_cache()
+
+# Per-session metrics kept between edits so only changed keyword rows are recomputed
+if 'forecast_state' not in st.session_state:
+    st.session_state.forecast_state = IncrementalForecast()
+
+with st.sidebar.expander("Projects"):
+    project_name = st.text_input("Project name", value=st.session_state.get('project_name', ""))
+    scenario_name = st.text_input("Scenario name", value=st.session_state.get('scenario_name', "Base"))
+    if st.button("Save Project", disabled=not (project_name.strip() and scenario_name.strip())):
+        project_store.save_keywords(project_name.strip(), st.session_state.keywords)
+        project_store.save_scenario(project_name.strip(), scenario_name.strip(), st.session_state.settings, st.session_state.custom_ctr)
+        st.session_state.project_name, st.session_state.scenario_name = project_name.strip(), scenario_name.strip()
+        st.success(f"Saved {len(st.session_state.keywords):,} keywords and scenario '{scenario_name.strip()}'.")
+    saved_projects = project_store.projects()
+    if saved_projects:
+        saved_names = [p.name for p in saved_projects]
+        selected_project = st.selectbox("Saved projects", saved_names, 
+            format_func=lambda name: f"{name} ({saved_projects[saved_names.index(name)].rows:,} keywords)")
+        saved_scenarios = project_store.scenarios(selected_project)
+        selected_scenario = st.selectbox("Saved scenarios", saved_scenarios) if saved_scenarios else None
+        col1, col2 = st.columns(2)
+        if col1.button("Open"):
+            st.session_state.open_project = (selected_project, selected_scenario)
+            st.rerun()
+        if col2.button("Delete"):
+            project_store.delete_project(selected_project)
+            st.rerun()
+
 # Reset button
 if st.sidebar.button("Reset to Defaults", type="secondary"):
-    for key in ['settings', 'keywords', 'custom_ctr']:
+    for key in ['settings', 'keywords', 'custom_ctr', 'forecast_state', 'show_results', 'monthly_volumes']:
         if key in st.session_state:
             del st.session_state[key]
     st.rerun()
@@ -272,28 +317,39 @@ with st.container():
     with col1:
         uploaded_file = st.file_uploader("Choose a file", type=["csv", "xlsx", "xls"])
     with col2:
-        st.markdown("#### Supported Formats\n- CSV files (.csv)\n- Excel files (.xlsx, .xls)\n#### Required Columns\n- Keyword/Search Term\n- Search Volume\n- Current Position (optional)")
+        st.markdown("#### Supported Formats\n- CSV files (.csv)\n- Excel files (.xlsx, .xls)\n- Search Console performance exports (.csv)\n#### Required Columns\n- Keyword/Search Term\n- Search Volume\n- Current Position (optional)\n- Monthly volumes (optional: Jan–Dec columns or a Trend column)")
 
     if uploaded_file:
         try:
-            df = pd.read_csv(uploaded_file) if uploaded_file.name.endswith('.csv') else pd.read_excel(uploaded_file)
-            df.columns = df.columns.str.lower()
-            keyword_col = next((col for col in df.columns if any(kw in col for kw in ["keyword", "term", "query", "search term"])), df.columns[0])
-            volume_col = next((col for col in df.columns if any(vol in col for vol in ["volume", "search volume", "monthly searches"])), 
-                            df.columns[1] if len(df.columns) > 1 else None)
-            position_col = next((col for col in df.columns if any(pos in col for pos in ["position", "rank", "ranking", "pos", "serp"])), 
-                              df.columns[2] if len(df.columns) > 2 else None)
-            difficulty_col = next((col for col in df.columns if any(diff in col for diff in ["difficulty", "keyword difficulty"])), None)
-            
-            new_df = pd.DataFrame()
-            new_df['keyword'] = df[keyword_col]
-            new_df['searchVolume'] = pd.to_numeric(df[volume_col], errors='coerce').fillna(0).astype(int) if volume_col else 0
-            new_df['position'] = pd.to_numeric(df[position_col], errors='coerce').fillna(20).astype(int) if position_col else 20
-            new_df['targetPosition'] = new_df['position'].apply(lambda x: max(1, int(x * 0.5)))
-            new_df['keywordDifficulty'] = pd.to_numeric(df[difficulty_col], errors='coerce').clip(1, 10).fillna(5).astype(int) if difficulty_col else 5
-            
-            st.session_state.keywords = new_df
-            st.success(f"Successfully imported {len(new_df)} keywords!")
+            # A Search Console export without dates (the UI's Queries.csv) doesn't say which period it covers
+            search_console_months = None
+            search_console = read_search_console_columns(uploaded_file, uploaded_file.name)
+            if search_console is not None and search_console.date is None:
+                search_console_months = st.number_input("Search Console period (months)", 1, 16, 3,
+                    help="Months of data in this export; impressions are divided by it to estimate monthly search volume. "
+                         "Search Console exports the last 3 months by default.")
+            progress_bar = st.progress(0.0, text="Reading keywords...")
+            with profiler.stage("parse_upload") as timing:
+                # Hash each attached file once per session; the parsed frame is shared by every session via upload_cache.
+                # The keyword table is replaced only when a new file arrives, so edits made since the upload survive reruns
+                upload_id = (uploaded_file.file_id, search_console_months)
+                if st.session_state.get('upload_key', (None,))[0] != upload_id:
+                    upload_key = (upload_id, content_key(uploaded_file, uploaded_file.name))
+                    # Monthly volume history, if the export has one, drives the seasonal curve of the projection
+                    monthly_volumes = read_monthly_volumes(uploaded_file, uploaded_file.name)
+                    new_df = upload_cache.read(uploaded_file, uploaded_file.name, key=upload_key[1],
+                        search_console_months=search_console_months, progress=lambda fraction, rows: progress_bar.progress(fraction, text=f"Read {rows:,} rows"))
+                    st.session_state.monthly_volumes = monthly_volumes
+                    st.session_state.keywords = new_df
+                    st.session_state.upload_key = upload_key
+                    st.session_state.upload_rows = len(new_df)
+                timing.rows = st.session_state.upload_rows
+            progress_bar.empty()
+
+            st.success(f"Successfully imported {st.session_state.upload_rows} keywords!")
+            if st.session_state.get('monthly_volumes') is not None:
+                st.caption(f"Monthly volume history found for {len(st.session_state.monthly_volumes):,} keywords; "
+                           "their own seasonality replaces the category curve in the monthly projection.")
         except Exception as e:
             st.error(f"Error processing file: {e}")
 
@@ -317,36 +373,47 @@ with st.container():
         if st.button("Add Keyword", key="add_keyword") and new_keyword:
             new_row = pd.DataFrame({"keyword": [new_keyword], "searchVolume": [new_volume], "position": [new_position], 
                                    "targetPosition": [new_target], "keywordDifficulty": [new_difficulty]})
-            st.session_state.keywords = pd.concat([st.session_state.keywords, new_row], ignore_index=True)
+            st.session_state.keywords = enforce_schema(pd.concat([st.session_state.keywords, new_row], ignore_index=True))
             st.success("Keyword added!")
 
-    edited_df = st.data_editor(st.session_state.keywords, num_rows="dynamic", hide_index=True, 
-        column_config={
-            "keyword": st.column_config.TextColumn("Keyword"),
-            "searchVolume": st.column_config.NumberColumn("Search Volume", min_value=0, format="%d"),
-            "position": st.column_config.NumberColumn("Current Position", min_value=1, max_value=100, step=1),
-            "targetPosition": st.column_config.NumberColumn("Target Position", min_value=1, max_value=100, step=1),
-            "keywordDifficulty": st.column_config.NumberColumn("Keyword Difficulty", min_value=1, max_value=10, step=1)
-        }, use_container_width=True)
-    st.session_state.keywords = edited_df
-
-    if st.button("Preview Forecast"):
-        if len(st.session_state.keywords) > 0:
-            keywords = st.session_state.keywords.copy()
-            selected_ctr_table = {} if ctr_model == "Custom" else ctr_models[ctr_model]
-            keywords['currentCTR'] = keywords['position'].apply(lambda pos: get_ctr(pos, selected_ctr_table, featured_snippet_present, in_featured_snippet, faq_present, in_faq))
-            keywords['adjustedTargetPosition'] = keywords.apply(
-                lambda row: max(1, int(row['position'] - (row['position'] - row['targetPosition']) * (1 - row['keywordDifficulty'] / 15))), axis=1)  # Adjusted divisor
-            keywords['targetCTR'] = keywords['adjustedTargetPosition'].apply(lambda pos: get_ctr(pos, selected_ctr_table, featured_snippet_present, in_featured_snippet, faq_present, in_faq))
-            keywords['currentTraffic'] = keywords['searchVolume'] * keywords['currentCTR']
-            keywords['targetTraffic'] = keywords['searchVolume'] * keywords['targetCTR']
-            traffic_gain = (keywords['targetTraffic'] - keywords['currentTraffic']).sum()
-            st.info(f"**Estimated Traffic Gain**: {int(traffic_gain):,} visitors per month")
+    editor_columns = {
+        "keyword": st.column_config.TextColumn("Keyword"),
+        "searchVolume": st.column_config.NumberColumn("Search Volume", min_value=0, format="%d"),
+        "position": st.column_config.NumberColumn("Current Position", min_value=1, max_value=100, step=1),
+        "targetPosition": st.column_config.NumberColumn("Target Position", min_value=1, max_value=100, step=1),
+        "keywordDifficulty": st.column_config.NumberColumn("Keyword Difficulty", min_value=1, max_value=10, step=1)
+    }
+    with profiler.stage("data_editor", rows=len(st.session_state.keywords)):
+        if len(st.session_state.keywords) <= EDITOR_PAGE_SIZE:
+            edited_df = st.data_editor(st.session_state.keywords, num_rows="dynamic", hide_index=True, 
+                column_config=editor_columns, use_container_width=True)
+            st.session_state.keywords = enforce_schema(edited_df)
         else:
-            st.warning("Please add at least one keyword.")
+            # Large sets are edited one page at a time; only that page is sent to the browser
+            editor_pages = page_count(len(st.session_state.keywords), EDITOR_PAGE_SIZE)
+            editor_page = st.number_input(f"Keyword page (of {editor_pages:,})", 1, editor_pages, 1) - 1
+            page = query_keywords(st.session_state.keywords, KeywordQuery(page=editor_page, page_size=EDITOR_PAGE_SIZE))
+            st.caption(f"Editing keywords {page.first_row:,}–{page.last_row:,} of {page.total:,}. Use \"Add New Keyword\" to add rows.")
+            edited_df = st.data_editor(page.rows, num_rows="fixed", hide_index=True, column_config=editor_columns, use_container_width=True)
+            st.session_state.keywords = apply_page_edits(st.session_state.keywords, page.positions, edited_df)
+
+    # Live preview: volume-by-position histograms are rebuilt only when the keyword frame's content changes (the
+    # editor returns a new frame on every rerun, so identity only short-cuts the hash), and totals
+    # for any settings are then dot products with the cached CTR table
+    if len(st.session_state.keywords) > 0:
+        with profiler.stage("preview", rows=len(st.session_state.keywords)):
+            preview = st.session_state.get('preview_volumes')
+            if preview is None or preview[0] is not st.session_state.keywords:
+                fingerprint = frame_fingerprint(st.session_state.keywords)
+                volumes = preview[2] if preview is not None and preview[1] == fingerprint else PositionVolumes.from_keywords(st.session_state.keywords)
+                preview = st.session_state.preview_volumes = (st.session_state.keywords, fingerprint, volumes)
+            traffic_gain = preview[2].traffic_gain(forecast_settings)
+            traffic_gain_std = preview[2].traffic_gain_std(forecast_settings)
+        st.info(f"**Estimated Traffic Gain**: {int(traffic_gain):,} visitors per month (95% CI ±{int(Z_SCORE * traffic_gain_std):,})")
 
     if st.button("Clear Keywords"):
-        st.session_state.keywords = pd.DataFrame(columns=["keyword", "searchVolume", "position", "targetPosition", "keywordDifficulty"])
+        st.session_state.keywords = empty_keywords()
+        st.session_state.show_results = False
         st.rerun()
 
 # Calculate button
@@ -361,40 +428,26 @@ st.markdown("""
 calculate_button = st.button("Calculate Forecast 📊", type="primary", use_container_width=True)
 st.markdown("</div>", unsafe_allow_html=True)
 
-# What-If Analysis (unchanged except for CTR table selection)
+# What-If Analysis
 st.header("What-If Analysis")
 with st.expander("Adjust Conversion Rate"):
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1: min_conversion = st.number_input("Minimum Conversion Rate (%)", 0.1, 10.0, conversion_rate - 1.0, 0.1)
     with col2: max_conversion = st.number_input("Maximum Conversion Rate (%)", 0.1, 10.0, conversion_rate + 1.0, 0.1)
+    with col3: steps = st.number_input("Steps", 2, 500, 5, 1)
 
     if st.button("Run What-If Analysis"):
         if min_conversion >= max_conversion:
             st.error("Minimum conversion rate must be less than maximum conversion rate.")
         else:
-            steps = 5
-            conversion_range = np.linspace(min_conversion, max_conversion, steps)
-            what_if_data = []
-            selected_ctr_table = {} if ctr_model == "Custom" else ctr_models[ctr_model]
-
-            for cr in conversion_range:
-                keywords = st.session_state.keywords.copy()
-                keywords['adjustedTargetPosition'] = keywords.apply(
-                    lambda row: max(1, int(row['position'] - (row['position'] - row['targetPosition']) * (1 - row['keywordDifficulty'] / 15))), axis=1)
-                current_traffic = keywords['position'].apply(lambda pos: get_ctr(pos, selected_ctr_table, featured_snippet_present, in_featured_snippet, faq_present, in_faq)) * keywords['searchVolume']
-                target_traffic = keywords['adjustedTargetPosition'].apply(lambda pos: get_ctr(pos, selected_ctr_table, featured_snippet_present, in_featured_snippet, faq_present, in_faq)) * keywords['searchVolume']
-                traffic_gain = target_traffic - current_traffic
-                conversion_gain = traffic_gain * (cr / 100)
-                revenue_gain = conversion_gain * aov
-
-                what_if_data.append({
-                    "Conversion Rate (%)": cr,
-                    "Traffic Gain": int(traffic_gain.sum()),
-                    "Conversion Gain": int(round(conversion_gain.sum())),
-                    "Revenue Gain": f"{currency_symbol}{int(revenue_gain.sum()):,}"
-                })
-
-            what_if_df = pd.DataFrame(what_if_data)
+            with profiler.stage("what_if", rows=len(st.session_state.keywords)):
+                grid = what_if(st.session_state.keywords, forecast_settings, np.linspace(min_conversion, max_conversion, steps))
+            what_if_df = pd.DataFrame({
+                "Conversion Rate (%)": grid.conversion_rates,
+                "Traffic Gain": int(grid.traffic_gain),
+                "Conversion Gain": np.round(grid.conversion_gain).astype(int),
+                "Revenue Gain": [f"{currency_symbol}{int(revenue):,}" for revenue in grid.revenue_gain[:, 0]]
+            })
             st.dataframe(what_if_df, hide_index=True, column_config={
                 "Conversion Rate (%)": st.column_config.NumberColumn(format="%.1f"),
                 "Traffic Gain": st.column_config.NumberColumn(format="%d"),
@@ -402,53 +455,58 @@ with st.expander("Adjust Conversion Rate"):
                 "Revenue Gain": "Revenue Gain"
             }, use_container_width=True)
 
-            fig = px.line(what_if_df, x="Conversion Rate (%)", y=["Traffic Gain", "Conversion Gain"], 
-                         title="Impact of Conversion Rate on Forecast", labels={"value": "Metric Value", "variable": "Metric"})
-            fig.update_traces(mode="lines+markers")
-            st.plotly_chart(fig, use_container_width=True)
-
-# Forecast calculation with fixes
+            with profiler.stage("what_if_chart"):
+                import plotly.express as px  # charting is loaded on first use, not on page load
+                fig = px.line(what_if_df, x="Conversion Rate (%)", y=["Traffic Gain", "Conversion Gain"], 
+                             title="Impact of Conversion Rate on Forecast", labels={"value": "Metric Value", "variable": "Metric"})
+                fig.update_traces(mode="lines+markers")
+                st.plotly_chart(fig, use_container_width=True)
+
+with st.expander("Compare Scenarios"):
+    col1, col2, col3 = st.columns(3)
+    with col1: matrix_models = st.multiselect("CTR Models", list(ctr_models), default=list(ctr_models))
+    with col2: matrix_categories = st.multiselect("Product Categories", category_options, default=category_options)
+    with col3: matrix_horizons = st.multiselect("Projection Periods", projection_options, default=[6, 12])
+    matrix_serp = st.checkbox("Include every SERP feature state", value=False,
+        help="Otherwise only the SERP features selected in the sidebar are used.")
+
+    if st.button("Compare Scenarios"):
+        if not (matrix_models and matrix_categories and matrix_horizons):
+            st.error("Select at least one CTR model, category and projection period.")
+        elif len(st.session_state.keywords) == 0:
+            st.warning("Please add at least one keyword.")
+        else:
+            # All combinations in one batched pass; conversion rate, AOV and cost come from the sidebar
+            matrix = scenario_matrix(st.session_state.keywords, forecast_settings, matrix_models, matrix_categories,
+                sorted(matrix_horizons), serp_states=None if matrix_serp else [forecast_settings.serp_flags])
+            with profiler.stage("scenario_table", rows=len(matrix)):
+                st.dataframe(matrix, hide_index=True, column_config={
+                    "Traffic Gain": st.column_config.NumberColumn(format="%d"),
+                    "Traffic CI Low": st.column_config.NumberColumn(format="%d"),
+                    "Traffic CI High": st.column_config.NumberColumn(format="%d"),
+                    "Conversion Gain": st.column_config.NumberColumn("Conversions", format="%d"),
+                    "Revenue Gain": st.column_config.NumberColumn(format=f"{currency_symbol}%d"),
+                    "CPA": st.column_config.NumberColumn(format=f"{currency_symbol}%.2f"),
+                    "ROI (%)": st.column_config.NumberColumn(format="%.1f%%"),
+                }, use_container_width=True)
+                st.download_button("Download Scenario Matrix as CSV", matrix.to_csv(index=False).encode("utf-8"),
+                    "seo_scenario_matrix.csv", "text/csv")
+
+# Forecast calculation with fixes. Results stay on screen for later reruns (paging, sorting) until cleared.
 if calculate_button:
+    st.session_state.show_results = True
+if st.session_state.get('show_results'):
     if len(st.session_state.keywords) > 0:
-        keywords = st.session_state.keywords.copy()
-        selected_ctr_table = {} if ctr_model == "Custom" else ctr_models[ctr_model]
-        
-        # Calculate CTRs and traffic
-        keywords['currentCTR'] = keywords['position'].apply(
-            lambda pos: get_ctr(pos, selected_ctr_table, featured_snippet_present, in_featured_snippet, faq_present, in_faq))
-        keywords['adjustedTargetPosition'] = keywords.apply(
-            lambda row: max(1, min(row['position'], int(row['position'] - (row['position'] - row['targetPosition']) * (1 - row['keywordDifficulty'] / 15)))), axis=1)
-        keywords['targetCTR'] = keywords['adjustedTargetPosition'].apply(
-            lambda pos: get_ctr(pos, selected_ctr_table, featured_snippet_present, in_featured_snippet, faq_present, in_faq))
-        keywords['currentTraffic'] = keywords['searchVolume'] * keywords['currentCTR']
-        keywords['targetTraffic'] = keywords['searchVolume'] * keywords['targetCTR']
-        keywords['trafficGain'] = keywords['targetTraffic'] - keywords['currentTraffic']
-        keywords['conversionGain'] = keywords['trafficGain'] * (conversion_rate / 100)
-        keywords['revenueGain'] = keywords['conversionGain'] * aov
-        
-        # Confidence intervals
-        ctr_std = 0.10
-        z_score = 1.96
-        keywords['currentTraffic_std'] = keywords['searchVolume'] * keywords['currentCTR'] * ctr_std
-        keywords['targetTraffic_std'] = keywords['searchVolume'] * keywords['targetCTR'] * ctr_std
-        keywords['trafficGain_std'] = np.sqrt(keywords['currentTraffic_std']**2 + keywords['targetTraffic_std']**2)
-        
-        total_traffic_gain = keywords['trafficGain'].sum()
-        total_traffic_gain_std = np.sqrt((keywords['trafficGain_std']**2).sum())
-        traffic_ci_lower = total_traffic_gain - z_score * total_traffic_gain_std
-        traffic_ci_upper = total_traffic_gain + z_score * total_traffic_gain_std
-        
-        total_conversion_gain = int(round(keywords['conversionGain'].sum()))
-        total_conversion_gain_std = total_traffic_gain_std * (conversion_rate / 100)
-        conversion_ci_lower = int(round(total_conversion_gain - z_score * total_conversion_gain_std))
-        conversion_ci_upper = int(round(total_conversion_gain + z_score * total_conversion_gain_std))
-        
-        total_revenue_gain = total_conversion_gain * aov
-        total_revenue_gain_std = total_conversion_gain_std * aov
-        revenue_ci_lower = total_revenue_gain - z_score * total_revenue_gain_std
-        revenue_ci_upper = total_revenue_gain + z_score * total_revenue_gain_std
-        
-        cpa = implementation_cost / total_conversion_gain if total_conversion_gain > 0 else float('inf')
+        with profiler.stage("forecast", rows=len(st.session_state.keywords)):
+            result = forecast_cache.forecast(st.session_state.keywords, forecast_settings, compute=st.session_state.forecast_state.update)
+        keywords = result.keywords
+        total_traffic_gain = result.total_traffic_gain
+        traffic_ci_lower, traffic_ci_upper = result.traffic_ci
+        total_conversion_gain = result.total_conversion_gain
+        conversion_ci_lower, conversion_ci_upper = result.conversion_ci
+        total_revenue_gain = result.total_revenue_gain
+        revenue_ci_lower, revenue_ci_upper = result.revenue_ci
+        cpa = result.cpa
         
         # Display results
         st.header("Forecast Results")
@@ -464,9 +522,9 @@ if calculate_button:
         """, unsafe_allow_html=True)
         
         col1, col2, col3, col4 = st.columns(4)
-        traffic_percent = keywords['trafficGain'].sum() / keywords['currentTraffic'].sum() * 100 if keywords['currentTraffic'].sum() != 0 else 0
-        conv_percent = total_conversion_gain / (keywords['currentTraffic'].sum() * conversion_rate / 100) * 100 if keywords['currentTraffic'].sum() != 0 else 0
-        revenue_percent = total_revenue_gain / (keywords['currentTraffic'].sum() * conversion_rate / 100 * aov) * 100 if keywords['currentTraffic'].sum() != 0 else 0
+        traffic_percent = result.traffic_percent
+        conv_percent = result.conversion_percent
+        revenue_percent = result.revenue_percent
         
         with col1:
             st.markdown("""<div class="tooltip">Total Traffic Gain<span class="tooltiptext">This range shows where we expect the true traffic gain to fall, with 95% confidence.</span></div>""", unsafe_allow_html=True)
@@ -486,49 +544,29 @@ if calculate_button:
             st.markdown("Cost Per Acquisition (CPA)")
             st.metric("", f"{currency_symbol}{cpa:.2f}" if cpa != float('inf') else "N/A")
         
+        if simulate_ranges:
+            st.markdown("### Simulated Ranges")
+            with profiler.stage("simulation", rows=len(st.session_state.keywords)):
+                simulation = forecast_cache.simulation(st.session_state.keywords, forecast_settings, n_scenarios=n_scenarios, seed=0)
+            bands = simulation.bands().rename(columns={"P2.5": "Low (2.5%)", "P50": "Median", "P97.5": "High (97.5%)"})
+            st.dataframe(bands.reset_index(), hide_index=True, column_config={
+                col: st.column_config.NumberColumn(format="%d") for col in ["Low (2.5%)", "Median", "High (97.5%)"]
+            }, use_container_width=True)
+            st.caption(f"{simulation.break_even_probability:.0%} of {simulation.n_scenarios:,} scenarios break even within {projection_months} months.")
+            st.caption("Each scenario draws every keyword's ranking outcome around its target, CTR noise and the site conversion "
+                       "rate; the bands are centered on the forecast above.")
+
         # Break-even analysis
         st.markdown("### Break-Even Analysis")
-        monthly_data_temp = []
-        cumulative_traffic = 0
-        cumulative_conversions = 0
-        cumulative_revenue = 0
-        current_month = pd.Timestamp.now().month - 1
-        seasonality = {
-            "BBQ & Outdoor Cooking": [0.4, 0.5, 0.7, 1.0, 1.5, 2.0, 2.0, 1.5, 1.0, 0.7, 0.7, 0.6],
-            "Christmas & Seasonal": [0.2, 0.2, 0.2, 0.2, 0.3, 0.3, 0.4, 0.6, 1.0, 1.5, 2.0, 2.5],
-            "Fashion & Apparel": [1.0, 0.8, 1.2, 1.5, 1.3, 1.0, 1.0, 1.5, 1.8, 1.3, 2.0, 1.8],
-            "Electronics & Technology": [1.0, 0.8, 0.8, 0.9, 0.9, 0.9, 0.9, 1.0, 1.1, 1.3, 2.2, 2.5],
-            "Gardening & Outdoor": [0.5, 0.7, 1.3, 1.8, 2.0, 1.8, 1.5, 1.3, 1.1, 0.8, 0.6, 0.5],
-            "Furniture & Home": [1.2, 1.0, 1.1, 1.2, 1.3, 1.3, 1.2, 1.2, 1.3, 1.2, 1.2, 0.9]
-        }
-        
-        for i in range(projection_months):
-            month_idx = (current_month + i) % 12
-            month_name = pd.Timestamp(year=2023, month=month_idx+1, day=1).strftime('%b')
-            progress = i / (projection_months - 1) if projection_months > 1 else 1
-            avg_difficulty = keywords['keywordDifficulty'].mean()
-            k = 10 / (1 + avg_difficulty / 2)
-            delay = 0.2
-            growth_factor = 1 / (1 + np.exp(-k * (progress - delay)))
-            season_factor = seasonality[category][month_idx]
-            month_factor = growth_factor * season_factor
-            traffic_gain = total_traffic_gain * month_factor / sum([1 / (1 + np.exp(-k * (j / (projection_months - 1) - delay))) * 
-                                                                 seasonality[category][(current_month + j) % 12] 
-                                                                 for j in range(projection_months)])
-            conversion_gain = traffic_gain * (conversion_rate / 100)
-            revenue_gain = conversion_gain * aov
-            cumulative_traffic += traffic_gain
-            cumulative_conversions += conversion_gain
-            cumulative_revenue += revenue_gain
-            monthly_data_temp.append({"Month": month_name, "Cumulative Revenue": cumulative_revenue})
-        
-        break_even_month = next((i + 1 for i, row in enumerate(monthly_data_temp) if row['Cumulative Revenue'] >= implementation_cost), None)
+        break_even_df = result.break_even
+        break_even_month = result.break_even_month
+        cumulative_revenue = break_even_df['Cumulative Revenue'].iloc[-1]
         
         if break_even_month:
             st.markdown(f"""
                 <div style='background-color: #e6f3ff; padding: 20px; border-radius: 10px; border: 2px solid #2563eb; margin: 20px 0;'>
                     <h3 style='color: #2563eb; margin-top: 0;'>🎯 Break-Even Point Reached</h3>
-                    <p style='font-size: 18px; margin: 0;'>Achieved in <b>month {break_even_month}</b> with a cumulative revenue of <b>{currency_symbol}{int(monthly_data_temp[break_even_month-1]['Cumulative Revenue']):,}</b>.</p>
+                    <p style='font-size: 18px; margin: 0;'>Achieved in <b>month {break_even_month}</b> with a cumulative revenue of <b>{currency_symbol}{int(break_even_df['Cumulative Revenue'].iloc[break_even_month-1]):,}</b>.</p>
                 </div>
             """, unsafe_allow_html=True)
         else:
@@ -539,81 +577,110 @@ if calculate_button:
                 </div>
             """, unsafe_allow_html=True)
         
-        break_even_df = pd.DataFrame(monthly_data_temp)
-        fig = px.line(break_even_df, x="Month", y="Cumulative Revenue", title="Break-Even Progress Over Time", 
-                     labels={"Cumulative Revenue": f"Cumulative Revenue ({currency_symbol})"})
-        fig.add_hline(y=implementation_cost, line_dash="dash", line_color="red", annotation_text="Break-Even Point", annotation_position="top right")
-        fig.update_traces(mode="lines+markers")
-        st.plotly_chart(fig, use_container_width=True)
+        with profiler.stage("break_even_chart"):
+            import plotly.express as px  # charting is loaded on first use, not on page load
+            fig = px.line(break_even_df, x="Month", y="Cumulative Revenue", title="Break-Even Progress Over Time", 
+                         labels={"Cumulative Revenue": f"Cumulative Revenue ({currency_symbol})"})
+            fig.add_hline(y=implementation_cost, line_dash="dash", line_color="red", annotation_text="Break-Even Point", annotation_position="top right")
+            fig.update_traces(mode="lines+markers")
+            st.plotly_chart(fig, use_container_width=True)
         
         # Monthly Projections
         st.header(f"Monthly Projections ({projection_months} Months)")
-        monthly_data = []
-        cumulative_traffic = 0
-        cumulative_conversions = 0
-        cumulative_revenue = 0
-        
-        for i in range(projection_months):
-            month_idx = (current_month + i) % 12
-            month_name = pd.Timestamp(year=2023, month=month_idx+1, day=1).strftime('%b')
-            progress = i / (projection_months - 1) if projection_months > 1 else 1
-            growth_factor = 1 / (1 + np.exp(-k * (progress - delay)))
-            season_factor = seasonality[category][month_idx]
-            month_factor = growth_factor * season_factor
-            traffic_gain = total_traffic_gain * month_factor / sum([1 / (1 + np.exp(-k * (j / (projection_months - 1) - delay))) * 
-                                                                 seasonality[category][(current_month + j) % 12] 
-                                                                 for j in range(projection_months)])
-            conversion_gain = int(round(traffic_gain * (conversion_rate / 100)))
-            revenue_gain = conversion_gain * aov
-            cumulative_traffic += traffic_gain
-            cumulative_conversions += conversion_gain
-            cumulative_revenue += revenue_gain
-            monthly_cost = implementation_cost if i == 0 else 0
-            roi = ((revenue_gain - monthly_cost) / implementation_cost) * 100 if implementation_cost > 0 else 0
-            cumulative_roi = ((cumulative_revenue - implementation_cost) / implementation_cost) * 100 if implementation_cost > 0 else 0
-            
-            monthly_data.append({
-                "Month": month_name, "Traffic Gain": int(traffic_gain), "Conversion Gain": conversion_gain,
-                "Revenue": f"{currency_symbol}{int(revenue_gain):,}", "ROI": f"{roi:.1f}%", "Cumulative": f"{cumulative_roi:.1f}%",
-                "Revenue Gain": int(revenue_gain)
-            })
-        
-        monthly_data.append({
-            "Month": "TOTAL", "Traffic Gain": int(cumulative_traffic), "Conversion Gain": int(cumulative_conversions),
-            "Revenue": f"{currency_symbol}{int(cumulative_revenue):,}", "ROI": "", "Cumulative": f"{cumulative_roi:.1f}%",
-            "Revenue Gain": int(cumulative_revenue)
-        })
-        
-        monthly_df = pd.DataFrame(monthly_data)
-        st.dataframe(monthly_df[["Month", "Traffic Gain", "Conversion Gain", "Revenue", "ROI", "Cumulative"]], hide_index=True, 
-            column_config={"Traffic Gain": st.column_config.NumberColumn(format="%d"), "Conversion Gain": st.column_config.NumberColumn("Conversions", format="%d")}, 
-            use_container_width=True)
+        with profiler.stage("monthly_table", rows=projection_months):
+            monthly_df = monthly_projections(result.monthly, currency_symbol)
+            st.dataframe(monthly_df[MONTHLY_COLUMNS], hide_index=True, 
+                column_config={"Traffic Gain": st.column_config.NumberColumn(format="%d"), "Conversion Gain": st.column_config.NumberColumn("Conversions", format="%d")}, 
+                use_container_width=True)
         
         st.subheader("Monthly Projection Chart")
-        fig = px.line(monthly_df[:-1], x="Month", y=["Traffic Gain", "Revenue Gain"], title=f"SEO Performance Forecast for {projection_months} Months",
-                     labels={"value": "Metric Value", "variable": "Metric"})
-        fig.update_traces(mode="lines+markers")
-        fig.update_layout(yaxis_title="Traffic", yaxis2=dict(title="Revenue", overlaying="y", side="right"))
-        st.plotly_chart(fig, use_container_width=True)
+        with profiler.stage("monthly_chart"):
+            fig = px.line(monthly_df[:-1], x="Month", y=["Traffic Gain", "Revenue Gain"], title=f"SEO Performance Forecast for {projection_months} Months",
+                         labels={"value": "Metric Value", "variable": "Metric"})
+            fig.update_traces(mode="lines+markers")
+            fig.update_layout(yaxis_title="Traffic", yaxis2=dict(title="Revenue", overlaying="y", side="right"))
+            st.plotly_chart(fig, use_container_width=True)
         
         # Keyword Details
         st.header("Keyword Details")
-        keyword_display = keywords.copy()
-        keyword_display['Current Traffic'] = keyword_display['currentTraffic'].round(0).astype(int)
-        keyword_display['Target Traffic'] = keyword_display['targetTraffic'].round(0).astype(int)
-        keyword_display['Traffic Gain'] = keyword_display['trafficGain'].round(0).astype(int)
-        keyword_display['Revenue Gain'] = keyword_display['revenueGain'].round(0).astype(int).apply(lambda x: f"{currency_symbol}{x}")
-        keyword_display['Traffic Gain %'] = keyword_display.apply(lambda row: f"{(row['trafficGain'] / row['currentTraffic'] * 100):.1f}%" if row['currentTraffic'] != 0 else "0.0%", axis=1)
-        
-        st.dataframe(keyword_display[['keyword', 'searchVolume', 'position', 'targetPosition', 'keywordDifficulty', 'adjustedTargetPosition', 
-                                     'Current Traffic', 'Target Traffic', 'Traffic Gain', 'Traffic Gain %', 'Revenue Gain']], 
-                     hide_index=True, use_container_width=True)
+        col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+        with col1: keyword_search = st.text_input("Search keywords", placeholder="Keyword starts with...")
+        with col2: sort_label = st.selectbox("Sort by", ["Original order"] + list(SORT_COLUMNS))
+        with col3: sort_order = st.selectbox("Order", ["Descending", "Ascending"])
+        with col4: page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
         
-        csv = keyword_display.to_csv(index=False).encode('utf-8')
-        st.download_button("Download Results as CSV", csv, "seo_forecast_results.csv", "text/csv")
+        with profiler.stage("keyword_table", rows=len(keywords)) as timing:
+            query = KeywordQuery(sort_by=SORT_COLUMNS.get(sort_label), descending=sort_order == "Descending", prefix=keyword_search.strip())
+            positions = matching_positions(keywords, query)
+            details_pages = page_count(len(positions), page_size)
+            details_page = st.number_input(f"Page (of {details_pages:,})", 1, details_pages, 1) - 1 if details_pages > 1 else 0
+            page = page_of(keywords, positions, details_page, page_size)
+            timing.rows = len(page.rows)
+            # Only the visible page is formatted and sent to the browser
+            st.dataframe(keyword_details(page.rows, currency_symbol)[KEYWORD_DETAIL_COLUMNS], hide_index=True, use_container_width=True)
+            st.caption(f"Showing {page.first_row:,}–{page.last_row:,} of {page.matching:,} matching keywords ({page.total:,} total)")
+
+        # Keyword Prioritization
+        st.header("Keyword Prioritization")
+        if st.checkbox("Choose which keywords to fund within a budget", value=False,
+                help="Cost per keyword = positions to climb × difficulty / 5 × cost per position. Keywords are funded by revenue gain per cost."):
+            col1, col2 = st.columns(2)
+            with col1: budget = st.number_input(f"Budget ({currency_symbol})", 0, 10_000_000, int(implementation_cost), 100)
+            with col2: cost_per_position = st.number_input(f"Cost per Position Gained ({currency_symbol}, difficulty 5)", 1.0, 100_000.0, POSITION_COST, 10.0)
+            plan = prioritize(keywords, budget, cost_per_position)
+            with profiler.stage("prioritization_table", rows=len(plan.selected)):
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric("Keywords Funded", f"{len(plan.selected):,}", f"of {len(plan.order):,} with a gain", delta_color="off")
+                col2.metric("Spend", f"{currency_symbol}{int(plan.total_cost):,}")
+                col3.metric("Monthly Revenue Gain", f"{currency_symbol}{int(plan.total_revenue):,}")
+                col4.metric("ROI", f"{plan.roi:.1f}%")
+
+                import plotly.express as px  # charting is loaded on first use, not on page load
+                fig = px.line(plan.curve(), x="Spend", y="Revenue Gain", hover_data=["Keywords Funded", "Marginal ROI (%)"],
+                             title="Revenue Gain by Spend (best keywords first)",
+                             labels={"Spend": f"Spend ({currency_symbol})", "Revenue Gain": f"Monthly Revenue Gain ({currency_symbol})"})
+                fig.add_vline(x=budget, line_dash="dash", line_color="red", annotation_text="Budget", annotation_position="top right")
+                st.plotly_chart(fig, use_container_width=True)
+
+                funded = plan.funded(keywords)
+                shown = max(PAGE_SIZES)  # the top of the funding order is what decisions are made on
+                st.dataframe(funded[['keyword', 'position', 'adjustedTargetPosition', 'keywordDifficulty', 'revenueGain', 'cost', 'roi']].head(shown),
+                    hide_index=True, column_config={
+                        "adjustedTargetPosition": "Adjusted Target",
+                        "revenueGain": st.column_config.NumberColumn("Revenue Gain", format=f"{currency_symbol}%d"),
+                        "cost": st.column_config.NumberColumn("Cost", format=f"{currency_symbol}%d"),
+                        "roi": st.column_config.NumberColumn("ROI", format="%.1f%%"),
+                    }, use_container_width=True)
+                if len(funded) > shown:
+                    st.caption(f"Showing the first {shown:,} of {len(funded):,} funded keywords, in funding order.")
+
+        export_format = st.selectbox("Export format", list(EXPORT_FORMATS), help="Excel adds the summary, monthly, break-even and what-if sheets")
+        extension, mime = EXPORT_FORMATS[export_format]
+        # Bind this run's inputs now; the file itself is only built when the button is clicked
+        export_keywords, what_if_rates = st.session_state.keywords, np.linspace(min_conversion, max_conversion, steps)
+        build_export = partial(export_bytes, result, export_format,
+                               what_if=lambda: what_if(export_keywords, forecast_settings, what_if_rates).to_frame())
+        try:
+            st.download_button(f"Download Results as {export_format}", build_export, f"seo_forecast_results.{extension}", mime)
+        except StreamlitAPIException:  # Streamlit without deferred downloads
+            with profiler.stage("export", rows=len(keywords)):
+                st.download_button(f"Download Results as {export_format}", build_export(), f"seo_forecast_results.{extension}", mime)
     else:
         st.warning("Please add at least one keyword before calculating the forecast.")
 
 # Footer
+cache_stats = forecast_cache.stats()
+st.sidebar.caption(f"Forecast cache: {cache_stats.hits} hits / {cache_stats.misses} misses ({cache_stats.entries} stored)")
+
+# Performance (opt-in)
+profiler.deactivate()
+profiler.log(page="Home", keywords=len(st.session_state.keywords), calculated=bool(calculate_button))
+if st.sidebar.checkbox("Show performance timings", value=False):
+    with st.sidebar.expander("Performance", expanded=True):
+        st.caption(f"This run: {profiler.total_seconds * 1000:,.0f} ms across timed stages")
+        st.dataframe(profiler.to_frame(), hide_index=True, column_config={
+            "Time (ms)": st.column_config.NumberColumn(format="%.1f"),
+            "Memory Δ (MB)": st.column_config.NumberColumn(format="%.1f"),
+        }, use_container_width=True)
 st.markdown("---")
 st.markdown("Built with Streamlit • [GitHub Repo](https://github.com/boopin/seo-ecom-forecaster)")
@@ -21,7 +21,7 @@ EcomSEO Predictor is a powerful tool designed to help e-commerce businesses fore
 # What Can This Tool Do?
 st.header("What Can This Tool Do?")
 st.markdown("""
-- **Forecast SEO Performance**: Predict how improving your search engine rankings for specific keywords will impact your website traffic, conversions, and revenue over a 6 or 12-month period.
+- **Forecast SEO Performance**: Predict how improving your search engine rankings for specific keywords will impact your website traffic, conversions, and revenue over a 6 to 60-month period.
 - **Keyword Analysis**: Analyze individual keywords to see their current traffic, potential traffic gains, and revenue impact based on target ranking positions.
 - **Break-Even Analysis**: Determine how long it will take to recover your SEO investment (implementation cost) based on projected revenue gains.
 - **What-If Analysis**: Experiment with different conversion rates to understand how they affect your forecast.
@@ -51,7 +51,7 @@ Follow these steps to get started with EcomSEO Predictor:
 2. **Configure Settings**:
    - In the sidebar, adjust the settings to match your business:
      - **Product Category**: Select your industry to apply seasonal trends (e.g., "BBQ & Outdoor Cooking").
-     - **Projection Period**: Choose 6 or 12 months for your forecast.
+     - **Projection Period**: Choose 6, 12, 24, 36 or 60 months for your forecast.
      - **Conversion Rate (%)**: Enter your website's conversion rate (e.g., 3% if 3 out of 100 visitors make a purchase).
      - **Currency**: Select your preferred currency for revenue calculations (e.g., USD, GBP).
      - **Average Order Value (AOV)**: Enter the average amount a customer spends per order (e.g., $250).
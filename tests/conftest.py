@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ecomseo.schema import enforce_schema
+
+
+def make_keywords(n, seed=0):
+    """Random keyword table in the app's schema, with a few fixed rows covering the edge cases."""
+    rng = np.random.default_rng(seed)
+    position = rng.integers(1, 101, n)
+    df = pd.DataFrame({
+        "keyword": [f"keyword {i}" for i in range(n)],
+        "searchVolume": rng.integers(0, 50_000, n),
+        "position": position,
+        "targetPosition": np.maximum(1, position - rng.integers(0, 30, n)),
+        "keywordDifficulty": rng.integers(1, 11, n),
+    })
+    edge_cases = pd.DataFrame({
+        "keyword": ["target worse than current", "already first", "hardest", "no searches", "beyond top 20"],
+        "searchVolume": [5_000, 8_000, 3_000, 0, 12_000],
+        "position": [3, 1, 40, 12, 99],
+        "targetPosition": [9, 1, 1, 2, 21],
+        "keywordDifficulty": [5, 5, 10, 5, 1],
+    })
+    return enforce_schema(pd.concat([df, edge_cases], ignore_index=True))
+
+
+@pytest.fixture
+def keywords():
+    return make_keywords(500)
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from ecomseo import ForecastSettings, adjusted_target_position, forecast
+from ecomseo.models import CTR_MODELS, DEFAULT_CUSTOM_CTR
+
+
+def baseline_get_ctr(position, ctr_table, featured_snippet_present=False, in_featured_snippet=False, faq_present=False,
+                     in_faq=False, custom_ctr=DEFAULT_CUSTOM_CTR):
+    """``get_ctr`` as the original Home page defined it (custom CTRs read from the session instead)."""
+    position = int(position)
+    if not ctr_table:
+        ctr = custom_ctr.get(position, custom_ctr['beyond_10'])
+    else:
+        if position in ctr_table:
+            ctr = ctr_table[position]
+        else:
+            for i in range(position, 0, -1):
+                if i in ctr_table:
+                    ctr = ctr_table[i]
+                    break
+            else:
+                for i in range(position, 100):
+                    if i in ctr_table:
+                        ctr = ctr_table[i]
+                        break
+                else:
+                    ctr = 0.005
+    if ctr_table and featured_snippet_present:
+        if position == 1:
+            ctr *= 1.1 if in_featured_snippet else 0.8
+        elif 2 <= position <= 5:
+            ctr *= 0.9
+    if ctr_table and faq_present and position == 1:
+        ctr *= 1.1 if in_faq else 0.9
+    return max(0.001, ctr)
+
+
+def baseline_forecast(keywords, settings):
+    """The original Calculate Forecast path: row-wise CTRs, clamped adjusted target, normal CIs."""
+    keywords = keywords.astype({"searchVolume": "int64", "position": "int64", "targetPosition": "int64",
+                                "keywordDifficulty": "int64"})
+    table = {} if settings.ctr_model == "Custom" else CTR_MODELS[settings.ctr_model]
+    flags = settings.serp_flags
+    current_ctr = keywords['position'].apply(lambda pos: baseline_get_ctr(pos, table, *flags))
+    adjusted = keywords.apply(
+        lambda row: max(1, min(row['position'], int(row['position'] - (row['position'] - row['targetPosition'])
+                                                     * (1 - row['keywordDifficulty'] / 15)))), axis=1)
+    target_ctr = adjusted.apply(lambda pos: baseline_get_ctr(pos, table, *flags))
+    current_traffic = keywords['searchVolume'] * current_ctr
+    traffic_gain = keywords['searchVolume'] * target_ctr - current_traffic
+    gain_std = np.sqrt((current_traffic * 0.10) ** 2 + (keywords['searchVolume'] * target_ctr * 0.10) ** 2)
+    total_conversion_gain = int(round((traffic_gain * (settings.conversion_rate / 100)).sum()))
+    return {
+        "adjustedTargetPosition": adjusted.to_numpy(),
+        "trafficGain": traffic_gain.to_numpy(),
+        "total_traffic_gain": traffic_gain.sum(),
+        "total_traffic_gain_std": np.sqrt((gain_std ** 2).sum()),
+        "total_conversion_gain": total_conversion_gain,
+        "total_revenue_gain": total_conversion_gain * settings.aov,
+        "cpa": settings.implementation_cost / total_conversion_gain if total_conversion_gain > 0 else float('inf'),
+    }
+
+
+@pytest.mark.parametrize("ctr_model", list(CTR_MODELS) + ["Custom"])
+@pytest.mark.parametrize("serp_flags", [(False, False, False, False), (True, True, True, False), (True, False, True, True)])
+def test_forecast_matches_original_calculation(keywords, ctr_model, serp_flags):
+    settings = ForecastSettings(ctr_model=ctr_model, featured_snippet_present=serp_flags[0], in_featured_snippet=serp_flags[1],
+                                faq_present=serp_flags[2], in_faq=serp_flags[3])
+    result = forecast(keywords, settings)
+    expected = baseline_forecast(keywords, settings)
+
+    np.testing.assert_array_equal(result.keywords['adjustedTargetPosition'].to_numpy(), expected["adjustedTargetPosition"])
+    np.testing.assert_allclose(result.keywords['trafficGain'].to_numpy(), expected["trafficGain"], rtol=1e-9, atol=1e-9)
+    assert result.total_traffic_gain == pytest.approx(expected["total_traffic_gain"], rel=1e-9)
+    assert result.total_traffic_gain_std == pytest.approx(expected["total_traffic_gain_std"], rel=1e-9)
+    assert result.total_conversion_gain == expected["total_conversion_gain"]
+    assert result.total_revenue_gain == pytest.approx(expected["total_revenue_gain"])
+    assert result.cpa == pytest.approx(expected["cpa"])
+
+
+def test_adjusted_target_never_worse_than_current_position():
+    position = np.array([3, 10, 1, 50], dtype=np.uint8)
+    target = np.array([9, 2, 1, 60], dtype=np.uint8)  # uint8 inputs must not wrap on subtraction
+    adjusted = adjusted_target_position(position, target, np.array([5, 5, 5, 1], dtype=np.uint8))
+    np.testing.assert_array_equal(adjusted, [3, 4, 1, 50])
+
+
+def test_target_worse_than_current_gains_nothing(keywords):
+    result = forecast(keywords, ForecastSettings())
+    row = result.keywords[result.keywords['keyword'] == "target worse than current"].iloc[0]
+    assert row['adjustedTargetPosition'] == row['position']
+    assert row['trafficGain'] == 0
+
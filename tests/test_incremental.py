@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ecomseo import ForecastSettings, IncrementalForecast, forecast
+from ecomseo.schema import enforce_schema
+
+from .conftest import make_keywords
+
+SETTINGS = ForecastSettings(start_month=0)
+METRIC_COLUMNS = ["currentCTR", "adjustedTargetPosition", "targetCTR", "trafficGain", "trafficGain_std", "revenueGain"]
+
+
+def assert_same_result(result, expected):
+    pd.testing.assert_frame_equal(result.keywords[METRIC_COLUMNS], expected.keywords[METRIC_COLUMNS], check_dtype=False)
+    assert result.total_traffic_gain == pytest.approx(expected.total_traffic_gain, rel=1e-9)
+    assert result.total_traffic_gain_std == pytest.approx(expected.total_traffic_gain_std, rel=1e-9)
+    assert result.total_current_traffic == pytest.approx(expected.total_current_traffic, rel=1e-9)
+    assert result.total_conversion_gain == expected.total_conversion_gain
+    assert result.total_revenue_gain == pytest.approx(expected.total_revenue_gain)
+    assert result.break_even_month == expected.break_even_month
+    pd.testing.assert_frame_equal(result.monthly, expected.monthly, check_exact=False, rtol=1e-9)
+
+
+def edited(keywords):
+    keywords = keywords.astype({"searchVolume": "int64", "position": "int64", "keywordDifficulty": "int64"})
+    keywords.loc[[3, 10, 250], "searchVolume"] = [123, 0, 45_000]
+    keywords.loc[[10, 400], "position"] = [2, 77]
+    keywords.loc[7, "keywordDifficulty"] = 10
+    return enforce_schema(keywords)
+
+
+def added(keywords):
+    new_rows = make_keywords(20, seed=1)
+    new_rows.index = new_rows.index + 10_000
+    return pd.concat([keywords, new_rows])
+
+
+def dropped(keywords):
+    return keywords.drop(index=[0, 1, 2, 100, 499])
+
+
+def reordered(keywords):
+    return keywords.iloc[np.random.default_rng(2).permutation(len(keywords))]
+
+
+@pytest.mark.parametrize("change", [edited, added, dropped, reordered, lambda df: reordered(added(dropped(edited(df))))],
+                         ids=["edit", "add", "drop", "reorder", "all"])
+def test_update_matches_full_forecast(keywords, change):
+    incremental = IncrementalForecast()
+    incremental.update(keywords, SETTINGS)
+    changed = change(keywords)
+    assert_same_result(incremental.update(changed, SETTINGS), forecast(changed, SETTINGS))
+
+
+def test_unchanged_frame_recomputes_nothing(keywords):
+    incremental = IncrementalForecast()
+    incremental.update(keywords, SETTINGS)
+    incremental.update(keywords.copy(), SETTINGS)
+    assert incremental.rows_recomputed == 0
+
+
+def test_edit_recomputes_only_changed_rows(keywords):
+    incremental = IncrementalForecast()
+    incremental.update(keywords, SETTINGS)
+    changed = edited(keywords)
+    incremental.update(changed, SETTINGS)
+    differs = (changed[["searchVolume", "position", "keywordDifficulty"]] != keywords[["searchVolume", "position", "keywordDifficulty"]])
+    assert 0 < incremental.rows_recomputed == differs.any(axis=1).sum() < len(keywords)
+
+
+def test_settings_change_recomputes_everything(keywords):
+    incremental = IncrementalForecast()
+    incremental.update(keywords, SETTINGS)
+    settings = ForecastSettings(start_month=0, ctr_model="Default", conversion_rate=1.5)
+    assert_same_result(incremental.update(edited(keywords), settings), forecast(edited(keywords), settings))
+    assert incremental.rows_recomputed == len(keywords)
@@ -0,0 +1,95 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ecomseo.ingest import (ColumnMap, SearchConsoleColumns, detect_columns, detect_search_console_columns, read_keywords,
+                            read_monthly_volumes)
+
+
+def csv_bytes(df):
+    return io.BytesIO(df.to_csv(index=False).encode())
+
+
+@pytest.mark.parametrize("header, expected", [
+    (["Keyword", "Search Volume", "Position", "Keyword Difficulty"], ColumnMap("Keyword", "Search Volume", "Position", "Keyword Difficulty")),
+    (["Search Term", "Monthly Searches", "Current Rank"], ColumnMap("Search Term", "Monthly Searches", "Current Rank")),
+    (["a", "b", "c"], ColumnMap("a", "b", "c")),
+    (["KW", "Vol"], ColumnMap("KW", "Vol")),
+    # Month columns ("Volume Jan 2024") are history, not the volume column
+    (["Keyword", "Volume Jan 2024", "Volume Feb 2024", "Volume", "Pos"], ColumnMap("Keyword", "Volume", "Pos")),
+])
+def test_detect_columns(header, expected):
+    assert detect_columns(header) == expected
+
+
+def test_detect_columns_keeps_case_only_duplicates_apart():
+    assert detect_columns(["Keyword", "Volume", "volume", "Position"]) == ColumnMap("Keyword", "Volume", "Position")
+    assert detect_columns(["keyword", "KEYWORD", "Volume", "Position"]).keyword == "keyword"
+
+
+def test_read_keywords_normalizes_export():
+    df = pd.DataFrame({"Keyword": ["gas bbq", "bbq grill"], "Search Volume": [8000, 5000], "Position": [8, 150],
+                       "Keyword Difficulty": [5, None]})
+    keywords = read_keywords(csv_bytes(df), "export.csv", chunksize=1)
+    assert keywords["keyword"].tolist() == ["gas bbq", "bbq grill"]
+    assert keywords["searchVolume"].tolist() == [8000, 5000]
+    assert keywords["position"].tolist() == [8, 100]  # clamped to the schema's range
+    assert keywords["targetPosition"].tolist() == [4, 50]  # half the current position
+    assert keywords["keywordDifficulty"].tolist() == [5, 5]
+
+
+@pytest.mark.parametrize("header, expected", [
+    (["Date", "Query", "Page", "Clicks", "Impressions", "CTR", "Position"], SearchConsoleColumns("Query", "Impressions", "Position", "Date")),
+    (["Top queries", "Clicks", "Impressions", "CTR", "Position"], SearchConsoleColumns("Top queries", "Impressions", "Position")),
+    (["query", "DATE", "Date", "impressions", "position"], SearchConsoleColumns("query", "impressions", "position", "DATE")),
+    (["Keyword", "Search Volume", "Position"], None),
+])
+def test_detect_search_console_columns(header, expected):
+    assert detect_search_console_columns(header) == expected
+
+
+def search_console_export(days=28, seed=0):
+    rng = np.random.default_rng(seed)
+    n = 2_000
+    return pd.DataFrame({
+        "Date": (pd.Timestamp("2024-03-01") + pd.to_timedelta(rng.integers(0, days, n), unit="D")).strftime("%Y-%m-%d"),
+        "Query": rng.choice([f"query {i}" for i in range(150)], n),
+        "Page": rng.choice(["/a", "/b", "/c"], n),
+        "Clicks": rng.integers(0, 5, n),
+        "Impressions": rng.integers(0, 200, n),
+        "Position": rng.uniform(1, 60, n).round(1),
+    })
+
+
+def test_search_console_export_is_aggregated_per_query():
+    export = search_console_export(days=61)
+    export.loc[[0, 1], "Date"] = ["2024-03-01", "2024-04-30"]  # span exactly 61 days
+    keywords = read_keywords(csv_bytes(export), "gsc.csv", chunksize=97).set_index("keyword")
+
+    shown = export[export["Impressions"] > 0]
+    impressions = shown.groupby("Query")["Impressions"].sum()
+    position = (shown["Position"] * shown["Impressions"]).groupby(shown["Query"]).sum() / impressions
+    months = 61 / (365.25 / 12)
+    assert sorted(keywords.index) == sorted(impressions.index)
+    np.testing.assert_array_equal(keywords.loc[impressions.index, "searchVolume"], np.round(impressions / months))
+    np.testing.assert_array_equal(keywords.loc[impressions.index, "position"], np.round(position))
+
+
+def test_search_console_export_without_dates_uses_given_period():
+    export = search_console_export().drop(columns=["Date", "Page"]).groupby("Query", as_index=False).agg(
+        {"Clicks": "sum", "Impressions": "sum", "Position": "mean"}).rename(columns={"Query": "Top queries"})
+    export = export[export["Impressions"] > 0]
+    one_month = read_keywords(csv_bytes(export), "Queries.csv").set_index("keyword")["searchVolume"]
+    three_months = read_keywords(csv_bytes(export), "Queries.csv", search_console_months=3).set_index("keyword")["searchVolume"]
+    assert one_month.sum() == export["Impressions"].sum()
+    np.testing.assert_array_equal(three_months.loc[one_month.index], np.round(export.set_index("Top queries")["Impressions"].loc[one_month.index] / 3))
+
+
+def test_monthly_volumes_header_only_is_none():
+    header = "Keyword,Volume," + ",".join(f"Volume {month} 2024" for month in
+                                          ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"])
+    source = io.BytesIO(f"{header}\n".encode())
+    assert read_monthly_volumes(source, "history.csv") is None
+    assert source.tell() == 0
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from ecomseo.service import MAX_PROJECTION_MONTHS, ForecastService, ServiceClient
+
+KEYWORDS = [{"keyword": "gas bbq", "searchVolume": 8000, "position": 8, "targetPosition": 1},
+            {"keyword": "charcoal bbq", "searchVolume": 6500, "position": 12, "targetPosition": 3}]
+
+
+@pytest.fixture
+def client():
+    with ForecastService(max_workers=1, executor="thread") as service, ServiceClient(service) as client:
+        yield client
+
+
+def test_forecast(client):
+    response = client.post("/forecast", json={"keywords": KEYWORDS, "settings": {"projection_months": 12}})
+    assert response.status == 200
+    body = response.json()
+    assert body["summary"]["keywords"] == 2
+    assert len(body["monthly"]) == 12
+    assert response.headers["X-Cache"] == "miss"
+    assert client.post("/forecast", json={"keywords": KEYWORDS, "settings": {"projection_months": 12}}).headers["X-Cache"] == "hit"
+
+
+def test_upload(client):
+    body = b"Keyword,Search Volume,Position\ngas bbq,8000,8\nbbq grill,5000,9\n"
+    settings = json.dumps({"aov": 100})
+    response = client.post(f"/forecast/upload?name=keywords.csv&details=0&settings={settings}", data=body)
+    assert response.status == 200
+    assert response.json()["summary"]["keywords"] == 2
+    assert "keyword_details" not in response.json()
+
+
+@pytest.mark.parametrize("payload", [
+    {"keywords": ["a", "b"]},
+    {"keywords": [[1, 2, 3]]},
+    {"keywords": {"keyword": "a"}},
+    {"keywords": []},
+    {"keywords": KEYWORDS, "settings": {"conversion_rate": "abc"}},
+    {"keywords": KEYWORDS, "settings": {"projection_months": 0}},
+    {"keywords": KEYWORDS, "settings": {"projection_months": MAX_PROJECTION_MONTHS + 1}},
+    {"keywords": KEYWORDS, "settings": {"aov": -1}},
+    {"keywords": KEYWORDS, "settings": {"start_month": 12}},
+    {"keywords": KEYWORDS, "settings": {"category": "Garden Gnomes"}},
+    {"keywords": KEYWORDS, "settings": {"custom_ctr": [0.3]}},
+    {"keywords": KEYWORDS, "settings": "USD"},
+    [],
+])
+def test_bad_requests(client, payload):
+    response = client.post("/forecast", json=payload)
+    assert response.status == 400
+    assert response.json()["error"]
+
+
+def test_invalid_json(client):
+    assert client.post("/forecast", data=b"{not json").status == 400
+
+
+def test_upload_bad_name(client):
+    assert client.post("/forecast/upload?name=keywords.txt", data=b"Keyword\n").status == 400
+
+
+def test_unreadable_upload(client):
+    assert client.post("/forecast/upload?name=keywords.csv", data=b"").status == 422
+
+
+def test_routes(client):
+    assert client.get("/health").status == 200
+    assert "E-commerce" in client.get("/options").json()["ctr_models"]
+    assert client.get("/nowhere").status == 404
+    response = client.get("/forecast")
+    assert response.status == 405
+    assert response.headers["Allow"] == "POST"
+
+
+def test_busy():
+    with ForecastService(max_workers=1, executor="thread", max_pending=0) as service, ServiceClient(service) as client:
+        response = client.post("/forecast", json={"keywords": KEYWORDS})
+    assert response.status == 503
+    assert response.headers["Retry-After"] == "1"